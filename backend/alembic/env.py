@@ -0,0 +1,73 @@
+"""Alembic environment running migrations over the app's async engine."""
+
+from __future__ import annotations
+
+import asyncio
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.partitions import PARTITION_ONLY_INDEXES
+from app.models import Base
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def _database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or settings.database_url
+
+
+def _include_partitioned(
+    obj: object, name: str | None, type_: str, reflected: bool, compare_to: object
+) -> bool:
+    # Partitioned PostgreSQL tables cannot carry the single-column foreign keys and
+    # unique constraints the models declare, and have extra lookup indexes.
+    if type_ in ("foreign_key_constraint", "unique_constraint"):
+        return False
+    return not (type_ == "index" and name in PARTITION_ONLY_INDEXES)
+
+
+def _configure(connection: Connection) -> None:
+    options = {}
+    if connection.dialect.name == "postgresql":
+        options["include_object"] = _include_partitioned
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+        **options,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_offline() -> None:
+    context.configure(url=_database_url(), target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def _run_async() -> None:
+    engine = create_async_engine(_database_url(), poolclass=pool.NullPool)
+    async with engine.connect() as connection:
+        await connection.run_sync(_configure)
+    await engine.dispose()
+
+
+def run_migrations_online() -> None:
+    # Callers already inside an event loop hand over a connection (see app.core.migrations).
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection)
+    else:
+        asyncio.run(_run_async())
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,95 @@
+"""Initial schema, as previously created by Base.metadata.create_all.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+Deployments created before migrations existed: ``alembic stamp 0001``
+then ``alembic upgrade head``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_TYPE = postgresql.JSONB().with_variant(sa.JSON(), "sqlite")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document",
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column("filename", sa.Text(), nullable=False),
+        sa.Column("file_path", sa.Text(), nullable=False),
+        sa.Column("file_size", sa.Integer(), nullable=False),
+        sa.Column("mime_type", sa.Text(), nullable=False),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=False),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "processing", "completed", "failed", name="document_status"),
+            nullable=False,
+        ),
+        sa.Column("error_message", sa.Text(), nullable=True),
+    )
+    op.create_table(
+        "extraction",
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column(
+            "document_id",
+            sa.Text(),
+            sa.ForeignKey("document.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("document_type", sa.Text(), nullable=False),
+        sa.Column("extracted_data", JSON_TYPE, nullable=False),
+        sa.Column("confidence_scores", JSON_TYPE, nullable=False),
+        sa.Column("ocr_text", sa.Text(), nullable=False),
+        sa.Column("processing_time", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("manually_corrected", sa.Boolean(), nullable=False),
+    )
+    op.create_table(
+        "review_item",
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column(
+            "document_id",
+            sa.Text(),
+            sa.ForeignKey("document.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("min_confidence", sa.Float(), nullable=False),
+        sa.Column("low_fields", JSON_TYPE, nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "claimed", "reviewed", name="review_status"),
+            nullable=False,
+        ),
+        sa.Column("claimed_by", sa.Text(), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("reviewed_at", sa.DateTime(), nullable=True),
+        sa.Column("reviewed_by", sa.Text(), nullable=True),
+    )
+    op.create_index(
+        "ix_review_item_queue", "review_item", ["status", "min_confidence", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_review_item_queue", table_name="review_item")
+    op.drop_table("review_item")
+    op.drop_table("extraction")
+    op.drop_table("document")
+    sa.Enum(name="review_status").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="document_status").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,32 @@
+"""Indexes for the document list filter and sort paths.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_document_uploaded_at", "document", ["uploaded_at"])
+    op.create_index("ix_document_status_uploaded_at", "document", ["status", "uploaded_at"])
+    op.create_index(
+        "ix_extraction_document_type_document_id",
+        "extraction",
+        ["document_type", "document_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_extraction_document_type_document_id", table_name="extraction")
+    op.drop_index("ix_document_status_uploaded_at", table_name="document")
+    op.drop_index("ix_document_uploaded_at", table_name="document")
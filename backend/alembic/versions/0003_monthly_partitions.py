@@ -0,0 +1,114 @@
+"""Partition document and extraction by month (PostgreSQL only).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+PostgreSQL requires primary keys and unique constraints on a partitioned
+table to include the partition key, and foreign keys into it to reference
+such a key. The primary keys therefore become (id, <partition key>), the
+unique document_id on extraction becomes a plain index, and the foreign
+keys into document are dropped; the ORM cascades deletes instead. SQLite
+keeps the plain tables.
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.partitions import add_months, create_partition, month_start
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+# Partition keys as of this revision; 0008 moves extraction to document_uploaded_at.
+PARTITIONED_TABLES = {"document": "uploaded_at", "extraction": "created_at"}
+INDEXES = {
+    "document": [
+        ("ix_document_uploaded_at", "uploaded_at"),
+        ("ix_document_status_uploaded_at", "status, uploaded_at"),
+        ("ix_document_id", "id"),
+    ],
+    "extraction": [
+        ("ix_extraction_document_type_document_id", "document_type, document_id"),
+        ("ix_extraction_document_id", "document_id"),
+    ],
+}
+
+
+def _partition(table: str, key: str) -> None:
+    bind = op.get_bind()
+    legacy = f"{table}_unpartitioned"
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey")
+    for name, _ in INDEXES[table]:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE ({key})"
+    )
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, {key})")
+    for name, columns in INDEXES[table]:
+        op.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+
+    oldest = bind.execute(sa.text(f"SELECT min({key}) FROM {legacy}")).scalar()
+    month = month_start(oldest or datetime.utcnow())
+    last = add_months(month_start(datetime.utcnow()), MONTHS_AHEAD)
+    while month <= last:
+        create_partition(bind, table, month, key)
+        month = add_months(month, 1)
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+    op.execute(f"DROP TABLE {legacy}")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_constraint("review_item_document_id_fkey", "review_item", type_="foreignkey")
+    op.drop_constraint("extraction_document_id_fkey", "extraction", type_="foreignkey")
+    op.drop_constraint("extraction_document_id_key", "extraction", type_="unique")
+    for table, key in PARTITIONED_TABLES.items():
+        _partition(table, key)
+
+
+def _unpartition(table: str) -> None:
+    partitioned = f"{table}_partitioned"
+    op.execute(f"ALTER TABLE {table} RENAME TO {partitioned}")
+    for name, _ in INDEXES[table]:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute(f"CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS)")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {partitioned}")
+    op.execute(f"DROP TABLE {partitioned} CASCADE")
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+    for name, columns in INDEXES[table]:
+        if name not in ("ix_document_id", "ix_extraction_document_id"):
+            op.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in PARTITIONED_TABLES:
+        _unpartition(table)
+    op.create_unique_constraint("extraction_document_id_key", "extraction", ["document_id"])
+    op.create_foreign_key(
+        "extraction_document_id_fkey",
+        "extraction",
+        "document",
+        ["document_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_foreign_key(
+        "review_item_document_id_fkey",
+        "review_item",
+        "document",
+        ["document_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
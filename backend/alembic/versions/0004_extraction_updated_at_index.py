@@ -0,0 +1,24 @@
+"""Index extraction.updated_at for incremental exports.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_extraction_updated_at", "extraction", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_extraction_updated_at", table_name="extraction")
@@ -0,0 +1,32 @@
+"""Store page boundaries of the extracted text.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "extraction",
+        sa.Column(
+            "page_offsets", postgresql.JSONB().with_variant(sa.JSON(), "sqlite"), nullable=True
+        ),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("extraction") as batch_op:
+        batch_op.drop_column("page_offsets")
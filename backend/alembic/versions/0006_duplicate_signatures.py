@@ -0,0 +1,54 @@
+"""Fingerprints and LSH bands for duplicate detection.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00
+
+On PostgreSQL ``document`` is partitioned (0003), so the foreign keys to it
+are left out there, as for extraction and review_item.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _document_fk() -> tuple[sa.ForeignKey, ...]:
+    if op.get_bind().dialect.name == "postgresql":
+        return ()
+    return (sa.ForeignKey("document.id", ondelete="CASCADE"),)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_fingerprint",
+        sa.Column("document_id", sa.Text(), *_document_fk(), primary_key=True),
+        sa.Column("content_hash", sa.Text(), nullable=False),
+        sa.Column("text_signature", sa.LargeBinary(), nullable=True),
+        sa.Column("image_hash", sa.BigInteger(), nullable=True),
+        sa.Column("duplicate_of", sa.Text(), nullable=True),
+        sa.Column("similarity", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_document_fingerprint_duplicate_of", "document_fingerprint", ["duplicate_of"]
+    )
+    op.create_table(
+        "signature_band",
+        sa.Column("band", sa.Text(), primary_key=True),
+        sa.Column("document_id", sa.Text(), *_document_fk(), primary_key=True),
+    )
+    op.create_index("ix_signature_band_document_id", "signature_band", ["document_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_signature_band_document_id", table_name="signature_band")
+    op.drop_table("signature_band")
+    op.drop_index("ix_document_fingerprint_duplicate_of", table_name="document_fingerprint")
+    op.drop_table("document_fingerprint")
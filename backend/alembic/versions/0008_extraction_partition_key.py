@@ -0,0 +1,87 @@
+"""Partition extraction by its document's upload month.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:00:00
+
+Extraction was partitioned by its own created_at while archiving selects a
+month by document.uploaded_at, so the two never lined up: a document
+uploaded on the 31st and processed on the 1st had its extraction in the
+next month's partition. Extraction now carries document_uploaded_at and,
+on PostgreSQL, is repartitioned by it.
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.partitions import (
+    add_months,
+    create_partition,
+    is_partitioned,
+    list_partitions,
+    month_start,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+INDEXES = [
+    ("ix_extraction_document_type_document_id", "document_type, document_id"),
+    ("ix_extraction_document_id", "document_id"),
+    ("ix_extraction_updated_at", "updated_at"),
+]
+
+
+def _repartition(key: str) -> None:
+    bind = op.get_bind()
+    legacy = "extraction_unpartitioned"
+    op.execute(f"ALTER TABLE extraction RENAME TO {legacy}")
+    op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT extraction_pkey TO {legacy}_pkey")
+    # The old partitions keep their names; move them aside so the new ones can take them.
+    for partition in list_partitions(bind, legacy):
+        op.execute(f"ALTER TABLE {partition} RENAME TO {partition}_old")
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute(
+        f"CREATE TABLE extraction (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE ({key})"
+    )
+    op.execute(f"ALTER TABLE extraction ADD PRIMARY KEY (id, {key})")
+    for name, columns in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON extraction ({columns})")
+
+    oldest = bind.execute(sa.text(f"SELECT min({key}) FROM {legacy}")).scalar()
+    month = month_start(oldest or datetime.utcnow())
+    last = add_months(month_start(datetime.utcnow()), MONTHS_AHEAD)
+    while month <= last:
+        create_partition(bind, "extraction", month, key)
+        month = add_months(month, 1)
+    op.execute("CREATE TABLE extraction_default PARTITION OF extraction DEFAULT")
+    op.execute(f"INSERT INTO extraction SELECT * FROM {legacy}")
+    # Dropping the partitioned parent drops its partitions with it.
+    op.execute(f"DROP TABLE {legacy}")
+
+
+def upgrade() -> None:
+    op.add_column("extraction", sa.Column("document_uploaded_at", sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE extraction SET document_uploaded_at = coalesce("
+        "(SELECT document.uploaded_at FROM document WHERE document.id = extraction.document_id), "
+        "extraction.created_at)"
+    )
+    with op.batch_alter_table("extraction") as batch_op:
+        batch_op.alter_column("document_uploaded_at", nullable=False)
+    if is_partitioned(op.get_bind()):
+        _repartition("document_uploaded_at")
+
+
+def downgrade() -> None:
+    if is_partitioned(op.get_bind()):
+        _repartition("created_at")
+    with op.batch_alter_table("extraction") as batch_op:
+        batch_op.drop_column("document_uploaded_at")
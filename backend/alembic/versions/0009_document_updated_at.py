@@ -0,0 +1,29 @@
+"""Track when a document row last changed.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("document", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE document SET updated_at = coalesce(processed_at, uploaded_at)")
+    with op.batch_alter_table("document") as batch_op:
+        batch_op.alter_column("updated_at", nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("document") as batch_op:
+        batch_op.drop_column("updated_at")
@@ -0,0 +1,35 @@
+"""Store the SHA-256 of each document's bytes.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 00:00:00
+
+Existing documents take the hash from their ``sha:`` duplicate-detection
+band where one was written; the others stay NULL.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("document", sa.Column("content_hash", sa.Text(), nullable=True))
+    op.execute(
+        "UPDATE document SET content_hash = ("
+        "SELECT substr(band, 5) FROM signature_band "
+        "WHERE signature_band.document_id = document.id AND band LIKE 'sha:%' LIMIT 1)"
+    )
+    op.create_index("ix_document_content_hash", "document", ["content_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_content_hash", table_name="document")
+    with op.batch_alter_table("document") as batch_op:
+        batch_op.drop_column("content_hash")
@@ -4,11 +4,15 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from .endpoints import documents, export, tasks, upload
+from .endpoints import documents, export, files, ingest, profiles, review, tasks, upload
 
 api_router = APIRouter(prefix="/api/v1")
 api_router.include_router(upload.router)
+api_router.include_router(ingest.router)
 api_router.include_router(documents.router)
+api_router.include_router(files.router)
 api_router.include_router(tasks.router)
 api_router.include_router(export.router)
+api_router.include_router(profiles.router)
+api_router.include_router(review.router)
 
@@ -2,17 +2,57 @@
 
 from __future__ import annotations
 
+import asyncio
+from bisect import bisect_right
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from ....core.database import get_session
-from ....models import Document, Extraction
+from ....core.http_cache import is_not_modified, make_etag, not_modified, validator_headers
+from ....models import Document, DocumentFingerprint, Extraction, ReviewItem
+from ....schemas.document import BulkCorrectionRequest
+from ....services.archive import LIST_COLUMNS, ArchiveStore
+from ....services.corrections import apply_correction, bulk_apply_corrections
+from ....services.layout import LAYOUT_ARTIFACT, DocumentLayout
+from ....services.response_cache import (
+    document_cache_key,
+    get_response_cache,
+    invalidate_documents,
+)
+from ....services.review import mark_reviewed
+from ....services.storage import StorageService
+from ....services.text_store import TEXT_ARTIFACT, TextStore
 
 router = APIRouter()
+MAX_TEXT_PAGES = 20
+MAX_TEXT_CHARS = 200_000
+
+
+def filter_documents(
+    query: Select,
+    type: str | None = None,
+    status: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+) -> Select:
+    """Apply the list filters; shapes match the composite indexes on document/extraction."""
+
+    if type:
+        query = query.join(Document.extraction).where(Extraction.document_type == type)
+    if status:
+        query = query.where(Document.status == status)
+    if date_from:
+        query = query.where(Document.uploaded_at >= date_from)
+    if date_to:
+        query = query.where(Document.uploaded_at <= date_to)
+    return query
 
 
 @router.get("/documents")
@@ -20,39 +60,55 @@ async def list_documents(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     type: str | None = Query(default=None, alias="type"),
+    status: str | None = None,
     date_from: str | None = None,
     date_to: str | None = None,
     sort_by: str = "uploaded_at",
     order: str = Query("desc", pattern="^(asc|desc)$"),
+    include_archived: bool = False,
+    request: Request = None,
+    response: Response = None,
     session: Annotated[AsyncSession, Depends(get_session)] = None,
 ) -> dict:
-    """Return paginated documents with filters."""
+    """Return paginated documents with filters.
 
-    query = select(Document).options(selectinload(Document.extraction))
-    if type:
-        query = query.join(Document.extraction, isouter=True).where(
-            Extraction.document_type == type
+    With ``include_archived`` the page is merged from the hot table and the
+    Parquet archive, each read up to ``page * limit`` rows.
+    """
+
+    filters = {"type": type, "status": status, "date_from": date_from, "date_to": date_to}
+    # Validate the page before building it from two cheap reads: a count and the
+    # newest update over the filtered documents alone, and the newest extraction
+    # update overall, an index-only max that also catches corrections.
+    matching = filter_documents(select(Document.id, Document.updated_at), **filters).subquery()
+    total, documents_updated = (
+        await session.execute(
+            select(func.count(), func.max(matching.c.updated_at)).select_from(matching)
         )
-    if date_from:
-        query = query.where(Document.uploaded_at >= date_from)
-    if date_to:
-        query = query.where(Document.uploaded_at <= date_to)
+    ).one()
+    extractions_updated = await session.scalar(select(func.max(Extraction.updated_at)))
+    validator = (total, documents_updated, extractions_updated)
+    archive_months = ArchiveStore().months() if include_archived else []
+    last_modified = max((value for value in validator[1:] if value is not None), default=None)
+    etag = make_etag(
+        "list", filters, page, limit, sort_by, order, validator, archive_months
+    )
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    response.headers.update(validator_headers(etag, last_modified))
 
+    query = filter_documents(
+        select(Document).options(selectinload(Document.extraction)), **filters
+    )
     sort_column = getattr(Document, sort_by, Document.uploaded_at)
     if order == "desc":
         sort_column = sort_column.desc()
-    query = query.order_by(sort_column).offset((page - 1) * limit).limit(limit)
+    if include_archived:
+        query = query.order_by(sort_column).limit(page * limit)
+    else:
+        query = query.order_by(sort_column).offset((page - 1) * limit).limit(limit)
     result = await session.scalars(query)
-    count_query = select(func.count()).select_from(Document)
-    if type:
-        count_query = count_query.join(Document.extraction, isouter=True).where(
-            Extraction.document_type == type
-        )
-    if date_from:
-        count_query = count_query.where(Document.uploaded_at >= date_from)
-    if date_to:
-        count_query = count_query.where(Document.uploaded_at <= date_to)
-    total = await session.scalar(count_query)
+    total = total or 0
 
     data = []
     for doc in result:
@@ -71,42 +127,270 @@ async def list_documents(
                 "confidence_scores": extraction.confidence_scores if extraction else None,
             }
         )
-    return {"data": data, "total": total or 0, "page": page, "limit": limit}
+    if include_archived:
+        key = sort_by if sort_by in LIST_COLUMNS and hasattr(Document, sort_by) else "uploaded_at"
+        store = ArchiveStore()
+        archived = await asyncio.to_thread(
+            store.query, page * limit, key, order == "desc", **filters
+        )
+        total += await asyncio.to_thread(store.count, **filters)
+        merged = sorted(
+            data + archived,
+            key=lambda row: (row[key] is not None, row[key] if row[key] is not None else 0),
+            reverse=order == "desc",
+        )
+        data = merged[(page - 1) * limit : page * limit]
+    return {"data": data, "total": total, "page": page, "limit": limit}
 
 
 @router.get("/documents/{document_id}")
 async def get_document(
     document_id: str,
+    request: Request,
+    include_archived: bool = False,
+    include_text: bool = False,
     session: Annotated[AsyncSession, Depends(get_session)] = None,
-) -> dict:
-    """Fetch a single document with extraction data."""
+) -> Response:
+    """Fetch a single document with extraction data.
 
-    document = await session.get(
-        Document,
-        document_id,
-        options=(selectinload(Document.extraction),),
+    The OCR text is left out unless ``include_text`` is set; the payload
+    carries ``page_count`` and ``text_length`` and the viewer pages through
+    ``/documents/{id}/text``. Completed documents are served from the response
+    cache when one is configured; ``If-None-Match`` is answered with 304
+    before any payload is built.
+    """
+
+    cache = get_response_cache() if not include_text else None
+    key = document_cache_key(document_id)
+    cached = await asyncio.to_thread(cache.get, key) if cache is not None else None
+    if cached is not None:
+        last_modified = datetime.fromisoformat(cached["last_modified"])
+        if is_not_modified(request, cached["etag"], last_modified):
+            return not_modified(cached["etag"], last_modified)
+        return JSONResponse(
+            cached["payload"], headers=validator_headers(cached["etag"], last_modified)
+        )
+
+    state = (
+        await session.execute(
+            select(
+                Document.status,
+                Document.uploaded_at,
+                Document.processed_at,
+                Extraction.updated_at,
+                Extraction.page_offsets,
+                func.length(Extraction.ocr_text),
+            )
+            .outerjoin(Extraction, Extraction.document_id == Document.id)
+            .where(Document.id == document_id)
+        )
+    ).first()
+    if state is None:
+        if include_archived:
+            archived = await asyncio.to_thread(ArchiveStore().get, document_id)
+            if archived is not None:
+                archived["download_url"] = f"/api/v1/files/{document_id}"
+                text = archived.pop("ocr_text", None)
+                if include_text:
+                    archived["ocr_text"] = text
+                archived["text_length"] = len(text) if text is not None else None
+                return JSONResponse(jsonable_encoder(archived))
+        raise HTTPException(status_code=404, detail="Document not found")
+    status, uploaded_at, processed_at, updated_at, page_offsets, text_length = state
+    last_modified = updated_at or processed_at or uploaded_at
+    etag = make_etag(
+        "document", document_id, status, uploaded_at, processed_at, updated_at, include_text
     )
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    extraction_loader = selectinload(Document.extraction)
+    if not include_text:
+        extraction_loader = extraction_loader.defer(Extraction.ocr_text)
+    document = await session.get(Document, document_id, options=(extraction_loader,))
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     extraction = document.extraction
+    fingerprint = await session.get(DocumentFingerprint, document_id)
+    payload = jsonable_encoder(
+        {
+            "id": document.id,
+            "filename": document.filename,
+            "mime_type": document.mime_type,
+            "file_size": document.file_size,
+            "status": document.status,
+            "uploaded_at": document.uploaded_at,
+            "processed_at": document.processed_at,
+            "error_message": document.error_message,
+            "download_url": f"/api/v1/files/{document.id}",
+            "extracted_data": extraction.extracted_data if extraction else None,
+            "confidence_scores": extraction.confidence_scores if extraction else None,
+            "document_type": extraction.document_type if extraction else None,
+            "processing_time": extraction.processing_time if extraction else None,
+            "text_length": text_length,
+            "text_partial": extraction.text_partial if extraction else False,
+            "page_count": len(page_offsets) - 1 if page_offsets else (1 if extraction else 0),
+            "duplicate_of": fingerprint.duplicate_of if fingerprint else None,
+            "duplicate_similarity": fingerprint.similarity if fingerprint else None,
+        }
+    )
+    if include_text:
+        payload["ocr_text"] = extraction.ocr_text if extraction else None
+    if cache is not None and document.status == "completed":
+        await asyncio.to_thread(
+            cache.set,
+            key,
+            {"etag": etag, "last_modified": last_modified.isoformat(), "payload": payload},
+        )
+    return JSONResponse(payload, headers=validator_headers(etag, last_modified))
+
+
+def _open_text_store(document_id: str) -> TextStore | None:
+    path = StorageService().artifact_path(document_id, TEXT_ARTIFACT)
+    return TextStore.open(path) if path is not None else None
+
+
+@router.get("/documents/{document_id}/text")
+async def get_document_text(
+    document_id: str,
+    request: Request,
+    page: int = Query(0, ge=0),
+    pages: int = Query(1, ge=1, le=MAX_TEXT_PAGES),
+    start: int | None = Query(default=None, ge=0),
+    length: int = Query(20_000, ge=1, le=MAX_TEXT_CHARS),
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> Response:
+    """Return a page range (``page``/``pages``) or character range (``start``/``length``).
+
+    Pages come from the document's text store artifact when present (one
+    frame per page); otherwise only the requested slice is read from the
+    database. Offsets index the text as stored; page slices keep their
+    trailing blank-line separator.
+    """
+
+    updated_at = await session.scalar(
+        select(Extraction.updated_at).where(Extraction.document_id == document_id)
+    )
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Text not available")
+    store = await asyncio.to_thread(_open_text_store, document_id)
+    try:
+        if store is not None:
+            offsets, text_length = store.page_offsets, store.text_length
+        else:
+            page_offsets, text_length = (
+                await session.execute(
+                    select(Extraction.page_offsets, func.length(Extraction.ocr_text)).where(
+                        Extraction.document_id == document_id
+                    )
+                )
+            ).one()
+            offsets = (
+                page_offsets if page_offsets and len(page_offsets) > 1 else [0, text_length]
+            )
+        page_count = len(offsets) - 1
+
+        if start is None:
+            if page >= page_count:
+                raise HTTPException(status_code=404, detail="Page out of range")
+            page_end = min(page + pages, page_count)
+            begin, end = offsets[page], offsets[page_end]
+        else:
+            begin = min(start, text_length)
+            end = min(begin + length, text_length)
+            page = min(bisect_right(offsets, begin) - 1, page_count - 1)
+            page_end = max(min(bisect_right(offsets, max(end - 1, begin)), page_count), page + 1)
+
+        etag = make_etag("text", document_id, updated_at, begin, end)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified(etag, updated_at)
+        text = ""
+        if end > begin and store is not None:
+            text = await asyncio.to_thread(store.span, begin, end)
+        elif end > begin:
+            text = await session.scalar(
+                select(func.substr(Extraction.ocr_text, begin + 1, end - begin)).where(
+                    Extraction.document_id == document_id
+                )
+            )
+    finally:
+        if store is not None:
+            store.close()
+    payload = {
+        "document_id": document_id,
+        "page_count": page_count,
+        "text_length": text_length,
+        "page_start": page,
+        "page_end": page_end,
+        "start": begin,
+        "end": end,
+        "text": text,
+    }
+    return JSONResponse(payload, headers=validator_headers(etag, updated_at))
+
+
+@router.get("/documents/{document_id}/duplicates")
+async def list_duplicates(
+    document_id: str,
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> dict:
+    """The original this document duplicates and the other copies linked to it."""
+
+    fingerprint = await session.get(DocumentFingerprint, document_id)
+    if fingerprint is None:
+        raise HTTPException(status_code=404, detail="No fingerprint for document")
+    original = fingerprint.duplicate_of or document_id
+    rows = await session.execute(
+        select(
+            DocumentFingerprint.document_id,
+            DocumentFingerprint.similarity,
+            Document.filename,
+            Document.uploaded_at,
+        )
+        .join(Document, Document.id == DocumentFingerprint.document_id)
+        .where(DocumentFingerprint.duplicate_of == original)
+        .order_by(Document.uploaded_at)
+    )
     return {
-        "id": document.id,
-        "filename": document.filename,
-        "mime_type": document.mime_type,
-        "file_size": document.file_size,
-        "status": document.status,
-        "uploaded_at": document.uploaded_at,
-        "processed_at": document.processed_at,
-        "error_message": document.error_message,
-        "download_url": f"/api/v1/files/{document.id}",
-        "extracted_data": extraction.extracted_data if extraction else None,
-        "confidence_scores": extraction.confidence_scores if extraction else None,
-        "document_type": extraction.document_type if extraction else None,
-        "ocr_text": extraction.ocr_text if extraction else None,
-        "processing_time": extraction.processing_time if extraction else None,
+        "document_id": document_id,
+        "original": original,
+        "duplicates": [
+            jsonable_encoder(dict(row._mapping))
+            for row in rows
+            if row.document_id != document_id
+        ],
     }
 
 
+@router.get("/documents/{document_id}/layout")
+def get_document_layout(document_id: str, page: int = Query(0, ge=0)) -> dict:
+    """Return word boxes and OCR confidences for one page, for highlighting."""
+
+    path = StorageService().artifact_path(document_id, LAYOUT_ARTIFACT)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Layout not available")
+    layout = DocumentLayout.from_bytes(path.read_bytes())
+    if page >= layout.page_count:
+        raise HTTPException(status_code=404, detail="Page out of range")
+    payload = layout.page_payload(page)
+    payload["page_count"] = layout.page_count
+    return payload
+
+
+@router.patch("/documents/extracted-data")
+async def bulk_update_extracted_data(
+    request: BulkCorrectionRequest,
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> dict:
+    """Apply corrections to many documents in one round trip."""
+
+    results = await bulk_apply_corrections(
+        session, [item.model_dump() for item in request.items]
+    )
+    await invalidate_documents(row["document_id"] for row in results if row["status"] == "ok")
+    return {"results": results}
+
+
 @router.patch("/documents/{document_id}/extracted-data")
 async def update_extracted_data(
     document_id: str,
@@ -123,13 +407,16 @@ async def update_extracted_data(
     if not document or not document.extraction:
         raise HTTPException(status_code=404, detail="Document not found")
     extraction = document.extraction
-    extraction.extracted_data.update(payload.get("extracted_data", {}))
-    scores = payload.get("confidence_scores") or {}
-    for key in payload.get("extracted_data", {}):
-        scores[key] = 1.0
-    extraction.confidence_scores.update(scores)
-    extraction.manually_corrected = True
+    apply_correction(
+        extraction,
+        payload.get("extracted_data", {}),
+        payload.get("confidence_scores"),
+    )
+    item = await session.scalar(select(ReviewItem).where(ReviewItem.document_id == document_id))
+    if item is not None and item.status != "reviewed":
+        mark_reviewed(item, None)
     await session.commit()
+    await invalidate_documents([document_id])
     await session.refresh(extraction)
     return {"status": "ok", "extracted_data": extraction.extracted_data}
 
@@ -0,0 +1,98 @@
+"""Original file downloads and page thumbnails."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ....core.config import settings
+from ....core.database import get_session
+from ....core.file_response import RangeFileResponse
+from ....models import Document
+from ....services.archive import ArchiveStore
+from ....services.thumbnails import get_thumbnail_cache
+
+router = APIRouter()
+
+
+async def _stored_file(session: AsyncSession, document_id: str) -> dict[str, Any]:
+    """Locate a document's file, looking in the archive when it left the hot tables."""
+
+    row = (
+        await session.execute(
+            select(Document.file_path, Document.filename, Document.mime_type).where(
+                Document.id == document_id
+            )
+        )
+    ).first()
+    if row is not None:
+        found = dict(row._mapping)
+    else:
+        found = await asyncio.to_thread(ArchiveStore().get, document_id)
+        if found is None:
+            raise HTTPException(status_code=404, detail="Document not found")
+    if not found["file_path"] or not Path(found["file_path"]).is_file():
+        raise HTTPException(status_code=404, detail="File not available")
+    return found
+
+
+@router.api_route("/files/{document_id}", methods=["GET", "HEAD"])
+async def download_file(
+    document_id: str,
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> RangeFileResponse:
+    """Stream the original upload; honours ``Range`` for viewers that fetch on demand."""
+
+    found = await _stored_file(session, document_id)
+    return RangeFileResponse(
+        found["file_path"],
+        media_type=found["mime_type"],
+        filename=found["filename"],
+        method=request.method,
+        content_disposition_type="inline",
+    )
+
+
+@router.get("/files/{document_id}/pages")
+async def get_page_count(
+    document_id: str,
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> dict:
+    """Number of pages the viewer can request thumbnails for."""
+
+    found = await _stored_file(session, document_id)
+    try:
+        count = await asyncio.to_thread(get_thumbnail_cache().page_count, found["file_path"])
+    except RuntimeError as exc:
+        raise HTTPException(status_code=415, detail="Preview not available") from exc
+    return {"document_id": document_id, "page_count": count}
+
+
+@router.get("/files/{document_id}/pages/{page}/thumbnail")
+async def get_page_thumbnail(
+    document_id: str,
+    page: int,
+    width: int | None = Query(default=None, ge=16),
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> RangeFileResponse:
+    """Low-resolution PNG of one page, rendered on first request and cached."""
+
+    found = await _stored_file(session, document_id)
+    width = min(width or settings.thumbnail_default_width, settings.thumbnail_max_width)
+    try:
+        path = await asyncio.to_thread(
+            get_thumbnail_cache().get, found["file_path"], document_id, page, width
+        )
+    except IndexError as exc:
+        raise HTTPException(status_code=404, detail="Page out of range") from exc
+    except RuntimeError as exc:
+        raise HTTPException(status_code=415, detail="Preview not available") from exc
+    return RangeFileResponse(
+        path, media_type="image/png", headers={"Cache-Control": "private, max-age=86400"}
+    )
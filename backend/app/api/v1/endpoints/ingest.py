@@ -0,0 +1,83 @@
+"""Bulk ingestion endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ....core.config import settings
+from ....core.database import get_session
+from ....schemas.ingest import IngestDirectoryRequest
+from ....services.ingest import (
+    BulkIngestor,
+    IngestReport,
+    iter_archive,
+    iter_directory,
+    resolve_ingest_directory,
+)
+from ....services.storage import StorageService
+
+router = APIRouter()
+
+
+@router.post("/ingest/archive", status_code=201)
+async def ingest_archive(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> dict:
+    """Ingest a ZIP or TAR(.gz/.bz2/.xz) archive sent as the raw request body.
+
+    The body is spooled to disk next to the uploads rather than held in memory,
+    up to ``ingest_max_archive_mb``. Documents are created before the response,
+    which lists their ids; processing is queued.
+    """
+
+    max_bytes = settings.ingest_max_archive_mb * 1024 * 1024
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > max_bytes:
+        raise HTTPException(status_code=413, detail=_too_large())
+    storage = StorageService()
+    with tempfile.TemporaryFile(dir=storage.base_dir) as spool:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail=_too_large())
+            await asyncio.to_thread(spool.write, chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty archive.")
+        await asyncio.to_thread(spool.seek, 0)
+        try:
+            report = await BulkIngestor(session, storage=storage).ingest(iter_archive(spool))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return _created(report)
+
+
+def _too_large() -> str:
+    return f"Archive exceeds {settings.ingest_max_archive_mb} MB."
+
+
+def _created(report: IngestReport) -> dict:
+    return {**report.as_dict(), "documents": report.document_ids}
+
+
+@router.post("/ingest/directory", status_code=201)
+async def ingest_directory(
+    payload: IngestDirectoryRequest,
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> dict:
+    """Ingest files from a directory under one of ``ingest_allowed_dirs``."""
+
+    try:
+        root = resolve_ingest_directory(payload.path)
+    except PermissionError as exc:
+        raise HTTPException(status_code=403, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    report = await BulkIngestor(session).ingest(iter_directory(root, payload.recursive))
+    return _created(report)
@@ -0,0 +1,38 @@
+"""Profile artifact download endpoints."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from ....services.storage import StorageService
+
+router = APIRouter()
+
+
+def _profile_response(owner: str, name: str) -> FileResponse:
+    path = StorageService().artifact_path(owner, name)
+    if not name.startswith("profile-") or path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
+
+
+@router.get("/documents/{document_id}/profiles")
+def list_document_profiles(document_id: str) -> dict:
+    """List profiles captured for a document's requests and processing jobs."""
+
+    return {"profiles": StorageService().list_artifacts(document_id, prefix="profile-")}
+
+
+@router.get("/documents/{document_id}/profiles/{name}")
+def download_document_profile(document_id: str, name: str) -> FileResponse:
+    """Download a collapsed-stack profile for a document."""
+
+    return _profile_response(document_id, name)
+
+
+@router.get("/profiles/{name}")
+def download_request_profile(name: str) -> FileResponse:
+    """Download a profile captured for a request not tied to a document."""
+
+    return _profile_response("requests", name)
@@ -0,0 +1,65 @@
+"""Human review worklist endpoints."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ....core.config import settings
+from ....core.database import get_session
+from ....schemas.review import ReviewClaimRequest, ReviewSubmission
+from ....services.review import ReviewQueue
+
+router = APIRouter()
+
+
+@router.get("/review/queue")
+async def list_review_queue(
+    limit: int = Query(50, ge=1, le=200),
+    include_claimed: bool = False,
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> dict:
+    """Return the lowest-confidence extractions first, without OCR text."""
+
+    items = await ReviewQueue(session).list(limit, include_claimed=include_claimed)
+    return {"data": items, "count": len(items)}
+
+
+@router.post("/review/claim")
+async def claim_review_items(
+    request: ReviewClaimRequest,
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> dict:
+    """Lease the next items to a reviewer; expired leases are reclaimed."""
+
+    lease = request.lease_seconds or settings.review_lease_seconds
+    items = await ReviewQueue(session).claim(request.reviewer, request.limit, lease)
+    return {"data": items, "count": len(items), "lease_seconds": lease}
+
+
+@router.post("/review/{item_id}/release")
+async def release_review_item(
+    item_id: str,
+    reviewer: str = Query(..., min_length=1),
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> dict:
+    """Return a claimed item to the worklist."""
+
+    if not await ReviewQueue(session).release(item_id, reviewer):
+        raise HTTPException(status_code=409, detail="Item is not claimed by this reviewer")
+    return {"status": "ok"}
+
+
+@router.post("/review/submit")
+async def submit_reviews(
+    submission: ReviewSubmission,
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> dict:
+    """Apply a batch of corrections atomically and report the outcome per document."""
+
+    results = await ReviewQueue(session).submit(
+        submission.reviewer, [item.model_dump() for item in submission.items]
+    )
+    return {"results": results}
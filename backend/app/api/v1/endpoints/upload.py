@@ -1,17 +1,38 @@
-"""Upload endpoint."""
+"""Upload endpoints: multipart upload, hash handshake and resumable chunks."""
 
 from __future__ import annotations
 
+import hashlib
 import logging
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ....core.config import settings
 from ....core.database import get_session
-from ....core.security import validate_magic_bytes, validate_mime_type
-from ....models import Document
+from ....core.profiling import profiling_requested
+from ....core.security import MAGIC_BYTES, validate_magic_bytes, validate_mime_type
+from ....models import Document, UploadSession
+from ....schemas.upload import UploadHandshakeRequest
 from ....services.storage import StorageService
+from ....services.uploads import (
+    UploadIntegrityError,
+    UploadManager,
+    UploadOffsetMismatch,
+    UploadTooLarge,
+)
 from ....workers.tasks import process_document
 
 router = APIRouter()
@@ -23,6 +44,7 @@ async def upload_documents(
     background_tasks: BackgroundTasks,
     files: list[UploadFile] = File(...),
     session: Annotated[AsyncSession, Depends(get_session)] = None,
+    x_profile: Annotated[str | None, Header()] = None,
 ) -> dict:
     """Upload document(s) and trigger background processing."""
 
@@ -34,7 +56,7 @@ async def upload_documents(
     for file in files:
         content = await file.read()
         validate_mime_type(file.content_type or "")
-        validate_magic_bytes(content[:8])
+        validate_magic_bytes(content[:MAGIC_BYTES])
         file.file.seek(0)
         path = storage.save_upload(file)
         document = Document(
@@ -42,12 +64,116 @@ async def upload_documents(
             file_path=str(path),
             file_size=len(content),
             mime_type=file.content_type or "application/octet-stream",
+            content_hash=hashlib.sha256(content).hexdigest(),
             status="pending",
         )
         session.add(document)
         created.append(document)
     await session.commit()
-    for document in created:
-        background_tasks.add_task(process_document.delay, document.id)
+    _schedule(background_tasks, created, x_profile)
     return {"documents": [doc.id for doc in created]}
 
+
+def _schedule(
+    background_tasks: BackgroundTasks, documents: list[Document], x_profile: str | None
+) -> None:
+    # X-Profile on upload also profiles the background processing job.
+    task_kwargs = {"profile": True} if profiling_requested(x_profile) else {}
+    for document in documents:
+        # Use the document id as task id so progress is addressable via /tasks/{id}.
+        background_tasks.add_task(
+            process_document.apply_async,
+            args=[document.id],
+            kwargs=task_kwargs,
+            task_id=document.id,
+        )
+
+
+def _progress(upload: UploadSession, document: Document | None = None) -> dict:
+    payload = {"upload_id": upload.id, "offset": upload.received, "size": upload.size}
+    if document is not None:
+        payload["document_id"] = document.id
+    return payload
+
+
+@router.post("/upload/handshake")
+async def upload_handshake(
+    payload: UploadHandshakeRequest,
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> dict:
+    """Announce files by SHA-256 and metadata before sending any bytes.
+
+    Each file is answered with ``have`` (the existing ``document_id``),
+    ``rejected`` (with a ``reason``) or ``send`` (an ``upload_id`` and the
+    ``offset`` to resume from).
+    """
+
+    if len(payload.files) > settings.max_upload_files:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.max_upload_files} files per batch."
+        )
+    return {"files": await UploadManager(session).handshake(payload.files)}
+
+
+@router.get("/upload/sessions/{upload_id}")
+async def get_upload_session(
+    upload_id: str,
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> dict:
+    """How many bytes of an upload the server holds, to resume after a failure."""
+
+    try:
+        upload = await UploadManager(session).get(upload_id)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail="Upload session not found.") from exc
+    return _progress(upload)
+
+
+@router.put("/upload/sessions/{upload_id}")
+async def put_upload_chunk(
+    upload_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    offset: int = Query(ge=0),
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+    x_profile: Annotated[str | None, Header()] = None,
+) -> dict:
+    """Append the raw request body at ``offset``; the last chunk creates the document.
+
+    A chunk at any other offset than the bytes received so far gets a 409
+    whose detail carries the offset to continue from.
+    """
+
+    manager = UploadManager(session)
+    try:
+        upload, document = await manager.write_chunk(upload_id, offset, request.stream())
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail="Upload session not found.") from exc
+    except UploadOffsetMismatch as exc:
+        raise HTTPException(
+            status_code=409, detail={"message": str(exc), "offset": exc.expected}
+        ) from exc
+    except UploadIntegrityError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except UploadTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if document is not None:
+        _schedule(background_tasks, [document], x_profile)
+    return _progress(upload, document)
+
+
+@router.delete("/upload/sessions/{upload_id}", status_code=204, response_class=Response)
+async def cancel_upload_session(
+    upload_id: str,
+    session: Annotated[AsyncSession, Depends(get_session)] = None,
+) -> Response:
+    """Abandon an upload and delete the bytes received so far."""
+
+    manager = UploadManager(session)
+    try:
+        await manager.discard(await manager.get(upload_id))
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail="Upload session not found.") from exc
+    return Response(status_code=204)
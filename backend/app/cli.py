@@ -0,0 +1,116 @@
+"""Operator commands: `python -m app.cli --help`."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+from .core.database import SessionLocal
+from .core.logging_config import setup_logging
+from .core.migrations import upgrade_database
+from .services.archive import Archiver
+from .services.columnar import ColumnarExporter, ExportResult
+from .services.ingest import BulkIngestor, IngestReport, iter_archive, iter_directory
+
+
+async def _ingest(
+    path: Path, recursive: bool, batch_size: int | None, enqueue: bool
+) -> IngestReport:
+    async with SessionLocal() as session:
+        ingestor = BulkIngestor(session, batch_size=batch_size)
+        if not enqueue:
+            ingestor.enqueue = None
+        if path.is_dir():
+            return await ingestor.ingest(iter_directory(path, recursive))
+        with path.open("rb") as archive:
+            return await ingestor.ingest(iter_archive(archive))
+
+
+async def _archive(before: str | None) -> dict:
+    if before is None:
+        from .workers.tasks import run_archival  # pulls in Celery; only needed here
+
+        return await run_archival()
+    async with SessionLocal() as session:
+        return await Archiver(session).archive_before(date.fromisoformat(f"{before}-01"))
+
+
+async def _export(
+    output: Path, format: str, since: datetime | None, watermark_file: Path | None
+) -> ExportResult:
+    if since is None and watermark_file is not None and watermark_file.exists():
+        since = datetime.fromisoformat(watermark_file.read_text().strip())
+    async with SessionLocal() as session:
+        result = await ColumnarExporter(session).write(output, format=format, since=since)
+    if watermark_file is not None and result.watermark is not None:
+        watermark_file.write_text(result.watermark.isoformat())
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="DOC-IA operator commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", help="Apply database migrations")
+    migrate.add_argument("revision", nargs="?", default="head")
+
+    ingest = commands.add_parser("ingest", help="Bulk-ingest a directory or ZIP/TAR archive")
+    ingest.add_argument("path", type=Path, help="Directory, .zip or .tar[.gz|.bz2|.xz]")
+    ingest.add_argument("--no-recursive", dest="recursive", action="store_false")
+    ingest.add_argument("--batch-size", type=int, help="Rows per INSERT and enqueue batch")
+    ingest.add_argument(
+        "--no-enqueue", dest="enqueue", action="store_false", help="Create rows only"
+    )
+    archive = commands.add_parser(
+        "archive", help="Move months older than ARCHIVE_AFTER_MONTHS to Parquet"
+    )
+    archive.add_argument("--before", help="Archive months before YYYY-MM instead")
+    export = commands.add_parser("export", help="Write typed extraction columns to a file")
+    export.add_argument("output", type=Path, help="Destination .parquet or .arrow file")
+    export.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    export.add_argument("--since", type=datetime.fromisoformat, help="Updated-after watermark")
+    export.add_argument(
+        "--watermark-file",
+        type=Path,
+        help="Read the watermark from this file and store the new one there (incremental)",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    if args.command == "migrate":
+        asyncio.run(upgrade_database(revision=args.revision))
+        return 0
+    if args.command == "export":
+        result = asyncio.run(_export(args.output, args.format, args.since, args.watermark_file))
+        json.dump(
+            {
+                "rows": result.rows,
+                "watermark": result.watermark.isoformat() if result.watermark else None,
+            },
+            sys.stdout,
+        )
+        sys.stdout.write("\n")
+        return 0
+    if args.command == "archive":
+        moved = asyncio.run(_archive(args.before))
+        json.dump(moved, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+
+    if not args.path.exists():
+        parser.error(f"{args.path} does not exist")
+    try:
+        report = asyncio.run(_ingest(args.path, args.recursive, args.batch_size, args.enqueue))
+    except ValueError as exc:
+        parser.error(str(exc))
+    json.dump(report.as_dict(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from celery import Celery
+from celery.schedules import crontab
 
 from .config import settings
 
@@ -18,5 +19,11 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    beat_schedule={
+        "archive-documents": {
+            "task": "archive_documents",
+            "schedule": crontab(day_of_month="1", hour="3", minute="0"),
+        },
+    },
 )
 
@@ -36,7 +36,52 @@ class Settings(BaseSettings):
 
     # OCR
     tesseract_cmd: str | None = Field(default=None, description="Override path")
-    ocr_languages: str = Field(default="fra+eng")
+    ocr_languages: str = Field(default="fra+eng", description="Candidate languages")
+    # Fallback when the adaptive resolution below is off or cannot estimate the text
+    # height. It stays at Tesseract's recommended 300: rasterization got cheaper by
+    # skipping PNG encoding, not by lowering the resolution, which costs accuracy.
+    ocr_render_dpi: int = Field(default=300, description="Fallback DPI for scanned pages")
+    ocr_min_image_px: int = Field(default=48, description="Skip smaller embedded images")
+    # Adaptive resolution: rescale so the median glyph is about ocr_target_text_px tall
+    ocr_adaptive_resolution: bool = Field(default=True)
+    ocr_target_text_px: float = Field(default=24.0)
+    ocr_probe_dpi: int = Field(default=150)
+    ocr_min_dpi: int = Field(default=100)
+    ocr_max_dpi: int = Field(default=400)
+    # Region-of-interest OCR: header/totals regions first, the rest only if needed
+    ocr_regions_enabled: bool = Field(default=True)
+    ocr_region_min_score: float = Field(default=0.4)
+    # Per-page language detection: keep only the ocr_languages a sample needs
+    ocr_language_detection: bool = Field(default=True)
+    ocr_language_sample_text_px: float = Field(default=14.0)
+    ocr_language_min_hits: int = Field(default=4)
+    ocr_language_mix_ratio: float = Field(default=0.3)
+    # Legacy .doc files are converted to DOCX with headless LibreOffice
+    doc_converter: str | None = Field(default=None, description="soffice path; PATH if unset")
+    doc_conversion_timeout: int = Field(default=60)
+
+    # Document type classification
+    document_type_vocabulary: Path | None = Field(
+        default=None, description="JSON file: {type: {language: {keyword: weight}}}"
+    )
+    document_type_languages: list[str] = Field(default_factory=lambda: ["fr", "en"])
+
+    # Local rule-based extraction (skips Gemini when confident)
+    local_extraction_enabled: bool = Field(default=True)
+    local_extraction_threshold: float = Field(default=0.8)
+
+    # Duplicate detection (MinHash/LSH on text, dHash on the first page)
+    duplicate_detection_enabled: bool = Field(default=True)
+    duplicate_text_threshold: float = Field(default=0.85)
+    duplicate_image_distance: int = Field(default=6, description="Max dHash Hamming distance")
+    duplicate_reuse_extraction: bool = Field(
+        default=False, description="Copy a duplicate's extraction instead of re-extracting"
+    )
+    duplicate_reuse_threshold: float = Field(default=0.97)
+
+    # Human review worklist
+    review_confidence_threshold: float = Field(default=0.85)
+    review_lease_seconds: int = Field(default=900)
 
     # Gemini / Generative AI
     gemini_api_key: str = Field(default="changeme")
@@ -47,10 +92,43 @@ class Settings(BaseSettings):
     allowed_origins: list[str] = Field(default_factory=lambda: ["*"])
     max_upload_size_mb: int = Field(default=50)
     max_upload_files: int = Field(default=10)
+    # Resumable uploads: hash handshake first, then chunks at explicit offsets
+    upload_chunk_size_mb: int = Field(default=5)
+    upload_session_ttl_hours: int = Field(default=24)
+
+    # Bulk ingestion (archives and server-side directories)
+    ingest_batch_size: int = Field(default=500)
+    ingest_max_archive_mb: int = Field(default=2048, description="Cap on an uploaded archive")
+    ingest_allowed_dirs: list[Path] = Field(
+        default_factory=list, description="Directories the API may ingest from"
+    )
 
     # Rate limiting (prototype, enforced via headers)
     max_uploads_per_hour: int = Field(default=100)
 
+    # Partitioning and archival (documents older than N months go to Parquet)
+    archive_after_months: int = Field(default=24)
+    partition_months_ahead: int = Field(default=3)
+
+    # Incremental columnar export: updated_at is set before commit, so a later
+    # export re-reads this many seconds behind its `since` watermark
+    export_watermark_lag_seconds: int = Field(default=300)
+
+    # Response cache for completed documents ("none", "memory" or "redis")
+    response_cache_backend: Literal["none", "memory", "redis"] = Field(default="none")
+    response_cache_ttl: int = Field(default=300)
+    response_cache_max_entries: int = Field(default=2048)
+
+    # Page thumbnails for the viewer, rendered once and cached on disk (LRU)
+    thumbnail_cache_mb: int = Field(default=512)
+    thumbnail_default_width: int = Field(default=256)
+    thumbnail_max_width: int = Field(default=1024)
+
+    # Profiling (off by default; when on, X-Profile must carry the token if one is set)
+    profiling_enabled: bool = Field(default=False)
+    profiling_token: str | None = Field(default=None)
+    profiling_interval_ms: float = Field(default=5.0)
+
     class Config:
         env_file = PROJECT_ROOT / "backend" / ".env"
         env_file_encoding = "utf-8"
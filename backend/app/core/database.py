@@ -18,12 +18,3 @@ async def get_session() -> AsyncIterator[AsyncSession]:
     async with SessionLocal() as session:
         yield session
 
-
-async def init_models() -> None:
-    """Create database tables if they do not exist."""
-
-    from ..models import Base  # local import to avoid circular dependency
-
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
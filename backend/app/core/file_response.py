@@ -0,0 +1,115 @@
+"""File responses honouring single HTTP byte ranges."""
+
+from __future__ import annotations
+
+import os
+import re
+import stat
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+ZERO_COPY_EXTENSION = "http.response.zerocopysend"
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Resolve a single ``bytes=`` range to inclusive offsets.
+
+    Returns None for a syntactically valid but unsatisfiable range and raises
+    ValueError for ranges the server should ignore (malformed or multi-range).
+    """
+
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        raise ValueError(header)
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+class RangeFileResponse(FileResponse):
+    """FileResponse with ``Range``/``If-Range`` support and zero-copy send.
+
+    The ASGI ``http.response.zerocopysend`` extension (sendfile) is used when
+    the server offers it; otherwise only the requested slice is read in chunks.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stat_result = self.stat_result or await anyio.to_thread.run_sync(os.stat, self.path)
+        if not stat.S_ISREG(stat_result.st_mode):
+            raise RuntimeError(f"File at path {self.path} is not a file.")
+        self.set_stat_headers(stat_result)
+        self.headers["accept-ranges"] = "bytes"
+        size = stat_result.st_size
+        start, end, status = 0, size - 1, self.status_code
+
+        request_headers = Headers(scope=scope)
+        requested = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if requested and (
+            if_range is None
+            or if_range in (self.headers["etag"], self.headers["last-modified"])
+        ):
+            try:
+                resolved = parse_range(requested, size)
+            except ValueError:
+                resolved = (0, size - 1)
+            if resolved is None:
+                await self._unsatisfiable(size, send)
+                return
+            if resolved != (0, size - 1):
+                start, end = resolved
+                status = 206
+                self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+        length = max(end - start + 1, 0)
+        self.headers["content-length"] = str(length)
+
+        await send({"type": "http.response.start", "status": status, "headers": self.raw_headers})
+        if self.send_header_only or length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif ZERO_COPY_EXTENSION in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send(
+                    {
+                        "type": ZERO_COPY_EXTENSION,
+                        "file": file.fileno(),
+                        "offset": start,
+                        "count": length,
+                        "more_body": False,
+                    }
+                )
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(start)
+                remaining = length
+                while remaining:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send(
+                        {"type": "http.response.body", "body": chunk, "more_body": remaining > 0}
+                    )
+                if remaining:
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+        if self.background is not None:
+            await self.background()
+
+    async def _unsatisfiable(self, size: int, send: Send) -> None:
+        headers = [
+            (b"content-range", f"bytes */{size}".encode("latin-1")),
+            (b"content-length", b"0"),
+        ]
+        await send({"type": "http.response.start", "status": 416, "headers": headers})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
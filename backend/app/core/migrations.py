@@ -0,0 +1,38 @@
+"""Programmatic access to the Alembic migrations in ``backend/alembic``."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .database import engine as default_engine
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+
+
+def alembic_config(database_url: str | None = None) -> Config:
+    """Load ``alembic.ini`` with absolute paths so it works from any directory."""
+
+    config = Config(str(BACKEND_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_ROOT / "alembic"))
+    if database_url:
+        config.set_main_option("sqlalchemy.url", database_url)
+    return config
+
+
+async def upgrade_database(engine: AsyncEngine | None = None, revision: str = "head") -> None:
+    """Apply migrations up to ``revision`` over an existing async engine."""
+
+    engine = engine or default_engine
+
+    def _upgrade(connection: Connection) -> None:
+        config = alembic_config()
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+
+    async with engine.begin() as connection:
+        await connection.run_sync(_upgrade)
@@ -0,0 +1,112 @@
+"""Monthly range partitions for the document and extraction tables (PostgreSQL)."""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+# table -> partition key column. Extraction carries its document's upload time so
+# that a month's documents and extractions live in partitions of the same month.
+PARTITIONED_TABLES = {"document": "uploaded_at", "extraction": "document_uploaded_at"}
+# Present only on partitioned PostgreSQL tables (see alembic revision 0003).
+PARTITION_ONLY_INDEXES = {"ix_document_id", "ix_extraction_document_id"}
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def default_partition(table: str) -> str:
+    return f"{table}_default"
+
+
+def create_partition(
+    connection: Connection, table: str, month: date, key: str | None = None
+) -> None:
+    """Create the partition of ``table`` for ``month`` if it does not exist yet.
+
+    Rows of that month already caught by the DEFAULT partition would make a
+    plain ``CREATE TABLE ... PARTITION OF`` fail, so the partition is built
+    detached, those rows are moved into it, and it is attached afterwards.
+    Runs inside the caller's transaction. ``key`` defaults to the table's
+    current partition key; migrations pass the key of their revision.
+    """
+
+    name = partition_name(table, month)
+    if connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+        return
+    key = key or PARTITIONED_TABLES[table]
+    lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+    bounds = f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    default = default_partition(table)
+    if not connection.execute(text("SELECT to_regclass(:name)"), {"name": default}).scalar():
+        connection.execute(text(f"CREATE TABLE {name} PARTITION OF {table} {bounds}"))
+        return
+    connection.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)"))
+    moved = connection.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {key} >= :lower AND {key} < :upper "
+            f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"lower": lower, "upper": upper},
+    ).rowcount
+    connection.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} {bounds}"))
+    if moved:
+        logger.info("Moved %d %s rows from %s into %s", moved, table, default, name)
+
+
+def list_partitions(connection: Connection, table: str) -> list[str]:
+    rows = connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table ORDER BY child.relname"
+        ),
+        {"table": table},
+    )
+    return [row[0] for row in rows]
+
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(
+        connection.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = 'document'"
+            )
+        ).scalar()
+    )
+
+
+def ensure_partitions(
+    connection: Connection, months_ahead: int, start: date | None = None
+) -> None:
+    """Create monthly partitions from ``start`` (default: this month) ``months_ahead`` out.
+
+    Rows only land in the DEFAULT partition when this has not run for a while;
+    they are moved out when their month's partition is created.
+    """
+
+    if not is_partitioned(connection):
+        return
+    first = month_start(start or datetime.utcnow())
+    for table in PARTITIONED_TABLES:
+        for offset in range(months_ahead + 1):
+            create_partition(connection, table, add_months(first, offset))
@@ -0,0 +1,123 @@
+"""Opt-in stack-sampling profiler for individual requests and jobs."""
+
+from __future__ import annotations
+
+import hmac
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+
+from .config import settings
+
+PROFILE_HEADER = "X-Profile"
+TRUTHY_VALUES = {"1", "true", "yes", "on"}
+
+# Leaf frames of threads parked in I/O or lock waits; these are idle, not work.
+IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("socket.py", "accept"),
+}
+
+
+def profiling_requested(value: str | None) -> bool:
+    """Return True when a header or option value asks for a profile.
+
+    Profiling must be enabled in the settings. With ``profiling_token`` set,
+    the value has to be that token rather than any truthy string.
+    """
+
+    if not settings.profiling_enabled or not value:
+        return False
+    if settings.profiling_token:
+        return hmac.compare_digest(value.strip().encode(), settings.profiling_token.encode())
+    return value.strip().lower() in TRUTHY_VALUES
+
+
+class StackSampler:
+    """Samples Python stacks from a background thread.
+
+    By default every thread is sampled, so a job profile also sees work
+    offloaded with `asyncio.to_thread` (PDF parsing, OCR). Samples are
+    prefixed with the thread name. Pass ``thread_ids`` to keep only given
+    threads. Costs nothing unless started.
+    """
+
+    def __init__(
+        self, interval: float | None = None, thread_ids: set[int] | None = None
+    ) -> None:
+        self.interval = interval or settings.profiling_interval_ms / 1000
+        self.thread_ids = thread_ids
+        self.samples: Counter[str] = Counter()
+        self.started_at: float | None = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "StackSampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.started_at is not None:
+            self.elapsed = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if self.thread_ids is not None and thread_id not in self.thread_ids:
+                    continue
+                stack = self._collapse(frame)
+                if stack is not None:
+                    self.samples[f"{names.get(thread_id, thread_id)};{stack}"] += 1
+
+    @staticmethod
+    def _collapse(frame: FrameType | None) -> str | None:
+        leaf = frame
+        if leaf is not None and (Path(leaf.f_code.co_filename).name, leaf.f_code.co_name) in IDLE_LEAVES:
+            return None
+        parts: list[str] = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        return ";".join(reversed(parts))
+
+    def folded(self) -> str:
+        """Render samples in collapsed-stack format (flamegraph.pl, speedscope)."""
+
+        header = (
+            f"# interval_ms={self.interval * 1000:g} elapsed_s={self.elapsed:.3f} "
+            f"samples={sum(self.samples.values())}\n"
+        )
+        return header + "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.most_common()
+        )
+
+
+def profile_filename(label: str) -> str:
+    """Build a sortable artifact name for a profile."""
+
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    return f"profile-{label}-{stamp}.folded"
@@ -10,11 +10,21 @@ from typing import Iterable
 from fastapi import HTTPException, status
 
 FILENAME_SAFE_PATTERN = re.compile(r"[^A-Za-z0-9._-]")
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+DOC_MIME_TYPE = "application/msword"
 ALLOWED_MIME_TYPES = {
     "application/pdf",
     "image/png",
     "image/jpeg",
+    DOCX_MIME_TYPE,
+    DOC_MIME_TYPE,
 }
+# Enough leading bytes to reach word/document.xml, which Word and LibreOffice
+# write after the small content-type and relationship parts.
+MAGIC_BYTES = 64 * 1024
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_LOCAL_HEADER = b"PK\x03\x04"
+DOCX_MAIN_PART = b"word/document.xml"
 
 
 def sanitize_filename(filename: str) -> str:
@@ -34,14 +44,43 @@ def validate_mime_type(mime_type: str) -> None:
         )
 
 
-def validate_magic_bytes(file_bytes: bytes) -> None:
-    """Perform lightweight magic-bytes validation."""
+def detect_mime_type(file_bytes: bytes) -> str | None:
+    """Infer an allowed mime-type from the leading bytes, or None."""
 
     if file_bytes.startswith(b"%PDF"):
-        return
+        return "application/pdf"
     if file_bytes.startswith(b"\x89PNG\r\n\x1a\n"):
-        return
+        return "image/png"
     if file_bytes.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if file_bytes.startswith(ZIP_LOCAL_HEADER) and DOCX_MAIN_PART in zip_entry_names(file_bytes):
+        return DOCX_MIME_TYPE
+    if file_bytes.startswith(OLE2_MAGIC):
+        return DOC_MIME_TYPE
+    return None
+
+
+def zip_entry_names(file_bytes: bytes) -> list[bytes]:
+    """Names of the ZIP entries whose local headers start within ``file_bytes``.
+
+    Headers are found by signature rather than by skipping compressed sizes,
+    which writers using data descriptors leave at zero. xlsx and pptx share
+    the OOXML layout, so only the main part tells a Word document apart.
+    """
+
+    names = []
+    offset = file_bytes.find(ZIP_LOCAL_HEADER)
+    while offset != -1 and offset + 30 <= len(file_bytes):
+        name_length = int.from_bytes(file_bytes[offset + 26 : offset + 28], "little")
+        names.append(file_bytes[offset + 30 : offset + 30 + name_length])
+        offset = file_bytes.find(ZIP_LOCAL_HEADER, offset + 30 + name_length)
+    return names
+
+
+def validate_magic_bytes(file_bytes: bytes) -> None:
+    """Perform lightweight magic-bytes validation."""
+
+    if detect_mime_type(file_bytes) is not None:
         return
     raise HTTPException(
         status_code=status.HTTP_400_BAD_REQUEST,
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.v1.api import api_router
 from .core.config import settings
-from .core.database import init_models
 from .core.logging_config import setup_logging
+from .core.profiling import PROFILE_HEADER, StackSampler, profile_filename, profiling_requested
+from .services.storage import StorageService
 
 setup_logging()
 
@@ -24,6 +25,27 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def profile_request(request: Request, call_next) -> Response:  # type: ignore[no-untyped-def]
+    """Capture a stack-sampling profile when the X-Profile header is set."""
+
+    if not profiling_requested(request.headers.get(PROFILE_HEADER)):
+        return await call_next(request)
+
+    # Every thread: work offloaded with asyncio.to_thread runs in executor threads.
+    # Requests served concurrently by this process share those threads and the
+    # event loop, so their stacks show up too; profile on an otherwise idle instance.
+    with StackSampler() as sampler:
+        response = await call_next(request)
+    document_id = request.scope.get("path_params", {}).get("document_id")
+    owner = document_id or "requests"
+    name = profile_filename(request.method.lower())
+    StorageService().save_artifact(owner, name, sampler.folded())
+    prefix = f"/api/v1/documents/{document_id}" if document_id else "/api/v1"
+    response.headers["X-Profile-Url"] = f"{prefix}/profiles/{name}"
+    return response
+
+
 @app.get("/healthz")
 async def healthcheck() -> dict:
     """Simple health endpoint for Docker."""
@@ -31,12 +53,5 @@ async def healthcheck() -> dict:
     return {"status": "ok"}
 
 
-@app.on_event("startup")
-async def init_database() -> None:
-    """Ensure database schema exists."""
-
-    await init_models()
-
-
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -2,6 +2,17 @@
 
 from .base import Base
 from .document import Document, Extraction
+from .fingerprint import DocumentFingerprint, SignatureBand
+from .review import ReviewItem
+from .upload import UploadSession
 
-__all__ = ["Base", "Document", "Extraction"]
+__all__ = [
+    "Base",
+    "Document",
+    "DocumentFingerprint",
+    "Extraction",
+    "ReviewItem",
+    "SignatureBand",
+    "UploadSession",
+]
 
@@ -5,7 +5,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Enum, Float, ForeignKey, Integer, Text
+from sqlalchemy import JSON, Enum, Float, ForeignKey, Index, Integer, Text, event, select
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -23,6 +23,13 @@ DocumentStatus = Enum(
 class Document(Base):
     """Represents an uploaded document."""
 
+    # Match list_documents: sort/range on uploaded_at, optionally per status.
+    __table_args__ = (
+        Index("ix_document_uploaded_at", "uploaded_at"),
+        Index("ix_document_status_uploaded_at", "status", "uploaded_at"),
+        Index("ix_document_content_hash", "content_hash"),
+    )
+
     id: Mapped[str] = mapped_column(
         Text,
         primary_key=True,
@@ -36,6 +43,12 @@ class Document(Base):
     processed_at: Mapped[datetime | None] = mapped_column(nullable=True)
     status: Mapped[str] = mapped_column(DocumentStatus, default="pending")
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # SHA-256 of the stored bytes; lets the upload handshake answer "have".
+    content_hash: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Bumped by every ORM update of the row (status changes); validates list pages.
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow, onupdate=datetime.utcnow
+    )
 
     extraction: Mapped["Extraction"] = relationship(
         back_populates="document",
@@ -47,6 +60,13 @@ class Document(Base):
 class Extraction(Base):
     """Represents structured extraction data for a document."""
 
+    # Type filter resolves to document ids without touching the JSON columns;
+    # updated_at drives incremental exports.
+    __table_args__ = (
+        Index("ix_extraction_document_type_document_id", "document_type", "document_id"),
+        Index("ix_extraction_updated_at", "updated_at"),
+    )
+
     id: Mapped[str] = mapped_column(
         Text,
         primary_key=True,
@@ -59,20 +79,42 @@ class Extraction(Base):
     )
     document_type: Mapped[str] = mapped_column(Text, nullable=False, default="other")
     extracted_data: Mapped[dict] = mapped_column(
-        JSONB().with_variant(Text, "sqlite"),
+        JSONB().with_variant(JSON, "sqlite"),
         default=dict,
     )
     confidence_scores: Mapped[dict] = mapped_column(
-        JSONB().with_variant(Text, "sqlite"),
+        JSONB().with_variant(JSON, "sqlite"),
         default=dict,
     )
     ocr_text: Mapped[str] = mapped_column(Text, nullable=False)
+    # Start offset of every page in ocr_text plus its length; None for legacy rows.
+    page_offsets: Mapped[list[int] | None] = mapped_column(
+        JSONB().with_variant(JSON, "sqlite"), nullable=True
+    )
     processing_time: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # The document's uploaded_at, copied on insert: the partition key on PostgreSQL,
+    # so that archiving a month drops the same month of both tables.
+    document_uploaded_at: Mapped[datetime] = mapped_column(nullable=False)
+    # The text holds only the priority OCR regions until the rest has been read.
+    text_partial: Mapped[bool] = mapped_column(default=False)
     manually_corrected: Mapped[bool] = mapped_column(default=False)
 
     document: Mapped[Document] = relationship(back_populates="extraction")
 
+
+@event.listens_for(Extraction, "before_insert")
+def _copy_document_uploaded_at(mapper, connection, target: Extraction) -> None:  # noqa: ARG001
+    if target.document_uploaded_at is not None:
+        return
+    # Never lazy-load here: the flush may run under asyncio.
+    document = target.__dict__.get("document")
+    uploaded_at = document.uploaded_at if document is not None else None
+    if uploaded_at is None and target.document_id is not None:
+        uploaded_at = connection.scalar(
+            select(Document.uploaded_at).where(Document.id == target.document_id)
+        )
+    target.document_uploaded_at = uploaded_at or datetime.utcnow()
@@ -0,0 +1,35 @@
+"""Similarity signatures used for duplicate detection."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Float, ForeignKey, Index, LargeBinary, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class DocumentFingerprint(Base):
+    """Content hash, text MinHash and first-page dHash of a document."""
+
+    document_id: Mapped[str] = mapped_column(
+        ForeignKey("document.id", ondelete="CASCADE"), primary_key=True
+    )
+    content_hash: Mapped[str] = mapped_column(Text, nullable=False)
+    text_signature: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    image_hash: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    duplicate_of: Mapped[str | None] = mapped_column(Text, nullable=True, index=True)
+    similarity: Mapped[float | None] = mapped_column(Float, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+
+class SignatureBand(Base):
+    """One LSH bucket a document falls into; candidates share at least one band."""
+
+    __table_args__ = (Index("ix_signature_band_document_id", "document_id"),)
+
+    band: Mapped[str] = mapped_column(Text, primary_key=True)
+    document_id: Mapped[str] = mapped_column(
+        ForeignKey("document.id", ondelete="CASCADE"), primary_key=True
+    )
@@ -0,0 +1,42 @@
+"""Review worklist model."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import JSON, Enum, Float, ForeignKey, Index, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+ReviewStatus = Enum("pending", "claimed", "reviewed", name="review_status")
+
+
+class ReviewItem(Base):
+    """An extraction waiting for human review, ordered by confidence and age."""
+
+    __table_args__ = (Index("ix_review_item_queue", "status", "min_confidence", "created_at"),)
+
+    id: Mapped[str] = mapped_column(
+        Text,
+        primary_key=True,
+        default=lambda: str(uuid.uuid4()),
+    )
+    document_id: Mapped[str] = mapped_column(
+        ForeignKey("document.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    min_confidence: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    low_fields: Mapped[list] = mapped_column(
+        JSONB().with_variant(JSON, "sqlite"),
+        default=list,
+    )
+    status: Mapped[str] = mapped_column(ReviewStatus, default="pending")
+    claimed_by: Mapped[str | None] = mapped_column(Text, nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    reviewed_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    reviewed_by: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -8,6 +8,17 @@ from typing import Any
 from pydantic import BaseModel, Field
 
 
+class LineItemPayload(BaseModel):
+    """One invoice line as stored under ``line_items``."""
+
+    description: str | None = None
+    quantity: float | None = None
+    unit_price: float | None = None
+    vat_rate: float | None = None
+    amount: float | None = None
+    page: int | None = None
+
+
 class ExtractionPayload(BaseModel):
     """Validated extraction payload."""
 
@@ -21,6 +32,7 @@ class ExtractionPayload(BaseModel):
     amount_ttc: float | None = None
     currency: str | None = None
     confidence_score: float | None = None
+    line_items: list[LineItemPayload] | None = None
 
 
 class DocumentResponse(BaseModel):
@@ -56,6 +68,18 @@ class DocumentUpdatePayload(BaseModel):
     confidence_scores: dict[str, float] | None = None
 
 
+class BulkCorrectionItem(DocumentUpdatePayload):
+    """One document's corrections within a bulk update."""
+
+    document_id: str
+
+
+class BulkCorrectionRequest(BaseModel):
+    """Many corrections applied in a single request."""
+
+    items: list[BulkCorrectionItem] = Field(min_length=1, max_length=1000)
+
+
 class ExportRequest(BaseModel):
     """Request body for exports."""
 
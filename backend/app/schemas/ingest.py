@@ -0,0 +1,12 @@
+"""Bulk ingestion schemas."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class IngestDirectoryRequest(BaseModel):
+    """Server-side directory to ingest."""
+
+    path: str = Field(min_length=1)
+    recursive: bool = True
@@ -0,0 +1,30 @@
+"""Review queue schemas."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class ReviewClaimRequest(BaseModel):
+    """Lease the next items of the worklist to a reviewer."""
+
+    reviewer: str = Field(min_length=1)
+    limit: int = Field(default=10, ge=1, le=100)
+    lease_seconds: int | None = Field(default=None, ge=30, le=86400)
+
+
+class ReviewCorrection(BaseModel):
+    """Corrected fields for one document."""
+
+    document_id: str
+    extracted_data: dict[str, Any] = Field(default_factory=dict)
+    confidence_scores: dict[str, float] | None = None
+
+
+class ReviewSubmission(BaseModel):
+    """Batch of corrections applied in a single transaction."""
+
+    reviewer: str = Field(min_length=1)
+    items: list[ReviewCorrection] = Field(min_length=1, max_length=500)
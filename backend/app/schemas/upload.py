@@ -0,0 +1,20 @@
+"""Upload handshake schemas."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class UploadDeclaration(BaseModel):
+    """A file the client is about to send, identified by its SHA-256."""
+
+    filename: str = Field(min_length=1)
+    size: int
+    mime_type: str
+    sha256: str
+
+
+class UploadHandshakeRequest(BaseModel):
+    """Files announced in one batch."""
+
+    files: list[UploadDeclaration] = Field(min_length=1)
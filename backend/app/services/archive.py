@@ -0,0 +1,326 @@
+"""Cold storage of old documents as monthly Parquet files."""
+
+from __future__ import annotations
+
+import json
+import logging
+import uuid
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.partitions import (
+    add_months,
+    is_partitioned,
+    list_partitions,
+    month_start,
+    partition_name,
+)
+from ..models import Document, DocumentFingerprint, Extraction, ReviewItem, SignatureBand
+from .response_cache import invalidate_documents
+from .storage import StorageService
+
+logger = logging.getLogger(__name__)
+
+ROW_GROUP_SIZE = 5_000
+ARCHIVE_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("filename", pa.string()),
+        ("file_path", pa.string()),
+        ("file_size", pa.int64()),
+        ("mime_type", pa.string()),
+        ("uploaded_at", pa.timestamp("us")),
+        ("processed_at", pa.timestamp("us")),
+        ("status", pa.string()),
+        ("error_message", pa.string()),
+        ("document_type", pa.string()),
+        ("extracted_data", pa.string()),
+        ("confidence_scores", pa.string()),
+        ("ocr_text", pa.string()),
+        ("processing_time", pa.float64()),
+        ("extraction_created_at", pa.timestamp("us")),
+        ("extraction_updated_at", pa.timestamp("us")),
+        ("manually_corrected", pa.bool_()),
+    ]
+)
+JSON_COLUMNS = ("extracted_data", "confidence_scores")
+# What list_documents returns; the OCR text is only read for single-document lookups.
+LIST_COLUMNS = [
+    "id",
+    "filename",
+    "mime_type",
+    "file_size",
+    "status",
+    "uploaded_at",
+    "processed_at",
+    "document_type",
+    "extracted_data",
+    "confidence_scores",
+]
+MONTH_PARTITIONING = ds.partitioning(pa.schema([("month", pa.string())]), flavor="hive")
+
+_ROW_QUERY = select(
+    Document.id,
+    Document.filename,
+    Document.file_path,
+    Document.file_size,
+    Document.mime_type,
+    Document.uploaded_at,
+    Document.processed_at,
+    Document.status,
+    Document.error_message,
+    Extraction.document_type,
+    Extraction.extracted_data,
+    Extraction.confidence_scores,
+    Extraction.ocr_text,
+    Extraction.processing_time,
+    Extraction.created_at.label("extraction_created_at"),
+    Extraction.updated_at.label("extraction_updated_at"),
+    Extraction.manually_corrected,
+).outerjoin(Extraction, Extraction.document_id == Document.id)
+
+
+def _month_key(month: date) -> str:
+    return f"{month.year:04d}-{month.month:02d}"
+
+
+def _to_datetime(value: str | datetime) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+class ArchiveStore:
+    """Monthly Parquet files under ``<uploads>/archive/documents/month=YYYY-MM/``."""
+
+    def __init__(self, storage: StorageService | None = None) -> None:
+        self.root = (storage or StorageService()).base_dir / "archive" / "documents"
+
+    def months(self) -> list[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(
+            path.name.partition("=")[2]
+            for path in self.root.glob("month=*")
+            if any(path.glob("*.parquet"))
+        )
+
+    def open_writer(self, month: date) -> tuple[Path, pq.ParquetWriter]:
+        directory = self.root / f"month={_month_key(month)}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"part-{uuid.uuid4().hex}.parquet"
+        return path, pq.ParquetWriter(path, ARCHIVE_SCHEMA, compression="zstd")
+
+    def _dataset(self) -> ds.Dataset | None:
+        if not self.months():
+            return None
+        return ds.dataset(self.root, format="parquet", partitioning=MONTH_PARTITIONING)
+
+    @staticmethod
+    def _filter(
+        type: str | None = None,
+        status: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> ds.Expression | None:
+        conditions = []
+        if type:
+            conditions.append(ds.field("document_type") == type)
+        if status:
+            conditions.append(ds.field("status") == status)
+        if date_from:
+            start = _to_datetime(date_from)
+            # The month directory prunes whole files before any row group is read.
+            conditions.append(ds.field("month") >= _month_key(start))
+            conditions.append(ds.field("uploaded_at") >= pa.scalar(start, pa.timestamp("us")))
+        if date_to:
+            end = _to_datetime(date_to)
+            conditions.append(ds.field("month") <= _month_key(end))
+            conditions.append(ds.field("uploaded_at") <= pa.scalar(end, pa.timestamp("us")))
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def count(self, **filters: str | None) -> int:
+        dataset = self._dataset()
+        if dataset is None:
+            return 0
+        return dataset.count_rows(filter=self._filter(**filters))
+
+    def query(
+        self,
+        limit: int,
+        sort_by: str = "uploaded_at",
+        descending: bool = True,
+        **filters: str | None,
+    ) -> list[dict[str, Any]]:
+        """Return the first ``limit`` archived rows in list order, without OCR text.
+
+        Only the sort key and id are scanned to pick the page; the list columns
+        are then read for those ids alone. Sorted by upload time, months are
+        scanned in order and the scan stops once a month fills the page.
+        """
+
+        dataset = self._dataset()
+        if dataset is None or limit <= 0:
+            return []
+        if sort_by not in LIST_COLUMNS:
+            sort_by = "uploaded_at"
+        order = "descending" if descending else "ascending"
+        condition = self._filter(**filters)
+        keys: list[pa.Table] = []
+        scanned: list[str] = []
+        found = 0
+        for month in sorted(self.months(), reverse=descending):
+            in_month = ds.field("month") == month
+            table = dataset.to_table(
+                columns=[sort_by, "id"],
+                filter=in_month if condition is None else condition & in_month,
+            )
+            if not table.num_rows:
+                continue
+            keys.append(table)
+            scanned.append(month)
+            found += table.num_rows
+            if sort_by == "uploaded_at" and found >= limit:
+                break
+        if not keys:
+            return []
+        candidates = pa.concat_tables(keys)
+        indices = pc.sort_indices(candidates, sort_keys=[(sort_by, order)])[:limit]
+        ids = candidates.column("id").take(indices).to_pylist()
+        table = dataset.to_table(
+            columns=LIST_COLUMNS,
+            filter=ds.field("month").isin(scanned) & ds.field("id").isin(ids),
+        )
+        rows = {row["id"]: row for row in table.to_pylist()}
+        return [self._decode(rows[document_id]) for document_id in ids]
+
+    def get(self, document_id: str) -> dict[str, Any] | None:
+        dataset = self._dataset()
+        if dataset is None:
+            return None
+        table = dataset.to_table(filter=ds.field("id") == document_id)
+        if not table.num_rows:
+            return None
+        return self._decode(table.slice(0, 1).to_pylist()[0])
+
+    @staticmethod
+    def _decode(row: dict[str, Any]) -> dict[str, Any]:
+        row.pop("month", None)
+        for column in JSON_COLUMNS:
+            if column in row and row[column] is not None:
+                row[column] = json.loads(row[column])
+        row["archived"] = True
+        return row
+
+
+class Archiver:
+    """Moves whole months of documents and extractions from the hot tables to Parquet."""
+
+    def __init__(self, session: AsyncSession, store: ArchiveStore | None = None) -> None:
+        self.session = session
+        self.store = store or ArchiveStore()
+
+    async def archive_before(self, cutoff: date) -> dict[str, int]:
+        """Archive every month strictly before ``cutoff``; returns rows moved per month."""
+
+        cutoff = month_start(cutoff)
+        oldest = await self.session.scalar(
+            select(func.min(Document.uploaded_at)).where(
+                Document.uploaded_at < datetime.combine(cutoff, time.min)
+            )
+        )
+        moved: dict[str, int] = {}
+        month = month_start(oldest) if oldest else cutoff
+        while month < cutoff:
+            count = await self.archive_month(month)
+            if count:
+                moved[_month_key(month)] = count
+            month = add_months(month, 1)
+        return moved
+
+    async def archive_month(self, month: date) -> int:
+        start = datetime.combine(month, time.min)
+        end = datetime.combine(add_months(month, 1), time.min)
+        in_month = (Document.uploaded_at >= start) & (Document.uploaded_at < end)
+        path, writer = self.store.open_writer(month)
+        written = 0
+        try:
+            with writer:
+                result = await self.session.stream(_ROW_QUERY.where(in_month))
+                async for rows in result.mappings().partitions(ROW_GROUP_SIZE):
+                    writer.write_table(self._to_table(rows), row_group_size=ROW_GROUP_SIZE)
+                    written += len(rows)
+            if not written:
+                path.unlink()
+                return 0
+            ids = select(Document.id).where(in_month)
+            await self.session.execute(delete(ReviewItem).where(ReviewItem.document_id.in_(ids)))
+            await self.session.execute(
+                delete(SignatureBand).where(SignatureBand.document_id.in_(ids))
+            )
+            await self.session.execute(
+                delete(DocumentFingerprint).where(DocumentFingerprint.document_id.in_(ids))
+            )
+            connection = await self.session.connection()
+            await connection.run_sync(self._drop_partitions, month)
+            # Removes rows that were not in a droppable partition (SQLite, DEFAULT partition).
+            await self.session.execute(
+                delete(Extraction).where(
+                    (Extraction.document_uploaded_at >= start)
+                    & (Extraction.document_uploaded_at < end)
+                )
+            )
+            archived = await self.session.scalars(
+                delete(Document).where(in_month).returning(Document.id)
+            )
+            document_ids = list(archived)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            path.unlink(missing_ok=True)
+            raise
+        try:
+            await invalidate_documents(document_ids)
+        except Exception as exc:  # noqa: BLE001
+            # The month is archived; stale responses only live until their TTL.
+            logger.warning("Could not invalidate cached archived documents: %s", exc)
+        logger.info("Archived %d documents from %s to %s", written, _month_key(month), path)
+        return written
+
+    @staticmethod
+    def _to_table(rows: list[Any]) -> pa.Table:
+        records = []
+        for row in rows:
+            record = dict(row)
+            for column in JSON_COLUMNS:
+                if record[column] is not None:
+                    record[column] = json.dumps(record[column])
+            records.append(record)
+        return pa.Table.from_pylist(records, schema=ARCHIVE_SCHEMA)
+
+    @staticmethod
+    def _drop_partitions(connection: Connection, month: date) -> None:
+        """Drop the month's document and extraction partitions.
+
+        Both tables are partitioned by the document's upload month, so the
+        partitions hold exactly the rows just archived. Dropping instead of
+        deleting leaves no dead tuples behind for VACUUM.
+        """
+
+        if not is_partitioned(connection):
+            return
+        for table in ("extraction", "document"):
+            name = partition_name(table, month)
+            if name in list_partitions(connection, table):
+                connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                connection.execute(text(f"DROP TABLE {name}"))
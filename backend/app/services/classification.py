@@ -0,0 +1,159 @@
+"""Keyword-based document type classifier compiled into a single regex."""
+
+from __future__ import annotations
+
+import json
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from ..core.config import settings
+
+# document_type -> language -> keyword -> weight
+Vocabulary = dict[str, dict[str, dict[str, float]]]
+
+DEFAULT_VOCABULARY: Vocabulary = {
+    "invoice": {
+        "fr": {
+            "facture": 3.0,
+            "numéro de facture": 4.0,
+            "n° de facture": 4.0,
+            "montant ht": 2.5,
+            "montant ttc": 2.5,
+            "total ttc": 2.0,
+            "tva": 1.5,
+            "montant": 0.5,
+            "échéance": 1.0,
+            "siret": 0.5,
+        },
+        "en": {
+            "invoice": 3.0,
+            "invoice number": 4.0,
+            "amount due": 2.0,
+            "vat": 1.5,
+            "subtotal": 1.0,
+            "due date": 1.0,
+            "bill to": 1.5,
+        },
+    },
+    "contract": {
+        "fr": {
+            "contrat": 3.0,
+            "clause": 1.5,
+            "signature": 1.0,
+            "les parties": 2.0,
+            "résiliation": 1.5,
+            "article": 0.5,
+        },
+        "en": {
+            "agreement": 3.0,
+            "contract": 3.0,
+            "clause": 1.5,
+            "signature": 1.0,
+            "the parties": 2.0,
+            "termination": 1.5,
+            "hereinafter": 2.0,
+        },
+    },
+    "receipt": {
+        "fr": {
+            "reçu": 3.0,
+            "ticket de caisse": 4.0,
+            "espèces": 1.5,
+            "rendu": 1.0,
+            "paiement": 1.0,
+        },
+        "en": {
+            "receipt": 3.0,
+            "cash": 1.5,
+            "change due": 2.0,
+            "payment": 1.0,
+            "thank you for your purchase": 2.0,
+        },
+    },
+}
+
+
+def _strip_accents(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+@dataclass
+class Classification:
+    """Weighted keyword scores for each document type."""
+
+    document_type: str | None
+    scores: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def top_score(self) -> float:
+        return max(self.scores.values(), default=0.0)
+
+    @property
+    def confidence(self) -> float:
+        """Share of the total score held by the winning type."""
+
+        total = sum(self.scores.values())
+        return self.top_score / total if total else 0.0
+
+
+class KeywordClassifier:
+    """Scores every document type in a single linear pass over the text."""
+
+    def __init__(
+        self,
+        vocabulary: Vocabulary,
+        languages: list[str] | None = None,
+        min_score: float = 2.0,
+    ) -> None:
+        self.min_score = min_score
+        # keyword -> document_type -> weight; a keyword listed for one type in
+        # several languages ("clause") counts once, with its highest weight.
+        self._weights: dict[str, dict[str, float]] = defaultdict(dict)
+        for doc_type, per_language in vocabulary.items():
+            for language, keywords in per_language.items():
+                if languages and language not in languages:
+                    continue
+                for keyword, weight in keywords.items():
+                    normalized = keyword.lower()
+                    # OCR often drops accents, so match both spellings.
+                    for variant in {normalized, _strip_accents(normalized)}:
+                        known = self._weights[variant].get(doc_type, 0.0)
+                        self._weights[variant][doc_type] = max(known, weight)
+
+        alternatives = sorted(self._weights, key=len, reverse=True)
+        body = "|".join(re.escape(keyword).replace(r"\ ", r"\s+") for keyword in alternatives)
+        self._pattern = re.compile(rf"(?<!\w)(?:{body})(?!\w)", re.IGNORECASE) if body else None
+
+    @classmethod
+    def from_settings(cls) -> "KeywordClassifier":
+        vocabulary = DEFAULT_VOCABULARY
+        if settings.document_type_vocabulary:
+            vocabulary = json.loads(Path(settings.document_type_vocabulary).read_text("utf-8"))
+        return cls(vocabulary, languages=settings.document_type_languages)
+
+    def classify(self, text: str) -> Classification:
+        """Return the highest scoring type, or None below ``min_score``."""
+
+        scores: dict[str, float] = defaultdict(float)
+        if self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                keyword = " ".join(match.group(0).lower().split())
+                for doc_type, weight in self._weights.get(keyword, {}).items():
+                    scores[doc_type] += weight
+        scores = dict(scores)
+        winner = max(scores, key=scores.__getitem__, default=None)
+        if winner is not None and scores[winner] < self.min_score:
+            winner = None
+        return Classification(document_type=winner, scores=scores)
+
+
+@lru_cache
+def get_classifier() -> KeywordClassifier:
+    """Return the process-wide classifier, compiled once."""
+
+    return KeywordClassifier.from_settings()
@@ -0,0 +1,204 @@
+"""Per-field confidence scoring for extracted values."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+import numpy as np
+
+from .layout import DocumentLayout
+from .local_extraction import (
+    AMOUNT_PATTERN,
+    DATE_PATTERN,
+    LocalExtraction,
+    date_from_match,
+    parse_amount,
+)
+
+AMOUNT_FIELDS = ("amount_ht", "tva", "amount_ttc")
+META_FIELDS = ("document_type", "document_type_confidence", "confidence_score")
+STANDARD_VAT_RATES = (0.2, 0.1, 0.085, 0.055, 0.021)
+CURRENCY_CODE = re.compile(r"^[A-Z]{3}$")
+
+
+def as_amount(value: Any) -> float | None:
+    """Numeric value of an amount field; Gemini sometimes returns "1 234,50"."""
+
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        return parse_amount(value)
+    return None
+
+
+@dataclass
+class FieldEvidence:
+    """Signals behind one field's score, each in ``[0, 1]``."""
+
+    agreement: float
+    ocr: float | None
+    validity: float
+
+    def combine(self, weights: tuple[float, float, float]) -> float:
+        w_agree, w_ocr, w_valid = weights
+        if self.ocr is None:
+            total = w_agree + w_valid
+            return (w_agree * self.agreement + w_valid * self.validity) / total
+        return w_agree * self.agreement + w_ocr * self.ocr + w_valid * self.validity
+
+
+class FieldConfidenceScorer:
+    """Combines source agreement, OCR word confidence and format checks per field."""
+
+    def __init__(
+        self,
+        weights: tuple[float, float, float] = (0.45, 0.25, 0.30),
+        tolerance: float = 0.02,
+    ) -> None:
+        self.weights = weights
+        self.tolerance = tolerance
+
+    def score(
+        self,
+        payload: dict[str, Any],
+        text: str,
+        layout: DocumentLayout | None = None,
+        local: LocalExtraction | None = None,
+    ) -> dict[str, float]:
+        """Return a confidence in ``[0, 1]`` for every key of ``payload``."""
+
+        amounts = self._amounts_in(text)
+        dates = self._dates_in(text)
+        folded_text = " ".join(text.lower().split())
+        arithmetic = self._vat_consistency(payload)
+
+        scores: dict[str, float] = {}
+        for name, value in payload.items():
+            if name in META_FIELDS:
+                base = payload.get("confidence_score")
+                scores[name] = float(base) if isinstance(base, (int, float)) else 0.0
+                continue
+            if value in (None, "", []):
+                scores[name] = 0.0
+                continue
+
+            local_match = local.fields.get(name) if local else None
+            if local_match is not None and local_match.value == value:
+                agreement, span = local_match.confidence, local_match.span
+            elif name in AMOUNT_FIELDS:
+                agreement, span = self._match_amount(value, amounts)
+            elif name == "date":
+                agreement, span = self._match_date(value, dates)
+            else:
+                agreement, span = self._match_string(str(value), text, folded_text)
+
+            validity = self._validity(name, value)
+            if name in AMOUNT_FIELDS and arithmetic is not None:
+                validity = min(validity, arithmetic)
+
+            evidence = FieldEvidence(
+                agreement=agreement,
+                ocr=self._ocr_confidence(layout, span),
+                validity=validity,
+            )
+            scores[name] = round(min(max(evidence.combine(self.weights), 0.0), 1.0), 3)
+        return scores
+
+    @staticmethod
+    def _amounts_in(text: str) -> list[tuple[float, tuple[int, int]]]:
+        found = []
+        for match in AMOUNT_PATTERN.finditer(text):
+            value = parse_amount(match.group(0))
+            if value is not None:
+                found.append((value, match.span()))
+        return found
+
+    @staticmethod
+    def _dates_in(text: str) -> list[tuple[str, tuple[int, int]]]:
+        found = []
+        for match in DATE_PATTERN.finditer(text):
+            iso = date_from_match(match)
+            if iso is not None:
+                found.append((iso, match.span()))
+        return found
+
+    def _match_amount(
+        self, value: Any, amounts: list[tuple[float, tuple[int, int]]]
+    ) -> tuple[float, tuple[int, int] | None]:
+        target = as_amount(value)
+        if target is None:
+            return 0.0, None
+        for amount, span in amounts:
+            if abs(amount - target) <= 0.005:
+                return 1.0, span
+        return 0.2, None
+
+    @staticmethod
+    def _match_date(
+        value: Any, dates: list[tuple[str, tuple[int, int]]]
+    ) -> tuple[float, tuple[int, int] | None]:
+        for iso, span in dates:
+            if iso == str(value):
+                return 1.0, span
+        return 0.2, None
+
+    @staticmethod
+    def _match_string(
+        value: str, text: str, folded_text: str
+    ) -> tuple[float, tuple[int, int] | None]:
+        position = text.find(value)
+        if position >= 0:
+            return 1.0, (position, position + len(value))
+        folded = " ".join(value.lower().split())
+        if folded and folded in folded_text:
+            return 0.9, None
+        tokens = [token for token in re.findall(r"\w+", folded) if len(token) > 1]
+        if not tokens:
+            return 0.0, None
+        present = sum(1 for token in tokens if token in folded_text)
+        return 0.8 * present / len(tokens), None
+
+    @staticmethod
+    def _ocr_confidence(
+        layout: DocumentLayout | None, span: tuple[int, int] | None
+    ) -> float | None:
+        if layout is None or span is None:
+            return None
+        indices = layout.words_in_span(*span)
+        if not len(indices):
+            return None
+        return float(np.min(layout.conf[indices]))
+
+    @staticmethod
+    def _validity(name: str, value: Any) -> float:
+        if name in AMOUNT_FIELDS:
+            amount = as_amount(value)
+            return 1.0 if amount is not None and amount >= 0 else 0.0
+        if name == "date":
+            try:
+                parsed = date.fromisoformat(str(value))
+            except ValueError:
+                return 0.0
+            return 1.0 if 1990 <= parsed.year <= date.today().year + 1 else 0.5
+        if name == "currency":
+            return 1.0 if CURRENCY_CODE.match(str(value)) else 0.3
+        if name == "invoice_number":
+            return 1.0 if re.fullmatch(r"[\w\-/.]{2,40}", str(value)) else 0.5
+        return 1.0
+
+    def _vat_consistency(self, payload: dict[str, Any]) -> float | None:
+        """1.0 when ``amount_ht + tva ≈ amount_ttc``, lower when it does not hold."""
+
+        ht, tva, ttc = (as_amount(payload.get(name)) for name in AMOUNT_FIELDS)
+        if ht is None or tva is None or ttc is None:
+            return None
+        if abs(ht + tva - ttc) > max(self.tolerance, abs(ttc) * 0.005):
+            return 0.2
+        if ht > 0 and not any(abs(tva / ht - rate) < 0.002 for rate in STANDARD_VAT_RATES):
+            return 0.85
+        return 1.0
@@ -0,0 +1,184 @@
+"""Manual correction helpers shared by the document and review endpoints."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Extraction
+
+# One statement merges every correction and closes the matching review items.
+# Merges are shallow on every backend, like merge_patch: a corrected field is
+# replaced whole, and a field corrected to null is removed.
+_POSTGRES_BULK_MERGE = text(
+    """
+    WITH items AS (
+        SELECT c.document_id,
+               c.extracted_data,
+               c.confidence_scores,
+               ARRAY(SELECT jsonb_array_elements_text(c.cleared)) AS cleared,
+               ARRAY(SELECT jsonb_array_elements_text(c.cleared_scores)) AS cleared_scores
+        FROM jsonb_to_recordset(CAST(:items AS jsonb)) AS c(
+            document_id text,
+            extracted_data jsonb,
+            confidence_scores jsonb,
+            cleared jsonb,
+            cleared_scores jsonb
+        )
+    ), updated AS (
+        UPDATE extraction AS e
+        SET extracted_data = (COALESCE(e.extracted_data, '{}'::jsonb) - items.cleared)
+                || (items.extracted_data - items.cleared),
+            confidence_scores = (
+                COALESCE(e.confidence_scores, '{}'::jsonb) - items.cleared_scores
+            ) || (items.confidence_scores - items.cleared_scores),
+            manually_corrected = true,
+            updated_at = :now
+        FROM items
+        WHERE e.document_id = items.document_id
+        RETURNING e.document_id
+    ), reviewed AS (
+        UPDATE review_item
+        SET status = 'reviewed', reviewed_at = :now, claimed_by = NULL, lease_expires_at = NULL
+        WHERE document_id IN (SELECT document_id FROM updated) AND status <> 'reviewed'
+    )
+    SELECT document_id FROM updated
+    """
+)
+
+# json_patch would merge nested objects recursively, unlike ``||`` on PostgreSQL,
+# so the object is rebuilt from the base keys that are not patched plus the
+# patched keys that are not null. json_each yields JSON values as text and
+# booleans as 0/1, which json() turns back into JSON.
+_SQLITE_MERGE = """(
+        SELECT json_group_object(
+            key,
+            CASE
+                WHEN type IN ('true', 'false') THEN json(type)
+                WHEN type IN ('object', 'array') THEN json(value)
+                ELSE value
+            END
+        )
+        FROM (
+            SELECT key, value, type FROM json_each(COALESCE(extraction.{column}, '{{}}'))
+            WHERE key NOT IN (SELECT key FROM json_each(items.value -> '{column}'))
+            UNION ALL
+            SELECT key, value, type FROM json_each(items.value -> '{column}')
+            WHERE type <> 'null'
+        )
+    )"""
+
+# SQLite cannot nest DML in a CTE.
+_SQLITE_BULK_MERGE = text(
+    f"""
+    UPDATE extraction
+    SET extracted_data = {_SQLITE_MERGE.format(column="extracted_data")},
+        confidence_scores = {_SQLITE_MERGE.format(column="confidence_scores")},
+        manually_corrected = 1,
+        updated_at = :now
+    FROM json_each(:items) AS items
+    WHERE extraction.document_id = items.value ->> 'document_id'
+    RETURNING extraction.document_id
+    """
+)
+_SQLITE_CLOSE_REVIEWS = text(
+    """
+    UPDATE review_item
+    SET status = 'reviewed', reviewed_at = :now, claimed_by = NULL, lease_expires_at = NULL
+    WHERE document_id IN (SELECT value FROM json_each(:ids)) AND status <> 'reviewed'
+    """
+)
+
+
+def corrected_scores(
+    extracted_data: dict[str, Any], confidence_scores: dict[str, float] | None = None
+) -> dict[str, float]:
+    """Scores to merge for a correction: corrected fields are pinned to 1.0, and
+    fields cleared with null lose their score too."""
+
+    scores: dict[str, float | None] = dict(confidence_scores or {})
+    for key, value in extracted_data.items():
+        scores[key] = None if value is None else 1.0
+    return scores
+
+
+def _null_keys(patch: dict[str, Any]) -> list[str]:
+    return [key for key, value in patch.items() if value is None]
+
+
+def merge_patch(base: dict[str, Any] | None, patch: dict[str, Any]) -> dict[str, Any]:
+    """Shallow JSON merge patch: keys patched to null are removed."""
+
+    merged = {**(base or {}), **patch}
+    return {key: value for key, value in merged.items() if key not in patch or value is not None}
+
+
+def apply_correction(
+    extraction: Extraction,
+    extracted_data: dict[str, Any],
+    confidence_scores: dict[str, float] | None = None,
+) -> None:
+    """Merge corrected fields into an extraction and pin their confidence to 1.0.
+
+    A field corrected to null is removed. New dicts are assigned rather than
+    mutated in place so that SQLAlchemy tracks the change on plain JSON columns.
+    """
+
+    scores = corrected_scores(extracted_data, confidence_scores)
+    extraction.extracted_data = merge_patch(extraction.extracted_data, extracted_data)
+    extraction.confidence_scores = merge_patch(extraction.confidence_scores, scores)
+    extraction.manually_corrected = True
+
+
+async def bulk_apply_corrections(
+    session: AsyncSession, corrections: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Merge many corrections with set-based JSON updates and report each document.
+
+    Later entries for the same document win, matching sequential PATCH calls.
+    Fields corrected to null are removed on every backend.
+    """
+
+    merged: dict[str, dict[str, Any]] = {}
+    for correction in corrections:
+        data = correction.get("extracted_data") or {}
+        entry = merged.setdefault(
+            correction["document_id"], {"extracted_data": {}, "confidence_scores": {}}
+        )
+        entry["extracted_data"].update(data)
+        entry["confidence_scores"].update(
+            corrected_scores(data, correction.get("confidence_scores"))
+        )
+    if not merged:
+        return []
+
+    items = json.dumps(
+        [
+            {
+                "document_id": document_id,
+                **entry,
+                "cleared": _null_keys(entry["extracted_data"]),
+                "cleared_scores": _null_keys(entry["confidence_scores"]),
+            }
+            for document_id, entry in merged.items()
+        ]
+    )
+    now = datetime.utcnow()
+    if session.bind.dialect.name == "postgresql":
+        rows = await session.execute(_POSTGRES_BULK_MERGE, {"items": items, "now": now})
+        updated = set(rows.scalars())
+    else:
+        rows = await session.execute(_SQLITE_BULK_MERGE, {"items": items, "now": now})
+        updated = set(rows.scalars())
+        await session.execute(
+            _SQLITE_CLOSE_REVIEWS, {"ids": json.dumps(sorted(updated)), "now": now}
+        )
+    await session.commit()
+    return [
+        {"document_id": document_id, "status": "ok" if document_id in updated else "not_found"}
+        for document_id in merged
+    ]
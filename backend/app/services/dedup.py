@@ -0,0 +1,309 @@
+"""Exact and near-duplicate detection with MinHash/LSH and perceptual hashes."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import numpy as np
+from PIL import Image
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models import Document, DocumentFingerprint, Extraction, SignatureBand
+from .rasterize import pil_to_gray_array, pixmap_array
+
+logger = logging.getLogger(__name__)
+
+MERSENNE_PRIME = (1 << 31) - 1
+NUM_PERMUTATIONS = 128
+BANDS = 16  # 16 bands x 8 rows: pairs above ~0.7 Jaccard collide at least once
+SHINGLE_SIZE = 5
+MIN_SHINGLES = 20
+IMAGE_CHUNKS = 4  # a 64-bit hash within 3 bits shares at least one 16-bit chunk
+MAX_CANDIDATES = 50
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """CRC32 of the distinct character ``size``-grams of normalized text.
+
+    Character shingles tolerate the letter-level noise two OCR runs produce.
+    """
+
+    normalized = _NON_WORD.sub(" ", text.lower()).strip()
+    grams = {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+    return np.fromiter(
+        (zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams)
+    )
+
+
+class MinHasher:
+    """Universal-hash MinHash over 32-bit shingle hashes."""
+
+    def __init__(self, num_perm: int = NUM_PERMUTATIONS, seed: int = 1) -> None:
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str, chunk: int = 4096) -> np.ndarray | None:
+        """Per-permutation minima, or None when the text is too short to compare."""
+
+        values = shingles(text)
+        if len(values) < MIN_SHINGLES:
+            return None
+        minima = np.full(len(self.a), MERSENNE_PRIME, dtype=np.uint64)
+        for start in range(0, len(values), chunk):
+            # a, x < 2^32, so a * x + b stays below 2^64.
+            block = values[start : start + chunk]
+            hashed = (np.outer(self.a, block) + self.b[:, None]) % MERSENNE_PRIME
+            np.minimum(minima, hashed.min(axis=1), out=minima)
+        return minima.astype(np.uint32)
+
+    @staticmethod
+    def similarity(left: np.ndarray, right: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the two shingle sets."""
+
+        return float(np.mean(left == right))
+
+
+def text_bands(signature: np.ndarray, bands: int = BANDS) -> list[str]:
+    rows = len(signature) // bands
+    return [
+        f"t{index}:"
+        + hashlib.blake2b(
+            signature[index * rows : (index + 1) * rows].tobytes(), digest_size=8
+        ).hexdigest()
+        for index in range(bands)
+    ]
+
+
+def dhash(gray: np.ndarray) -> int:
+    """64-bit difference hash of a grayscale image, as a signed int64."""
+
+    small = Image.fromarray(gray).resize((9, 8), Image.Resampling.BILINEAR)
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    value = int("".join("1" if bit else "0" for bit in bits), 2)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def hamming(left: int, right: int) -> int:
+    return ((left ^ right) & ((1 << 64) - 1)).bit_count()
+
+
+def image_bands(value: int) -> list[str]:
+    """16-bit chunks of the hash; flat chunks (blank margins) would match everything."""
+
+    unsigned = value & ((1 << 64) - 1)
+    chunks = ((unsigned >> (16 * index)) & 0xFFFF for index in range(IMAGE_CHUNKS))
+    return [
+        f"i{index}:{chunk:04x}"
+        for index, chunk in enumerate(chunks)
+        if chunk not in (0x0000, 0xFFFF)
+    ]
+
+
+def first_page_gray(file_path: str, mime_type: str | None = None) -> np.ndarray | None:
+    """Low-resolution grayscale render of the first page or image, if it has one."""
+
+    suffix = Path(file_path).suffix.lower()
+    try:
+        if suffix == ".pdf" or mime_type == "application/pdf":
+            with fitz.open(file_path) as doc:
+                if not doc.page_count:
+                    return None
+                page = doc[0]
+                zoom = 128 / max(page.rect.width, 1)
+                pix = page.get_pixmap(
+                    matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False
+                )
+                return pixmap_array(pix).copy()
+        if (mime_type or "").startswith("image/") or suffix in {".jpg", ".jpeg", ".png", ".tiff"}:
+            with Image.open(file_path) as image:
+                image.draft("L", (256, 256))
+                image.thumbnail((256, 256))
+                return pil_to_gray_array(image).copy()
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("No page image for %s: %s", file_path, exc)
+    return None
+
+
+@dataclass
+class Fingerprint:
+    content_hash: str
+    text_signature: np.ndarray | None
+    image_hash: int | None
+
+    def bands(self) -> list[str]:
+        keys = [f"sha:{self.content_hash}"]
+        if self.text_signature is not None:
+            keys.extend(text_bands(self.text_signature))
+        if self.image_hash is not None:
+            keys.extend(image_bands(self.image_hash))
+        return keys
+
+
+def compute_fingerprint(
+    file_path: str, mime_type: str | None, text: str, hasher: MinHasher | None = None
+) -> Fingerprint:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    gray = first_page_gray(file_path, mime_type)
+    return Fingerprint(
+        content_hash=digest.hexdigest(),
+        text_signature=(hasher or MinHasher()).signature(text),
+        # Blank or near-uniform pages carry no signal.
+        image_hash=dhash(gray) if gray is not None and gray.size and gray.std() > 2 else None,
+    )
+
+
+@dataclass
+class DuplicateMatch:
+    document_id: str
+    similarity: float
+    kind: str  # "exact", "text" or "image"
+
+
+class DuplicateIndex:
+    """LSH index over fingerprints stored in ``signature_band``.
+
+    A lookup reads the few rows sharing a band with the new document (an
+    index probe per band), then verifies only those candidates, so cost does
+    not grow with the corpus. Page-image matches need supporting text
+    similarity when both documents have text: invoices printed from one
+    template look alike at 9x8 pixels.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def find(self, fingerprint: Fingerprint, exclude: str) -> DuplicateMatch | None:
+        # The documents sharing the most bands, counted by the database.
+        candidates = list(
+            await self.session.scalars(
+                select(SignatureBand.document_id)
+                .where(
+                    SignatureBand.band.in_(fingerprint.bands()),
+                    SignatureBand.document_id != exclude,
+                )
+                .group_by(SignatureBand.document_id)
+                .order_by(func.count().desc(), SignatureBand.document_id)
+                .limit(MAX_CANDIDATES)
+            )
+        )
+        if not candidates:
+            return None
+        rows = await self.session.scalars(
+            select(DocumentFingerprint).where(DocumentFingerprint.document_id.in_(candidates))
+        )
+        best: DuplicateMatch | None = None
+        for row in rows:
+            match = self._verify(fingerprint, row)
+            if match is not None and (best is None or match.similarity > best.similarity):
+                best = match
+        return best
+
+    @staticmethod
+    def _verify(fingerprint: Fingerprint, row: DocumentFingerprint) -> DuplicateMatch | None:
+        # Link to the original rather than to another copy.
+        target = row.duplicate_of or row.document_id
+        if row.content_hash == fingerprint.content_hash:
+            return DuplicateMatch(target, 1.0, "exact")
+        text_similarity = None
+        if fingerprint.text_signature is not None and row.text_signature is not None:
+            other = np.frombuffer(row.text_signature, dtype=np.uint32)
+            text_similarity = MinHasher.similarity(fingerprint.text_signature, other)
+            if text_similarity >= settings.duplicate_text_threshold:
+                return DuplicateMatch(target, text_similarity, "text")
+        if fingerprint.image_hash is not None and row.image_hash is not None:
+            distance = hamming(fingerprint.image_hash, row.image_hash)
+            if distance <= settings.duplicate_image_distance and (
+                text_similarity is None or text_similarity >= 0.5
+            ):
+                return DuplicateMatch(target, 1 - distance / 64, "image")
+        return None
+
+    async def add(
+        self, document_id: str, fingerprint: Fingerprint, match: DuplicateMatch | None
+    ) -> None:
+        """Store (or replace) a document's fingerprint and bands; the caller commits."""
+
+        await self.remove([document_id])
+        self.session.add(
+            DocumentFingerprint(
+                document_id=document_id,
+                content_hash=fingerprint.content_hash,
+                text_signature=(
+                    fingerprint.text_signature.tobytes()
+                    if fingerprint.text_signature is not None
+                    else None
+                ),
+                image_hash=fingerprint.image_hash,
+                duplicate_of=match.document_id if match else None,
+                similarity=match.similarity if match else None,
+            )
+        )
+        self.session.add_all(
+            SignatureBand(band=band, document_id=document_id)
+            for band in dict.fromkeys(fingerprint.bands())
+        )
+
+    async def remove(self, document_ids: list[str]) -> None:
+        await self.session.execute(
+            delete(SignatureBand).where(SignatureBand.document_id.in_(document_ids))
+        )
+        await self.session.execute(
+            delete(DocumentFingerprint).where(DocumentFingerprint.document_id.in_(document_ids))
+        )
+
+    async def stored_copy(self, document: Document) -> Extraction | None:
+        """The complete extraction of an earlier upload with the same bytes.
+
+        ``Document.content_hash`` is known at upload, so this lookup (one
+        index probe) runs before any text is read.
+        """
+
+        if not document.content_hash:
+            return None
+        return await self.session.scalar(
+            select(Extraction)
+            .join(Document, Document.id == Extraction.document_id)
+            .where(
+                Document.content_hash == document.content_hash,
+                Document.id != document.id,
+                Extraction.text_partial.is_(False),
+            )
+            .order_by(Document.uploaded_at, Document.id)
+            .limit(1)
+        )
+
+    async def reusable_extraction(
+        self, match: DuplicateMatch, text: str
+    ) -> Extraction | None:
+        """The sibling's extraction when the match is close enough to copy it.
+
+        Besides the similarity threshold, the sibling's invoice number must
+        occur in this document's text, which separates a rescan from next
+        month's invoice of the same supplier.
+        """
+
+        if match.similarity < settings.duplicate_reuse_threshold:
+            return None
+        extraction = await self.session.scalar(
+            select(Extraction).where(Extraction.document_id == match.document_id)
+        )
+        if extraction is None:
+            return None
+        number = (extraction.extracted_data or {}).get("invoice_number")
+        if match.kind != "exact" and number and str(number) not in text:
+            return None
+        return extraction
@@ -0,0 +1,168 @@
+"""Streaming DOCX reader: paragraphs and tables in document order."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import tempfile
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+from xml.etree import ElementTree
+
+from ..core.config import settings
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+DOCUMENT_PART = "word/document.xml"
+CELL_SEPARATOR = " | "
+
+
+class DocConversionError(RuntimeError):
+    """A legacy .doc file could not be converted to DOCX."""
+
+
+def _table_lines(rows: list[list[str]]) -> list[str]:
+    """One line per row with empty cells dropped, so a total stays next to its label."""
+
+    lines = []
+    for row in rows:
+        cells = [cell for cell in row if cell]
+        if cells:
+            lines.append(CELL_SEPARATOR.join(cells))
+    return lines
+
+
+def iter_docx_blocks(source: str | Path) -> Iterator[str]:
+    """Yield body paragraphs and whole tables (one row per line) in document order.
+
+    ``word/document.xml`` is parsed incrementally and each top-level block is
+    dropped once emitted, so memory stays bounded by the largest table rather
+    than the document. Nested tables are flattened into their cell.
+    """
+
+    with zipfile.ZipFile(source) as archive, archive.open(DOCUMENT_PART) as stream:
+        body = None
+        depth = 0
+        fallback = 0
+        # Open paragraphs (text boxes nest them) and open tables: rows of cells,
+        # each cell a list of paragraph texts.
+        paragraphs: list[list[str]] = []
+        tables: list[list[list[list[str]]]] = []
+        for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+            tag = element.tag
+            if tag == FALLBACK:
+                # Legacy copies of text boxes and drawings, already read from mc:Choice.
+                fallback += 1 if event == "start" else -1
+            if event == "start":
+                depth += 1
+                if tag == f"{W}body":
+                    body = element
+                elif fallback:
+                    pass
+                elif tag == f"{W}p":
+                    paragraphs.append([])
+                elif tag == f"{W}tbl":
+                    tables.append([])
+                elif tag == f"{W}tr" and tables:
+                    tables[-1].append([])
+                elif tag == f"{W}tc" and tables and tables[-1]:
+                    tables[-1][-1].append([])
+                continue
+
+            depth -= 1
+            block: str | None = None
+            if fallback:
+                pass
+            # Table structure first: a table in a text box closes while the
+            # paragraph holding the text box is still open.
+            elif tag == f"{W}tbl" and tables:
+                rows = [[" ".join(cell) for cell in row] for row in tables.pop()]
+                lines = _table_lines(rows)
+                if tables and tables[-1] and tables[-1][-1]:
+                    tables[-1][-1][-1].extend(lines)
+                elif lines:
+                    block = "\n".join(lines)
+            elif tag in (f"{W}tr", f"{W}tc"):
+                pass
+            elif paragraphs and tag != f"{W}p":
+                if tag == f"{W}t":
+                    paragraphs[-1].append(element.text or "")
+                elif tag == f"{W}tab":
+                    paragraphs[-1].append("\t")
+                elif tag in (f"{W}br", f"{W}cr"):
+                    paragraphs[-1].append("\n")
+            elif tag == f"{W}p" and paragraphs:
+                text = "".join(paragraphs.pop()).strip()
+                if tables and tables[-1] and tables[-1][-1]:
+                    if text:
+                        tables[-1][-1][-1].append(" ".join(text.split()))
+                elif text:
+                    block = text
+
+            # Children of <w:body> are at depth 2 once closed: drop them. Deeper
+            # elements are emptied so a long table only keeps its skeleton.
+            if body is not None and depth == 2:
+                body.remove(element)
+            elif depth > 2:
+                element.clear()
+            if block is not None:
+                yield block
+
+
+def read_docx(source: str | Path) -> tuple[str, list[int]]:
+    """Document text with blocks separated by newlines, and each block's start offset."""
+
+    parts: list[str] = []
+    starts: list[int] = []
+    position = 0
+    for block in iter_docx_blocks(source):
+        starts.append(position)
+        parts.append(block)
+        position += len(block) + 1
+    return "\n".join(parts), starts or [0]
+
+
+def doc_converter() -> str | None:
+    return settings.doc_converter or shutil.which("soffice") or shutil.which("libreoffice")
+
+
+def convert_doc(source: str | Path, output_dir: str | Path) -> Path:
+    """Convert a legacy Word ``.doc`` to DOCX with headless LibreOffice."""
+
+    command = doc_converter()
+    if command is None:
+        raise DocConversionError("LibreOffice (soffice) is required to read .doc files")
+    output_dir = Path(output_dir)
+    # A private profile lets several conversions run at once.
+    profile = (output_dir / "profile").resolve().as_uri()
+    try:
+        subprocess.run(
+            [
+                command,
+                f"-env:UserInstallation={profile}",
+                "--headless",
+                "--norestore",
+                "--convert-to",
+                "docx",
+                "--outdir",
+                str(output_dir),
+                str(source),
+            ],
+            check=True,
+            capture_output=True,
+            timeout=settings.doc_conversion_timeout,
+        )
+    except (OSError, subprocess.SubprocessError) as exc:
+        raise DocConversionError(f"conversion of {source} failed: {exc}") from exc
+    converted = output_dir / f"{Path(source).stem}.docx"
+    if not converted.exists():
+        raise DocConversionError(f"conversion of {source} produced no DOCX")
+    return converted
+
+
+def read_doc(source: str | Path) -> tuple[str, list[int]]:
+    """Read a legacy ``.doc`` by converting it to DOCX in a temporary directory."""
+
+    with tempfile.TemporaryDirectory(prefix="doc-") as workdir:
+        return read_docx(convert_doc(source, workdir))
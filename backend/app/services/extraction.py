@@ -11,12 +11,27 @@ from typing import Any
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.config import settings
 from ..models import Document, Extraction
+from .classification import Classification, get_classifier
+from .confidence import FieldConfidenceScorer
+from .dedup import DuplicateIndex, DuplicateMatch, MinHasher, compute_fingerprint
 from .gemini import GeminiService
-from .text_extraction import TextExtractionService
+from .layout import LAYOUT_ARTIFACT
+from .line_items import LineItemExtractor
+from .local_extraction import INVOICE_FIELDS, LocalExtraction, LocalInvoiceExtractor
+from .regions import RegionReader
+from .response_cache import invalidate_documents
+from .review import ReviewQueue
+from .storage import StorageService
+from .text_extraction import ExtractedText, TextExtractionService
+from .text_store import TEXT_ARTIFACT, encode_text_store
 
 logger = logging.getLogger(__name__)
 
+# Document types whose item tables are extracted.
+LINE_ITEM_TYPES = ("invoice", "receipt")
+
 
 @dataclass
 class ExtractionResult:
@@ -26,6 +41,21 @@ class ExtractionResult:
     extraction: Extraction
 
 
+@dataclass
+class TextReading:
+    """Text read for a document, and what the priority pass already established.
+
+    ``remainder`` is set when only the priority regions were read: ``local``
+    and ``classification`` were computed on that text and the reader still
+    holds the deferred regions and pages.
+    """
+
+    extracted: ExtractedText
+    local: LocalExtraction | None = None
+    classification: Classification | None = None
+    remainder: RegionReader | None = None
+
+
 class ExtractionPipeline:
     """Coordinates text extraction and Gemini structuring."""
 
@@ -34,10 +64,16 @@ class ExtractionPipeline:
         session: AsyncSession,
         text_reader: TextExtractionService | None = None,
         gemini: GeminiService | None = None,
+        local_extractor: LocalInvoiceExtractor | None = None,
     ) -> None:
         self.session = session
         self.text_reader = text_reader or TextExtractionService()
         self.gemini = gemini or GeminiService()
+        self.local_extractor = local_extractor or LocalInvoiceExtractor()
+        self.storage = StorageService()
+        self.scorer = FieldConfidenceScorer()
+        self.hasher = MinHasher()
+        self.line_item_extractor = LineItemExtractor()
 
     async def run(self, document_id: str) -> ExtractionResult:
         """Execute the extraction pipeline for a document."""
@@ -47,18 +83,39 @@ class ExtractionPipeline:
             raise ValueError("Document not found")
 
         start_time = time.perf_counter()
-        extracted_text = await asyncio.to_thread(
-            self.text_reader.extract_text, document.file_path, document.mime_type
-        )
-        gemini_payload = self.gemini.extract(extracted_text)
-        doc_type, confidence = self._enhance_metadata(
-            gemini_payload.get("document_type", "other"),
-            gemini_payload.get("confidence_score"),
-            extracted_text,
-            gemini_payload,
-        )
-        gemini_payload["document_type"] = doc_type
-        gemini_payload["confidence_score"] = confidence
+        copy = await self._stored_copy(document)
+        if copy is not None:
+            return await self._reuse_copy(document, copy, start_time)
+        reading = await self._read_text(document)
+        extracted = reading.extracted
+        extracted_text = extracted.text
+        await self._save_text_artifacts(document, extracted)
+        sibling = await self._check_duplicates(document, extracted_text)
+        if sibling is not None:
+            logger.info(
+                "Document %s duplicates %s; reusing its extraction.",
+                document.id,
+                sibling.document_id,
+            )
+            gemini_payload = dict(sibling.extracted_data)
+            confidence_scores = dict(sibling.confidence_scores)
+        else:
+            classification = reading.classification or get_classifier().classify(extracted_text)
+            gemini_payload, local = self._structure(extracted_text, classification, reading.local)
+            doc_type, confidence = self._enhance_metadata(
+                gemini_payload.get("document_type", "other"),
+                gemini_payload.get("confidence_score"),
+                classification,
+                gemini_payload,
+            )
+            gemini_payload["document_type"] = doc_type
+            gemini_payload["confidence_score"] = confidence
+            confidence_scores = self.scorer.score(
+                gemini_payload, extracted_text, layout=extracted.layout, local=local
+            )
+            # A priority pass has not read the item table yet; see _complete_text.
+            if reading.remainder is None:
+                self._add_line_items(gemini_payload, confidence_scores, extracted)
         processing_time = time.perf_counter() - start_time
 
         extraction = await self._persist_extraction(
@@ -66,29 +123,236 @@ class ExtractionPipeline:
             gemini_payload=gemini_payload,
             ocr_text=extracted_text,
             processing_time=processing_time,
+            confidence_scores=confidence_scores,
+            page_offsets=extracted.page_offsets,
+            text_partial=reading.remainder is not None,
+        )
+        if reading.remainder is not None:
+            await self._complete_text(document, extraction, reading.remainder)
+        return ExtractionResult(document=document, extraction=extraction)
+
+    async def _stored_copy(self, document: Document) -> Extraction | None:
+        if not (settings.duplicate_detection_enabled and settings.duplicate_reuse_extraction):
+            return None
+        return await DuplicateIndex(self.session).stored_copy(document)
+
+    async def _reuse_copy(
+        self, document: Document, copy: Extraction, start_time: float
+    ) -> ExtractionResult:
+        """Store a byte-identical upload's extraction, text and artifacts without OCR."""
+
+        logger.info(
+            "Document %s has the same content as %s; reusing its extraction unread.",
+            document.id,
+            copy.document_id,
+        )
+        for name in (LAYOUT_ARTIFACT, TEXT_ARTIFACT):
+            source = self.storage.artifact_path(copy.document_id, name)
+            if source is not None:
+                data = await asyncio.to_thread(source.read_bytes)
+                await asyncio.to_thread(self.storage.save_artifact, document.id, name, data)
+        await self._index_fingerprint(document, copy.ocr_text)
+        extraction = await self._persist_extraction(
+            document=document,
+            gemini_payload=dict(copy.extracted_data),
+            ocr_text=copy.ocr_text,
+            processing_time=time.perf_counter() - start_time,
+            confidence_scores=dict(copy.confidence_scores),
+            page_offsets=copy.page_offsets,
         )
         return ExtractionResult(document=document, extraction=extraction)
 
+    async def _read_text(self, document: Document) -> TextReading:
+        """Read the document, OCRing only header/totals regions of scans first.
+
+        When the local rules resolve every invoice field from those regions,
+        the fields are stored without reading further and the text is
+        completed afterwards (see :meth:`_complete_text`). Otherwise the
+        document is read in full now, since Gemini needs the context, through
+        the text reader so embedded images repeated across pages are OCR'd once.
+        """
+
+        path, mime_type = document.file_path, document.mime_type
+        if not (
+            settings.ocr_regions_enabled
+            and settings.local_extraction_enabled
+            and await asyncio.to_thread(RegionReader.applies, path, mime_type)
+        ):
+            return TextReading(
+                await asyncio.to_thread(self.text_reader.extract, path, mime_type)
+            )
+
+        reader = RegionReader(path, mime_type)
+        extracted = await asyncio.to_thread(reader.read_priority)
+        local = self.local_extractor.extract(extracted.text)
+        classification = get_classifier().classify(extracted.text)
+        if self._resolves_invoice(local, classification):
+            logger.info(
+                "Document %s: priority regions resolved all fields (%s OCR runs, %s deferred).",
+                document.id,
+                reader.ocr_runs,
+                reader.deferred,
+            )
+            return TextReading(extracted, local, classification, remainder=reader)
+        return TextReading(await asyncio.to_thread(self.text_reader.extract, path, mime_type))
+
+    @staticmethod
+    def _resolves_invoice(local: LocalExtraction, classification: Classification) -> bool:
+        return (
+            not local.unresolved(INVOICE_FIELDS, settings.local_extraction_threshold)
+            and classification.document_type == "invoice"
+        )
+
+    async def _complete_text(
+        self, document: Document, extraction: Extraction, reader: RegionReader
+    ) -> None:
+        """Read what the priority pass deferred and replace the partial text.
+
+        The fields are already committed; regions read before are not OCR'd again.
+        Line items are read here, once the item table has been OCR'd, and the
+        fingerprint taken from the partial text is replaced.
+        """
+
+        extracted = await asyncio.to_thread(reader.read_all)
+        await self._save_text_artifacts(document, extracted)
+        extraction.ocr_text = extracted.text
+        extraction.page_offsets = extracted.page_offsets
+        extraction.text_partial = False
+        payload = dict(extraction.extracted_data)
+        scores = dict(extraction.confidence_scores)
+        self._add_line_items(payload, scores, extracted)
+        if "line_items" in payload:
+            extraction.extracted_data = payload
+            extraction.confidence_scores = scores
+            await ReviewQueue(self.session).requeue(document, scores)
+        if settings.duplicate_detection_enabled:
+            await self._index_fingerprint(document, extracted.text)
+        await self.session.commit()
+        await self._invalidate(document.id)
+
+    async def _save_text_artifacts(self, document: Document, extracted: ExtractedText) -> None:
+        if extracted.layout is not None:
+            await asyncio.to_thread(
+                self.storage.save_artifact,
+                document.id,
+                LAYOUT_ARTIFACT,
+                extracted.layout.to_bytes(),
+            )
+        if extracted.page_offsets is not None:
+            await asyncio.to_thread(
+                self.storage.save_artifact,
+                document.id,
+                TEXT_ARTIFACT,
+                encode_text_store(
+                    extracted.text, extracted.page_offsets, extracted.block_offsets
+                ),
+            )
+
+    async def _check_duplicates(self, document: Document, text: str) -> Extraction | None:
+        """Fingerprint the document, link it to a near-duplicate, and return the
+        sibling's extraction when it may be reused."""
+
+        if not settings.duplicate_detection_enabled:
+            return None
+        match = await self._index_fingerprint(document, text)
+        if match is None:
+            return None
+        logger.info(
+            "Document %s looks like a %s duplicate of %s (similarity %.2f).",
+            document.id,
+            match.kind,
+            match.document_id,
+            match.similarity,
+        )
+        if not settings.duplicate_reuse_extraction:
+            return None
+        return await DuplicateIndex(self.session).reusable_extraction(match, text)
+
+    async def _index_fingerprint(self, document: Document, text: str) -> DuplicateMatch | None:
+        """Store the document's fingerprint and return its closest earlier duplicate."""
+
+        fingerprint = await asyncio.to_thread(
+            compute_fingerprint, document.file_path, document.mime_type, text, self.hasher
+        )
+        index = DuplicateIndex(self.session)
+        match = await index.find(fingerprint, exclude=document.id)
+        await index.add(document.id, fingerprint, match)
+        return match
+
+    def _structure(
+        self,
+        text: str,
+        classification: Classification,
+        local: LocalExtraction | None = None,
+    ) -> tuple[dict[str, Any], LocalExtraction | None]:
+        """Resolve fields locally where possible and ask Gemini for the rest.
+
+        ``local`` is reused when the caller already ran the local rules on ``text``.
+        """
+
+        if not settings.local_extraction_enabled:
+            return self.gemini.extract(text), None
+
+        threshold = settings.local_extraction_threshold
+        local = local or self.local_extractor.extract(text)
+        if self._resolves_invoice(local, classification):
+            logger.info("Local rules resolved all invoice fields; skipping Gemini.")
+            # Supplier (and currency when no code was found) have no reliable local
+            # rule and are left out rather than stored empty, which would score them
+            # 0.0 and queue every invoice resolved here for review.
+            payload = {
+                "document_type": "invoice",
+                **local.values(threshold),
+                "confidence_score": local.confidence(INVOICE_FIELDS),
+            }
+            return payload, local
+
+        resolved = local.values(threshold)
+        wanted = [
+            name for name in (*INVOICE_FIELDS, "supplier", "currency") if name not in resolved
+        ]
+        payload = self.gemini.extract(text, fields=wanted)
+        payload.update(resolved)
+        return payload, local
+
+    def _add_line_items(
+        self,
+        payload: dict[str, Any],
+        confidence_scores: dict[str, float],
+        extracted: ExtractedText,
+    ) -> None:
+        """Attach the item table, scored by how it reconciles with the totals."""
+
+        if payload.get("document_type") not in LINE_ITEM_TYPES:
+            return
+        table = self.line_item_extractor.extract(extracted.layout, extracted.text)
+        if not table.items:
+            return
+        payload["line_items"] = table.to_payload()
+        confidence_scores["line_items"] = table.reconcile(payload)
+        logger.info(
+            "%s line items totalling %s (amount_ht %s, amount_ttc %s).",
+            len(table.items),
+            table.total,
+            payload.get("amount_ht"),
+            payload.get("amount_ttc"),
+        )
+
     def _enhance_metadata(
         self,
         doc_type: str,
         confidence: float | None,
-        full_text: str,
+        classification: Classification,
         payload: dict[str, Any],
     ) -> tuple[str, float]:
         """Improve document type and confidence when Gemini is unsure."""
 
-        normalized_text = full_text.lower()
-        candidates = {
-            "invoice": ["facture", "invoice", "montant", "tva", "numéro de facture"],
-            "contract": ["contrat", "agreement", "signature", "clause"],
-            "receipt": ["receipt", "reçu", "cash", "payment"],
-        }
         detected_type = doc_type or "other"
-        for dtype, keywords in candidates.items():
-            if any(keyword in normalized_text for keyword in keywords):
-                detected_type = dtype
-                break
+        # Keep Gemini's answer when it ties the keyword winner.
+        if classification.document_type and (
+            classification.scores.get(detected_type, 0.0) < classification.top_score
+        ):
+            detected_type = classification.document_type
 
         base_confidence = confidence if isinstance(confidence, (int, float)) else 0.0
         filled_fields = sum(1 for key, value in payload.items() if key != "confidence_score" and value not in (None, "", []))
@@ -108,22 +372,47 @@ class ExtractionPipeline:
         gemini_payload: dict[str, Any],
         ocr_text: str,
         processing_time: float,
+        confidence_scores: dict[str, float] | None = None,
+        page_offsets: list[int] | None = None,
+        text_partial: bool = False,
     ) -> Extraction:
-        extraction = Extraction(
-            document=document,
-            document_type=gemini_payload.get("document_type", "other"),
-            extracted_data=gemini_payload,
-            confidence_scores={
-                key: gemini_payload.get("confidence_score", 0.0)
-                for key in gemini_payload.keys()
-            },
-            ocr_text=ocr_text,
-            processing_time=processing_time,
+        if confidence_scores is None:
+            confidence_scores = {
+                key: gemini_payload.get("confidence_score", 0.0) for key in gemini_payload.keys()
+            }
+        values = {
+            "document_type": gemini_payload.get("document_type", "other"),
+            "extracted_data": gemini_payload,
+            "confidence_scores": confidence_scores,
+            "ocr_text": ocr_text,
+            "page_offsets": page_offsets,
+            "text_partial": text_partial,
+            "processing_time": processing_time,
+        }
+        # Retries and reprocessing update the document's extraction in place.
+        extraction = await self.session.scalar(
+            select(Extraction).where(Extraction.document_id == document.id)
         )
+        if extraction is None:
+            extraction = Extraction(document=document, **values)
+            self.session.add(extraction)
+        else:
+            for name, value in values.items():
+                setattr(extraction, name, value)
+            extraction.manually_corrected = False
         document.status = "completed"
         document.processed_at = document.processed_at or document.uploaded_at
-        self.session.add(extraction)
+        await ReviewQueue(self.session).requeue(document, confidence_scores)
         await self.session.commit()
+        await self._invalidate(document.id)
         await self.session.refresh(extraction)
         return extraction
 
+    @staticmethod
+    async def _invalidate(document_id: str) -> None:
+        try:
+            await invalidate_documents([document_id])
+        except Exception as exc:  # noqa: BLE001
+            # The extraction is committed; a stale entry only lives until its TTL.
+            logger.warning("Could not invalidate cached document %s: %s", document_id, exc)
+
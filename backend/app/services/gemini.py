@@ -22,7 +22,7 @@ RULES:
 3. If field not found, use null
 4. Include confidence: 0.0-1.0 based on clarity
 5. Detect document_type: "invoice" | "contract" | "receipt" | "other"
-
+{field_rule}
 OCR TEXT:
 {ocr_text}
 
@@ -37,10 +37,20 @@ class GeminiService:
         genai.configure(api_key=settings.gemini_api_key)
         self.model = genai.GenerativeModel(settings.gemini_model)
 
-    def extract(self, ocr_text: str) -> dict:
-        """Extract structured fields from OCR text."""
+    def extract(self, ocr_text: str, fields: list[str] | None = None) -> dict:
+        """Extract structured fields from OCR text.
+
+        When ``fields`` is given, Gemini is only asked for those keys (plus
+        document_type and confidence_score).
+        """
 
-        prompt = PROMPT_TEMPLATE.format(ocr_text=ocr_text)
+        field_rule = (
+            f"6. Only return these keys plus document_type and confidence_score: "
+            f"{', '.join(fields)}\n"
+            if fields
+            else ""
+        )
+        prompt = PROMPT_TEMPLATE.format(ocr_text=ocr_text, field_rule=field_rule)
         try:
             response = self.model.generate_content(
                 prompt,
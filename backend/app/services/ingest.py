@@ -0,0 +1,220 @@
+"""Bulk ingestion of archives and server-side directories."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import tarfile
+import uuid
+import zipfile
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.security import MAGIC_BYTES, detect_mime_type
+from ..models import Document
+from .storage import StorageService
+
+logger = logging.getLogger(__name__)
+
+MAX_REPORTED_SKIPS = 100
+
+
+@dataclass
+class IngestMember:
+    """A file inside an archive or directory, opened lazily and read once."""
+
+    name: str
+    open: Callable[[], AbstractContextManager[BinaryIO]]
+
+
+@dataclass
+class IngestReport:
+    """Outcome of a bulk ingestion run."""
+
+    created: int = 0
+    skipped: int = 0
+    batches: int = 0
+    skipped_items: list[dict[str, str]] = field(default_factory=list)
+    document_ids: list[str] = field(default_factory=list)
+
+    def skip(self, name: str, reason: str) -> None:
+        self.skipped += 1
+        if len(self.skipped_items) < MAX_REPORTED_SKIPS:
+            self.skipped_items.append({"name": name, "reason": reason})
+
+    def as_dict(self) -> dict:
+        return {
+            "created": self.created,
+            "skipped": self.skipped,
+            "batches": self.batches,
+            "skipped_items": self.skipped_items,
+        }
+
+
+def iter_directory(root: Path, recursive: bool = True) -> Iterator[IngestMember]:
+    """Yield regular files under ``root`` in a stable order."""
+
+    if not recursive:
+        for entry in sorted(os.scandir(root), key=lambda item: item.name):
+            if entry.is_file(follow_symlinks=False):
+                path = Path(entry.path)
+                yield IngestMember(str(path.relative_to(root)), lambda path=path: path.open("rb"))
+        return
+    for current, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            path = Path(current) / name
+            if path.is_file() and not path.is_symlink():
+                yield IngestMember(str(path.relative_to(root)), lambda path=path: path.open("rb"))
+
+
+def iter_archive(fileobj: BinaryIO) -> Iterator[IngestMember]:
+    """Yield members of a ZIP or (optionally compressed) TAR archive.
+
+    ZIP needs a seekable file for its central directory; TAR is read as a
+    forward-only stream so members must be consumed in order.
+    """
+
+    head = fileobj.read(4)
+    fileobj.seek(0)
+    if head.startswith(b"PK"):
+        try:
+            archive = zipfile.ZipFile(fileobj)
+        except zipfile.BadZipFile as exc:
+            raise ValueError("Unsupported archive format; truncated or corrupt ZIP") from exc
+        with archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    yield IngestMember(info.filename, lambda info=info: archive.open(info))
+        return
+    try:
+        archive = tarfile.open(fileobj=fileobj, mode="r|*")
+    except tarfile.TarError as exc:
+        raise ValueError("Unsupported archive format; expected ZIP or TAR") from exc
+    with archive:
+        for info in archive:
+            if not info.isfile():
+                continue
+            extracted = archive.extractfile(info)
+            if extracted is not None:
+                yield IngestMember(info.name, lambda extracted=extracted: extracted)
+
+
+def enqueue_documents(document_ids: list[str]) -> None:
+    """Publish processing tasks for a batch over a single broker connection."""
+
+    from ..core.celery_app import celery_app  # local import keeps the API import light
+    from ..workers.tasks import process_document
+
+    with celery_app.producer_or_acquire() as producer:
+        for document_id in document_ids:
+            process_document.apply_async(
+                args=[document_id], task_id=document_id, producer=producer
+            )
+
+
+class BulkIngestor:
+    """Streams members to storage, inserts rows per batch and enqueues them."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        storage: StorageService | None = None,
+        batch_size: int | None = None,
+        enqueue: Callable[[list[str]], None] | None = enqueue_documents,
+    ) -> None:
+        self.session = session
+        self.storage = storage or StorageService()
+        self.batch_size = batch_size or settings.ingest_batch_size
+        self.enqueue = enqueue
+        self.max_bytes = settings.max_upload_size_mb * 1024 * 1024
+
+    async def ingest(self, members: Iterator[IngestMember]) -> IngestReport:
+        """Consume ``members`` batch by batch; file I/O runs off the event loop."""
+
+        report = IngestReport()
+        while True:
+            rows, exhausted = await asyncio.to_thread(self._store_batch, members, report)
+            if rows:
+                await self.session.execute(insert(Document), rows)
+                await self.session.commit()
+                report.created += len(rows)
+                report.batches += 1
+                report.document_ids.extend(row["id"] for row in rows)
+                if self.enqueue is not None:
+                    await asyncio.to_thread(self.enqueue, [row["id"] for row in rows])
+                logger.info("Ingested batch %d (%d documents)", report.batches, len(rows))
+            if exhausted:
+                return report
+
+    def _store_batch(
+        self, members: Iterator[IngestMember], report: IngestReport
+    ) -> tuple[list[dict], bool]:
+        rows: list[dict] = []
+        consumed = 0
+        for member in islice(members, self.batch_size):
+            consumed += 1
+            row = self._store_member(member, report)
+            if row is not None:
+                rows.append(row)
+        return rows, consumed < self.batch_size
+
+    def _store_member(self, member: IngestMember, report: IngestReport) -> dict | None:
+        filename = Path(member.name).name or "document"
+        try:
+            with member.open() as stream:
+                head = stream.read(MAGIC_BYTES)
+                mime_type = detect_mime_type(head)
+                if mime_type is None:
+                    report.skip(member.name, "unsupported file type")
+                    return None
+                document_id = str(uuid.uuid4())
+                digest = hashlib.sha256()
+                # Archives routinely repeat basenames; prefix with the id to keep them apart.
+                stored = self.storage.save_stream(
+                    f"{document_id}_{filename}",
+                    stream,
+                    head=head,
+                    max_bytes=self.max_bytes,
+                    digest=digest,
+                )
+        except (OSError, zipfile.BadZipFile, tarfile.TarError) as exc:
+            report.skip(member.name, f"unreadable: {exc}")
+            return None
+        if stored is None:
+            report.skip(member.name, "file too large")
+            return None
+        path, size = stored
+        return {
+            "id": document_id,
+            "filename": filename,
+            "file_path": str(path),
+            "file_size": size,
+            "mime_type": mime_type,
+            "content_hash": digest.hexdigest(),
+            "status": "pending",
+            "uploaded_at": datetime.utcnow(),
+        }
+
+
+def resolve_ingest_directory(raw: str) -> Path:
+    """Resolve a server-side path and require it to sit under an allowed directory."""
+
+    path = Path(raw).expanduser().resolve()
+    for allowed in settings.ingest_allowed_dirs:
+        if path.is_relative_to(Path(allowed).expanduser().resolve()):
+            if not path.is_dir():
+                raise ValueError(f"Not a directory: {raw}")
+            return path
+    raise PermissionError(f"Directory is not in ingest_allowed_dirs: {raw}")
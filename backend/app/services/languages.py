@@ -0,0 +1,187 @@
+"""Per-page choice of Tesseract languages from a low-resolution OCR sample."""
+
+from __future__ import annotations
+
+import logging
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+import pytesseract
+
+from ..core.config import settings
+from .rasterize import ocr_array
+from .resolution import choose_scale, rescale
+
+logger = logging.getLogger(__name__)
+
+# Short function words (plus common invoice terms) per traineddata code. Words
+# shared by several languages count for each of them; only the ratio matters.
+STOPWORDS: dict[str, frozenset[str]] = {
+    "eng": frozenset(
+        "the and of to in is for on with that this by from are be as at your you "
+        "invoice amount due total date".split()
+    ),
+    "fra": frozenset(
+        "le la les des du et est une pour par sur au aux dans avec ce qui que pas nous "
+        "vous sont cette votre montant facture".split()
+    ),
+    "deu": frozenset(
+        "der die das und ist nicht mit von zu den dem des ein eine für auf im sie wir "
+        "rechnung betrag datum gesamt".split()
+    ),
+    "spa": frozenset(
+        "el los las del y es en por para con una que se su al factura importe fecha".split()
+    ),
+    "ita": frozenset(
+        "il lo gli della delle di e è per con una che non sono del al fattura importo "
+        "data totale".split()
+    ),
+    "nld": frozenset(
+        "de het een en van is op voor met niet zijn te dat bij factuur bedrag datum "
+        "totaal".split()
+    ),
+    "por": frozenset(
+        "o os as do da dos das e em para com uma que não são fatura valor data".split()
+    ),
+}
+# Unicode script of each non-Latin traineddata; anything else is Latin.
+SCRIPTS = {
+    "rus": "CYRILLIC",
+    "ukr": "CYRILLIC",
+    "bul": "CYRILLIC",
+    "ell": "GREEK",
+    "ara": "ARABIC",
+    "heb": "HEBREW",
+    "chi_sim": "CJK",
+    "chi_tra": "CJK",
+}
+WORD = re.compile(r"[^\W\d_]+")
+MIN_SCRIPT_SHARE = 0.1
+
+
+def script_of(code: str) -> str:
+    return SCRIPTS.get(code, "LATIN")
+
+
+def letter_scripts(text: str) -> Counter[str]:
+    """Letters of ``text`` counted per Unicode script (first word of the char name)."""
+
+    counts: Counter[str] = Counter()
+    for char in text:
+        if char.isalpha():
+            counts[unicodedata.name(char, "UNKNOWN").split(" ", 1)[0]] += 1
+    return counts
+
+
+@dataclass
+class LanguageChoice:
+    """Languages kept for a page and the evidence behind them."""
+
+    languages: tuple[str, ...]
+    hits: dict[str, int] = field(default_factory=dict)
+    words: int = 0
+
+    @property
+    def lang(self) -> str:
+        return "+".join(self.languages)
+
+
+def select_languages(
+    text: str,
+    candidates: tuple[str, ...] | list[str],
+    min_hits: int | None = None,
+    mix_ratio: float | None = None,
+) -> LanguageChoice:
+    """Smallest subset of ``candidates`` that explains the sampled text.
+
+    Candidates are first narrowed to the scripts present in the sample. Within
+    a script, the language with the most stop-word hits is kept, plus any other
+    reaching ``mix_ratio`` of its hits (bilingual pages). With too little
+    evidence every candidate of that script is kept.
+    """
+
+    min_hits = settings.ocr_language_min_hits if min_hits is None else min_hits
+    mix_ratio = settings.ocr_language_mix_ratio if mix_ratio is None else mix_ratio
+    candidates = tuple(candidates)
+    scripts = letter_scripts(text)
+    letters = sum(scripts.values())
+    present = {
+        script
+        for script, count in scripts.items()
+        if letters and count / letters >= MIN_SCRIPT_SHARE
+    }
+    words = [word.lower() for word in WORD.findall(text)]
+    hits = {
+        code: sum(1 for word in words if word in STOPWORDS[code])
+        for code in candidates
+        if code in STOPWORDS
+    }
+
+    kept: list[str] = []
+    for script in dict.fromkeys(script_of(code) for code in candidates):
+        group = [code for code in candidates if script_of(code) == script]
+        if script not in present:
+            continue
+        scored = [code for code in group if code in hits]
+        best = max((hits[code] for code in scored), default=0)
+        if len(group) == 1 or best < min_hits:
+            kept.extend(group)
+            continue
+        kept.extend(code for code in scored if hits[code] >= max(best * mix_ratio, 1))
+    if not kept:
+        kept = list(candidates)
+    return LanguageChoice(tuple(code for code in candidates if code in kept), hits, len(words))
+
+
+@lru_cache
+def resolve_languages(combination: str) -> tuple[str, ...]:
+    """Installed traineddata among a ``fra+eng`` style combination, looked up once.
+
+    Falls back to the combination as given when Tesseract cannot be queried.
+    """
+
+    codes = tuple(code for code in combination.split("+") if code)
+    try:
+        installed = set(pytesseract.get_languages(config=""))
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Could not list Tesseract languages: %s", exc)
+        return codes
+    available = tuple(code for code in codes if code in installed)
+    missing = set(codes) - set(available)
+    if missing:
+        logger.warning("Tesseract languages not installed, ignored: %s", ", ".join(sorted(missing)))
+    return available or codes
+
+
+def page_languages(gray: np.ndarray, source: str = "page") -> str | None:
+    """Language string for OCR of ``gray``, or None for the configured set.
+
+    The sample is the image rescaled so glyphs are about
+    ``ocr_language_sample_text_px`` tall (never upscaled), OCR'd once with
+    every candidate language.
+    """
+
+    if not settings.ocr_language_detection:
+        return None
+    candidates = resolve_languages(settings.ocr_languages or "eng")
+    if len(candidates) <= 1:
+        return None
+    decision = choose_scale(gray, target=settings.ocr_language_sample_text_px)
+    try:
+        text, _ = ocr_array(rescale(gray, min(decision.scale, 1.0)), lang="+".join(candidates))
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("%s: language sample failed: %s", source, exc)
+        return None
+    choice = select_languages(text, candidates)
+    logger.info(
+        "%s: OCR languages %s (stop-word hits %s over %d sampled words).",
+        source,
+        choice.lang,
+        choice.hits,
+        choice.words,
+    )
+    return choice.lang
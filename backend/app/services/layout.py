@@ -0,0 +1,234 @@
+"""Columnar word geometry captured during text extraction."""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass, field
+
+import numpy as np
+
+LAYOUT_ARTIFACT = "layout.npz"
+
+
+@dataclass
+class WordBoxes:
+    """Words of one page or image with boxes, confidences and line ids."""
+
+    words: list[str] = field(default_factory=list)
+    boxes: np.ndarray = field(default_factory=lambda: np.zeros((0, 4), dtype=np.float32))
+    conf: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32))
+    line: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @classmethod
+    def from_tesseract(cls, data: dict[str, list]) -> tuple["WordBoxes", str]:
+        """Build boxes and reading-order text from ``image_to_data`` output."""
+
+        words: list[str] = []
+        boxes: list[tuple[int, int, int, int]] = []
+        conf: list[float] = []
+        line_ids: list[int] = []
+        lines: list[list[str]] = []
+        line_keys: dict[tuple[int, int, int], int] = {}
+        for index, raw in enumerate(data["text"]):
+            word = (raw or "").strip()
+            if not word:
+                continue
+            key = (data["block_num"][index], data["par_num"][index], data["line_num"][index])
+            if key not in line_keys:
+                line_keys[key] = len(lines)
+                lines.append([])
+            lines[line_keys[key]].append(word)
+            left, top = int(data["left"][index]), int(data["top"][index])
+            boxes.append(
+                (left, top, left + int(data["width"][index]), top + int(data["height"][index]))
+            )
+            try:
+                score = float(data["conf"][index])
+            except (TypeError, ValueError):
+                score = -1.0
+            conf.append(score / 100 if score >= 0 else 0.0)
+            words.append(word)
+            line_ids.append(line_keys[key])
+        text = "\n".join(" ".join(line) for line in lines)
+        return (
+            cls(
+                words=words,
+                boxes=np.asarray(boxes, dtype=np.float32).reshape(-1, 4),
+                conf=np.asarray(conf, dtype=np.float32),
+                line=np.asarray(line_ids, dtype=np.int32),
+            ),
+            text,
+        )
+
+    @classmethod
+    def from_pymupdf(cls, words: list[tuple]) -> "WordBoxes":
+        """Build boxes from ``page.get_text("words")`` tuples (born-digital text)."""
+
+        line_keys: dict[tuple[int, int], int] = {}
+        line_ids = [line_keys.setdefault((int(w[5]), int(w[6])), len(line_keys)) for w in words]
+        return cls(
+            words=[w[4] for w in words],
+            boxes=np.asarray([w[:4] for w in words], dtype=np.float32).reshape(-1, 4),
+            conf=np.ones(len(words), dtype=np.float32),
+            line=np.asarray(line_ids, dtype=np.int32),
+        )
+
+    def transformed(self, x0: float, y0: float, sx: float, sy: float) -> "WordBoxes":
+        """Map boxes into another coordinate space (e.g. image pixels → page points)."""
+
+        scale = np.asarray([sx, sy, sx, sy], dtype=np.float32)
+        offset = np.asarray([x0, y0, x0, y0], dtype=np.float32)
+        return WordBoxes(self.words, self.boxes * scale + offset, self.conf, self.line)
+
+    @classmethod
+    def concat(cls, parts: list["WordBoxes"]) -> "WordBoxes":
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls()
+        lines, shift = [], 0
+        for part in parts:
+            lines.append(part.line + shift)
+            shift += int(part.line.max()) + 1
+        return cls(
+            words=[word for part in parts for word in part.words],
+            boxes=np.concatenate([part.boxes for part in parts]),
+            conf=np.concatenate([part.conf for part in parts]),
+            line=np.concatenate(lines),
+        )
+
+
+@dataclass
+class DocumentLayout:
+    """Word geometry for a whole document, stored column-wise.
+
+    ``start``/``end`` are character offsets of each word in the document text
+    (-1 when the word could not be located), which lets callers map any text
+    span back to boxes and OCR confidences.
+    """
+
+    unit: str
+    page_sizes: np.ndarray
+    page: np.ndarray
+    boxes: np.ndarray
+    conf: np.ndarray
+    line: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    words: list[str]
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            unit=np.asarray(self.unit),
+            page_sizes=self.page_sizes,
+            page=self.page,
+            boxes=self.boxes,
+            conf=self.conf,
+            line=self.line,
+            start=self.start,
+            end=self.end,
+            words=np.frombuffer("\n".join(self.words).encode("utf-8"), dtype=np.uint8),
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DocumentLayout":
+        with np.load(io.BytesIO(data)) as arrays:
+            raw_words = arrays["words"].tobytes().decode("utf-8")
+            return cls(
+                unit=str(arrays["unit"]),
+                page_sizes=arrays["page_sizes"],
+                page=arrays["page"],
+                boxes=arrays["boxes"],
+                conf=arrays["conf"],
+                line=arrays["line"],
+                start=arrays["start"],
+                end=arrays["end"],
+                words=raw_words.split("\n") if raw_words else [],
+            )
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_sizes)
+
+    def words_in_span(self, start: int, end: int) -> np.ndarray:
+        """Indices of words overlapping the character span ``[start, end)``."""
+
+        return np.flatnonzero((self.start >= 0) & (self.start < end) & (self.end > start))
+
+    def page_payload(self, page: int) -> dict:
+        """JSON-friendly words and boxes for a single page."""
+
+        indices = np.flatnonzero(self.page == page)
+        width, height = (float(v) for v in self.page_sizes[page])
+        return {
+            "page": page,
+            "unit": self.unit,
+            "width": width,
+            "height": height,
+            "words": [
+                {
+                    "text": self.words[i],
+                    "box": [round(float(v), 2) for v in self.boxes[i]],
+                    "conf": round(float(self.conf[i]), 3),
+                    "line": int(self.line[i]),
+                    "start": int(self.start[i]),
+                    "end": int(self.end[i]),
+                }
+                for i in indices
+            ],
+        }
+
+
+class LayoutBuilder:
+    """Accumulates per-page boxes while the document text is assembled."""
+
+    def __init__(self, unit: str, separator: str = "\n\n") -> None:
+        self.unit = unit
+        self.separator = separator
+        self._offset = 0
+        self._page_sizes: list[tuple[float, float]] = []
+        self._pages: list[np.ndarray] = []
+        self._boxes: list[WordBoxes] = []
+        self._starts: list[np.ndarray] = []
+
+    def add_page(self, width: float, height: float, chunk: str | None, boxes: WordBoxes) -> None:
+        """Register a page; ``chunk`` is the text appended to the document for it."""
+
+        page_index = len(self._page_sizes)
+        self._page_sizes.append((width, height))
+        starts = np.full(len(boxes), -1, dtype=np.int64)
+        if chunk:
+            cursor = 0
+            for index, word in enumerate(boxes.words):
+                found = chunk.find(word, cursor)
+                if found >= 0:
+                    starts[index] = self._offset + found
+                    cursor = found + len(word)
+            self._offset += len(chunk) + len(self.separator)
+        self._pages.append(np.full(len(boxes), page_index, dtype=np.uint16))
+        self._boxes.append(boxes)
+        self._starts.append(starts)
+
+    def build(self) -> DocumentLayout | None:
+        if not self._page_sizes:
+            return None
+        merged = WordBoxes.concat(self._boxes)
+        start = np.concatenate(self._starts) if self._starts else np.zeros(0, dtype=np.int64)
+        lengths = np.asarray([len(word) for word in merged.words], dtype=np.int64)
+        end = np.where(start >= 0, start + lengths, -1)
+        return DocumentLayout(
+            unit=self.unit,
+            page_sizes=np.asarray(self._page_sizes, dtype=np.float32).reshape(-1, 2),
+            page=np.concatenate(self._pages),
+            boxes=merged.boxes,
+            conf=merged.conf,
+            line=merged.line,
+            start=start,
+            end=end,
+            words=merged.words,
+        )
@@ -0,0 +1,302 @@
+"""Line-item tables of invoices from word positions, or from row text for DOCX."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import numpy as np
+
+from .layout import DocumentLayout
+from .local_extraction import AMOUNT_LABELS, parse_amount
+
+# Checked in order, so "prix unitaire" is a unit price and "prix total" an amount.
+HEADER_TERMS = (
+    ("unit_price", re.compile(r"\bp\.?\s?u\b\.?|unit|unitaire|\brate\b|tarif", re.IGNORECASE)),
+    ("quantity", re.compile(r"\bqt[ée]s?\b|quantit|\bqty\b|\bnb\b|nombre", re.IGNORECASE)),
+    ("vat_rate", re.compile(r"\bt\.?v\.?a\.?\b|\bvat\b|\btax\b|\btaxe\b", re.IGNORECASE)),
+    ("amount", re.compile(r"montant|total|amount|\bprix\b|price", re.IGNORECASE)),
+    (
+        "description",
+        re.compile(
+            r"d[ée]signation|description|libell[ée]|article|produit|prestation|\bitem\b"
+            r"|d[ée]tail|service",
+            re.IGNORECASE,
+        ),
+    ),
+)
+NUMERIC_COLUMNS = ("quantity", "unit_price", "vat_rate", "amount")
+TEXT_CELL_SPLIT = re.compile(r"\s+\|\s+|\t+|\s{2,}")
+NUMBER_NOISE = re.compile(r"[%€$£]|\bEUR\b|\bUSD\b|\bGBP\b|\bCHF\b|\bHT\b|\bTTC\b", re.IGNORECASE)
+
+
+def header_column(cell: str) -> str | None:
+    for name, pattern in HEADER_TERMS:
+        if pattern.search(cell):
+            return name
+    return None
+
+
+def parse_number(cell: str) -> float | None:
+    """Quantity, price, rate or amount in a cell; None when the cell is not a number."""
+
+    cleaned = NUMBER_NOISE.sub("", cell).strip()
+    if not cleaned or not re.fullmatch(r"-?[\d\s  .,']+", cleaned):
+        return None
+    negative = cleaned.startswith("-")
+    value = parse_amount(cleaned.lstrip("-"))
+    return -value if negative and value is not None else value
+
+
+def is_totals_row(text: str) -> bool:
+    return any(label.search(text) for _, label, _ in AMOUNT_LABELS)
+
+
+@dataclass
+class LineItem:
+    """One invoice line; any numeric column may be missing."""
+
+    description: str | None = None
+    quantity: float | None = None
+    unit_price: float | None = None
+    vat_rate: float | None = None
+    amount: float | None = None
+    page: int | None = None
+
+    def complete(self, tolerance: float) -> bool:
+        """Fill the amount from quantity × unit price; False when the three disagree."""
+
+        if self.quantity is None or self.unit_price is None:
+            return True
+        expected = round(self.quantity * self.unit_price, 2)
+        if self.amount is None:
+            self.amount = expected
+            return True
+        return abs(expected - self.amount) <= max(tolerance, abs(self.amount) * 0.005)
+
+
+@dataclass
+class LineItemTable:
+    """Extracted items and how they reconcile with the invoice totals."""
+
+    items: list[LineItem] = field(default_factory=list)
+    inconsistent_rows: int = 0
+
+    @property
+    def total(self) -> float | None:
+        amounts = [item.amount for item in self.items if item.amount is not None]
+        return round(sum(amounts), 2) if amounts else None
+
+    def to_payload(self) -> list[dict[str, Any]]:
+        return [asdict(item) for item in self.items]
+
+    def reconcile(self, payload: dict[str, Any], tolerance: float = 0.02) -> float:
+        """Confidence for the items: 1.0 when they sum to ``amount_ht`` (or ``amount_ttc``
+        for tax-inclusive lines), lower when rows or the sum disagree."""
+
+        total = self.total
+        if total is None:
+            return 0.3
+        matches = False
+        for name in ("amount_ht", "amount_ttc"):
+            expected = payload.get(name)
+            if isinstance(expected, (int, float)) and abs(total - expected) <= max(
+                tolerance, abs(expected) * 0.005
+            ):
+                matches = True
+                break
+        score = 1.0 if matches else 0.5
+        if self.inconsistent_rows:
+            score -= 0.2 * self.inconsistent_rows / len(self.items)
+        return round(max(score, 0.0), 3)
+
+
+def _nearest_column(
+    x0: float, x1: float, columns: list[tuple[str | None, float, float]]
+) -> str | None:
+    """Header column a cell belongs to: the one it overlaps most, else the one whose
+    left edge, right edge or centre it lines up with (text left-, numbers right-aligned)."""
+
+    overlaps = [min(x1, right) - max(x0, left) for _, left, right in columns]
+    best = max(range(len(columns)), key=overlaps.__getitem__)
+    if overlaps[best] > 0:
+        return columns[best][0]
+    center = (x0 + x1) / 2
+
+    def misalignment(column: tuple[str | None, float, float]) -> float:
+        _, left, right = column
+        return min(abs(x0 - left), abs(x1 - right), abs(center - (left + right) / 2))
+
+    return min(columns, key=misalignment)[0]
+
+
+@dataclass
+class _Row:
+    page: int
+    top: float
+    bottom: float
+    cells: list[tuple[float, float, str]]
+
+    @property
+    def text(self) -> str:
+        return " ".join(text for _, _, text in self.cells)
+
+
+class LineItemExtractor:
+    """Finds item tables under a recognised header row and reads one item per row.
+
+    With a layout, words are grouped into visual rows and assigned to the
+    header's columns by position (PyMuPDF points or OCR pixels alike). Without
+    one, rows are text lines whose cells are separated by ``|``, tabs or
+    runs of spaces. Rows without numbers continue the previous description;
+    a totals label or a large vertical gap ends the table.
+    """
+
+    def __init__(self, tolerance: float = 0.02) -> None:
+        self.tolerance = tolerance
+
+    def extract(self, layout: DocumentLayout | None, text: str = "") -> LineItemTable:
+        table = LineItemTable()
+        if layout is not None and len(layout.words):
+            for page in range(layout.page_count):
+                self._read_rows(table, self._layout_rows(layout, page), positional=True)
+        if not table.items and text:
+            self._read_rows(table, self._text_rows(text), positional=False)
+        return table
+
+    @staticmethod
+    def _layout_rows(layout: DocumentLayout, page: int) -> list[_Row]:
+        indices = np.flatnonzero(layout.page == page)
+        if not len(indices):
+            return []
+        boxes = layout.boxes[indices]
+        heights = boxes[:, 3] - boxes[:, 1]
+        glyph = float(np.median(heights)) or 1.0
+        centers = (boxes[:, 1] + boxes[:, 3]) / 2
+        rows: list[list[int]] = []
+        row_center = None
+        for position in np.argsort(centers, kind="stable"):
+            if row_center is None or centers[position] - row_center > glyph * 0.5:
+                rows.append([])
+            rows[-1].append(int(position))
+            row_center = float(np.mean(centers[rows[-1]]))
+
+        result = []
+        for members in rows:
+            members.sort(key=lambda position: boxes[position, 0])
+            cells: list[tuple[float, float, str]] = []
+            for position in members:
+                x0, _, x1, _ = (float(value) for value in boxes[position])
+                word = layout.words[indices[position]]
+                # Gaps wider than about an em separate cells; word spaces are narrower.
+                if cells and x0 - cells[-1][1] <= glyph * 0.8:
+                    start, _, joined = cells[-1]
+                    cells[-1] = (start, x1, f"{joined} {word}")
+                else:
+                    cells.append((x0, x1, word))
+            result.append(
+                _Row(
+                    page=page,
+                    top=float(boxes[members, 1].min()),
+                    bottom=float(boxes[members, 3].max()),
+                    cells=cells,
+                )
+            )
+        return result
+
+    @staticmethod
+    def _text_rows(text: str) -> list[_Row]:
+        rows = []
+        for number, line in enumerate(text.splitlines()):
+            cells = [cell.strip() for cell in TEXT_CELL_SPLIT.split(line.strip()) if cell.strip()]
+            if cells:
+                positions = [(float(index), float(index), cell) for index, cell in enumerate(cells)]
+                rows.append(_Row(page=0, top=float(number), bottom=number + 1.0, cells=positions))
+        return rows
+
+    def _read_rows(self, table: LineItemTable, rows: list[_Row], positional: bool) -> None:
+        columns: list[tuple[str | None, float, float]] | None = None
+        previous: _Row | None = None
+        for row in rows:
+            header = self._header(row, positional)
+            if header is not None:
+                columns, previous = header, row
+                continue
+            if columns is None or previous is None:
+                continue
+            pitch = row.bottom - row.top
+            # Without positions a lone text line is prose after the table, not a wrapped cell.
+            prose = not positional and len(row.cells) == 1
+            if prose or is_totals_row(row.text) or row.top - previous.bottom > max(pitch, 1.0) * 3:
+                columns = None
+                continue
+            values = self._assign(row, columns, positional)
+            self._add_row(table, values, row.page)
+            previous = row
+
+    @staticmethod
+    def _header(row: _Row, positional: bool) -> list[tuple[str | None, float, float]] | None:
+        """Column names with their header spans, when the row is an item header."""
+
+        names = [header_column(text) for _, _, text in row.cells]
+        if "description" not in names or not {"amount", "unit_price"} & set(names):
+            return None
+        if len(row.cells) < 3 or any(parse_number(text) is not None for _, _, text in row.cells):
+            return None
+        return [(name, x0, x1) for name, (x0, x1, _) in zip(names, row.cells)]
+
+    @staticmethod
+    def _assign(
+        row: _Row, columns: list[tuple[str | None, float, float]], positional: bool
+    ) -> dict[str, str]:
+        values: dict[str, str] = {}
+
+        def put(name: str | None, text: str) -> None:
+            if name is not None:
+                values[name] = f"{values[name]} {text}" if name in values else text
+
+        if positional:
+            for x0, x1, text in row.cells:
+                put(_nearest_column(x0, x1, columns), text)
+            return values
+
+        cells = [text for _, _, text in row.cells]
+        if len(cells) == len(columns):
+            for (name, _, _), text in zip(columns, cells):
+                put(name, text)
+            return values
+        # Empty cells were dropped: right-align numbers to the numeric columns,
+        # everything before them is the description.
+        numeric = [name for name, _, _ in columns if name in NUMERIC_COLUMNS]
+        trailing: list[str] = []
+        while cells and parse_number(cells[-1]) is not None and len(trailing) < len(numeric):
+            trailing.insert(0, cells.pop())
+        for name, text in zip(numeric[len(numeric) - len(trailing) :], trailing):
+            put(name, text)
+        if cells:
+            put("description", " ".join(cells))
+        return values
+
+    def _add_row(self, table: LineItemTable, values: dict[str, str], page: int) -> None:
+        numbers = {
+            name: parse_number(values[name]) for name in NUMERIC_COLUMNS if name in values
+        }
+        description = values.get("description")
+        if not any(value is not None for value in numbers.values()):
+            # A wrapped description line belongs to the item above.
+            if description and table.items:
+                item = table.items[-1]
+                item.description = f"{item.description or ''} {description}".strip()
+            return
+        item = LineItem(
+            description=description,
+            quantity=numbers.get("quantity"),
+            unit_price=numbers.get("unit_price"),
+            vat_rate=numbers.get("vat_rate"),
+            amount=numbers.get("amount"),
+            page=page + 1,
+        )
+        if not item.complete(self.tolerance):
+            table.inconsistent_rows += 1
+        table.items.append(item)
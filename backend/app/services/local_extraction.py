@@ -0,0 +1,304 @@
+"""Rule-based extraction of invoice header fields from French/English text."""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+INVOICE_FIELDS = ("invoice_number", "date", "amount_ht", "tva", "amount_ttc")
+
+MONTHS = {
+    "janvier": 1, "février": 2, "fevrier": 2, "mars": 3, "avril": 4, "mai": 5, "juin": 6,
+    "juillet": 7, "août": 8, "aout": 8, "septembre": 9, "octobre": 10, "novembre": 11,
+    "décembre": 12, "decembre": 12,
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6, "july": 7,
+    "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+}
+_MONTH_NAMES = "|".join(sorted(MONTHS, key=len, reverse=True))
+
+DATE_PATTERN = re.compile(
+    rf"""
+    (?P<iso>(?P<iy>\d{{4}})-(?P<im>\d{{1,2}})-(?P<id>\d{{1,2}}))
+    | (?P<num>(?P<n1>\d{{1,2}})[/.\-](?P<n2>\d{{1,2}})[/.\-](?P<ny>\d{{4}}|\d{{2}}))
+    | (?P<dmy>(?P<td>\d{{1,2}})(?:er)?\s+(?P<tm>{_MONTH_NAMES})\.?\s+(?P<ty>\d{{4}}))
+    | (?P<mdy>(?P<em>{_MONTH_NAMES})\.?\s+(?P<ed>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<ey>\d{{4}}))
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+DATE_LABEL = re.compile(
+    r"(?<!due\s)(?<!expiry\s)\b(?:invoice\s+date|date\s+(?:de\s+(?:la\s+)?facture|d'[ée]mission|"
+    r"of\s+issue|facture)|date|issued(?:\s+on)?|[ée]mise?\s+le)\s*[:\-]?\s*(?:le\s+|du\s+)?$",
+    re.IGNORECASE,
+)
+
+AMOUNT_PATTERN = re.compile(
+    r"(?<![\w.,])(?:\d{1,3}(?:[ \u00a0\u202f.,']\d{3})+(?:[.,]\d{1,2})?"
+    r"|\d+(?:[.,]\d{1,2})?)(?![\d])"
+)
+INVOICE_NUMBER_PATTERNS = (
+    (
+        re.compile(
+            r"(?:\bn[°o]\.?|\bnum[ée]ro)\s*(?:de\s+)?facture\s*[:#]?\s*"
+            r"(?P<value>[A-Z0-9][A-Z0-9\-/_.]*)",
+            re.IGNORECASE,
+        ),
+        0.9,
+    ),
+    (
+        re.compile(
+            r"\b(?:facture|invoice)\s*(?:n[°o]\.?|num[ée]ro|number|no\.?|#)\s*[:#]?\s*"
+            r"(?P<value>[A-Z0-9][A-Z0-9\-/_.]*)",
+            re.IGNORECASE,
+        ),
+        0.9,
+    ),
+    (
+        re.compile(
+            r"\b(?:facture|invoice)\s*[:#]?\s*(?P<value>[A-Z0-9][A-Z0-9\-/_.]*)", re.IGNORECASE
+        ),
+        0.75,
+    ),
+)
+
+# Checked in order; a line is attributed to the first matching amount field.
+AMOUNT_LABELS = (
+    (
+        "amount_ttc",
+        re.compile(
+            r"\b(?:montant|total|prix)\s*t\.?\s*t\.?\s*c\.?(?!\w)|\bnet\s+[àa]\s+payer\b"
+            r"|\btotal\s+[àa]\s+payer\b|\btotal\s+(?:due|amount|incl\.?(?:uding)?\s+(?:vat|tax))\b"
+            r"|\bamount\s+due\b|\bgrand\s+total\b|\bbalance\s+due\b",
+            re.IGNORECASE,
+        ),
+        0.85,
+    ),
+    (
+        "amount_ht",
+        re.compile(
+            r"\b(?:montant|total|prix)\s*h\.?\s*t\.?(?!\w)|\bsous[- ]total\b|\bsubtotal\b"
+            r"|\bnet\s+amount\b|\btotal\s+(?:excl\.?|excluding|before)\s+(?:vat|tax)\b",
+            re.IGNORECASE,
+        ),
+        0.85,
+    ),
+    (
+        "tva",
+        re.compile(
+            r"\b(?:total\s+|montant\s+)?t\.?v\.?a\.?(?!\w)|\bvat\b|\b(?:sales\s+)?tax\b",
+            re.IGNORECASE,
+        ),
+        0.85,
+    ),
+    ("amount_ttc", re.compile(r"^\s*total\b", re.IGNORECASE), 0.6),
+)
+CURRENCY_PATTERN = re.compile(r"€|\bEUR\b|\$|\bUSD\b|£|\bGBP\b|\bCHF\b")
+CURRENCY_CODES = {
+    "€": "EUR",
+    "EUR": "EUR",
+    "$": "USD",
+    "USD": "USD",
+    "£": "GBP",
+    "GBP": "GBP",
+    "CHF": "CHF",
+}
+
+
+def parse_amount(raw: str) -> float | None:
+    """Parse '1 234,56', '1.234,56', '1,234.56' or '1234.5' into a float."""
+
+    cleaned = re.sub(r"[\s'€$£]|EUR|USD|GBP|CHF", "", raw.strip())
+    if not cleaned:
+        return None
+    decimal_match = re.search(r"[.,](\d{1,2})$", cleaned)
+    if decimal_match:
+        integer_part = re.sub(r"[.,]", "", cleaned[: decimal_match.start()])
+        cleaned = f"{integer_part}.{decimal_match.group(1)}"
+    else:
+        cleaned = re.sub(r"[.,]", "", cleaned)
+    try:
+        return float(cleaned)
+    except ValueError:
+        return None
+
+
+def normalize_date(raw: str, day_first: bool = True) -> str | None:
+    """Normalize a French or English date string to ISO ``YYYY-MM-DD``."""
+
+    match = DATE_PATTERN.search(raw)
+    return date_from_match(match, day_first) if match else None
+
+
+def date_from_match(match: re.Match[str], day_first: bool = True) -> str | None:
+    try:
+        if match.group("iso"):
+            year, month, day = int(match["iy"]), int(match["im"]), int(match["id"])
+        elif match.group("num"):
+            first, second, year = int(match["n1"]), int(match["n2"]), int(match["ny"])
+            if year < 100:
+                year += 2000
+            if first > 12 or (day_first and second <= 12):
+                day, month = first, second
+            else:
+                month, day = first, second
+        elif match.group("dmy"):
+            day, month, year = int(match["td"]), MONTHS[match["tm"].lower()], int(match["ty"])
+        else:
+            month, day, year = MONTHS[match["em"].lower()], int(match["ed"]), int(match["ey"])
+        return date(year, month, day).isoformat()
+    except (KeyError, ValueError):
+        return None
+
+
+@dataclass
+class FieldMatch:
+    """A locally extracted value with its confidence and source span."""
+
+    value: Any
+    confidence: float
+    span: tuple[int, int] | None = None
+
+
+@dataclass
+class LocalExtraction:
+    """Fields resolved by the rule engine."""
+
+    fields: dict[str, FieldMatch] = field(default_factory=dict)
+
+    def values(self, threshold: float = 0.0) -> dict[str, Any]:
+        return {
+            name: match.value
+            for name, match in self.fields.items()
+            if match.confidence >= threshold
+        }
+
+    def unresolved(self, required: tuple[str, ...] | list[str], threshold: float) -> list[str]:
+        return [
+            name
+            for name in required
+            if name not in self.fields or self.fields[name].confidence < threshold
+        ]
+
+    def confidence(self, names: tuple[str, ...] | list[str]) -> float:
+        scores = [self.fields[name].confidence for name in names if name in self.fields]
+        return min(scores) if scores else 0.0
+
+
+class LocalInvoiceExtractor:
+    """Deterministic regex rules for standard invoice headers and totals."""
+
+    def __init__(self, day_first: bool = True, tolerance: float = 0.02) -> None:
+        self.day_first = day_first
+        self.tolerance = tolerance
+
+    def extract(self, text: str) -> LocalExtraction:
+        result = LocalExtraction()
+        for name, match in (
+            ("invoice_number", self._invoice_number(text)),
+            ("date", self._date(text)),
+            ("currency", self._currency(text)),
+        ):
+            if match is not None:
+                result.fields[name] = match
+        result.fields.update(self._amounts(text))
+        self._cross_check(result)
+        return result
+
+    def _invoice_number(self, text: str) -> FieldMatch | None:
+        for pattern, confidence in INVOICE_NUMBER_PATTERNS:
+            for match in pattern.finditer(text):
+                value = match.group("value").rstrip(".-/")
+                if any(char.isdigit() for char in value) and not DATE_PATTERN.fullmatch(value):
+                    return FieldMatch(value, confidence, match.span("value"))
+        return None
+
+    def _date(self, text: str) -> FieldMatch | None:
+        first: FieldMatch | None = None
+        for match in DATE_PATTERN.finditer(text):
+            iso = date_from_match(match, self.day_first)
+            if iso is None:
+                continue
+            line_start = text.rfind("\n", 0, match.start()) + 1
+            if DATE_LABEL.search(text[line_start : match.start()]):
+                return FieldMatch(iso, 0.9, match.span())
+            if first is None:
+                first = FieldMatch(iso, 0.6, match.span())
+        return first
+
+    def _currency(self, text: str) -> FieldMatch | None:
+        counts = Counter(CURRENCY_CODES[token] for token in CURRENCY_PATTERN.findall(text))
+        if not counts:
+            return None
+        code, _ = counts.most_common(1)[0]
+        return FieldMatch(code, 0.9)
+
+    def _amounts(self, text: str) -> dict[str, FieldMatch]:
+        found: dict[str, list[FieldMatch]] = {}
+        lines = text.splitlines(keepends=True)
+        offset = 0
+        offsets = []
+        for line in lines:
+            offsets.append(offset)
+            offset += len(line)
+
+        for index, line in enumerate(lines):
+            for name, label, confidence in AMOUNT_LABELS:
+                label_match = label.search(line)
+                if not label_match:
+                    continue
+                amount = self._last_amount(line, label_match.end(), offsets[index])
+                if amount is None and index + 1 < len(lines) and not any(
+                    other.search(lines[index + 1]) for _, other, _ in AMOUNT_LABELS
+                ):
+                    # Label and value split over two lines (table layouts).
+                    amount = self._last_amount(lines[index + 1], 0, offsets[index + 1])
+                if amount is not None:
+                    value, span = amount
+                    found.setdefault(name, []).append(FieldMatch(value, confidence, span))
+                break
+
+        resolved: dict[str, FieldMatch] = {}
+        for name, matches in found.items():
+            best = max(matches, key=lambda item: item.confidence)
+            # Grand totals usually come last; take the last of the best-labelled hits.
+            candidates = [item for item in matches if item.confidence == best.confidence]
+            chosen = candidates[-1]
+            if len({item.value for item in candidates}) > 1:
+                chosen = FieldMatch(chosen.value, min(chosen.confidence, 0.7), chosen.span)
+            resolved[name] = chosen
+        return resolved
+
+    @staticmethod
+    def _last_amount(line: str, start: int, base: int) -> tuple[float, tuple[int, int]] | None:
+        last = None
+        for match in AMOUNT_PATTERN.finditer(line, start):
+            if line[match.end() :].lstrip().startswith("%"):
+                continue
+            value = parse_amount(match.group(0))
+            if value is not None:
+                last = (value, (base + match.start(), base + match.end()))
+        return last
+
+    def _cross_check(self, result: LocalExtraction) -> None:
+        """Use VAT arithmetic to confirm or derive the three amounts."""
+
+        fields = result.fields
+        ht, tva, ttc = (fields.get(name) for name in ("amount_ht", "tva", "amount_ttc"))
+        if ht and tva and ttc:
+            if self._close(ht.value + tva.value, ttc.value):
+                for match in (ht, tva, ttc):
+                    match.confidence = max(match.confidence, 0.97)
+            else:
+                for match in (ht, tva, ttc):
+                    match.confidence = min(match.confidence, 0.5)
+        elif ht and ttc and ttc.value >= ht.value:
+            fields["tva"] = FieldMatch(round(ttc.value - ht.value, 2), 0.8)
+        elif ht and tva:
+            fields["amount_ttc"] = FieldMatch(round(ht.value + tva.value, 2), 0.8)
+        elif tva and ttc and ttc.value >= tva.value:
+            fields["amount_ht"] = FieldMatch(round(ttc.value - tva.value, 2), 0.8)
+
+    def _close(self, left: float, right: float) -> bool:
+        return abs(left - right) <= max(self.tolerance, abs(right) * 0.005)
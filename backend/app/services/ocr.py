@@ -12,16 +12,18 @@ import numpy as np
 import pytesseract
 
 from ..core.config import settings
+from .layout import WordBoxes
 
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class OCRLine:
-    """Represents a single OCR line and confidence."""
+    """Represents a single OCR word, its confidence and pixel box."""
 
     text: str
     confidence: float
+    box: tuple[float, float, float, float] | None = None
 
 
 @dataclass
@@ -30,6 +32,7 @@ class OCRResult:
 
     text: str
     lines: list[OCRLine]
+    words: WordBoxes | None = None
 
 
 class OCRService:
@@ -48,20 +51,15 @@ class OCRService:
             "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
             "ÀÂÆÇÉÈÊËÏÎÔŒÙÛÜŸàâæçéèêëïîôœùûüÿ.,/-"
         )
-        text = pytesseract.image_to_string(image, lang=settings.ocr_languages, config=config)
         data = pytesseract.image_to_data(
             image,
             lang=settings.ocr_languages,
             config=config,
             output_type=pytesseract.Output.DICT,
         )
-        lines: list[OCRLine] = []
-        for text_line, conf in zip(data["text"], data["conf"]):
-            if text_line.strip():
-                try:
-                    confidence = float(conf) / 100 if int(conf) >= 0 else 0.0
-                except ValueError:
-                    confidence = 0.0
-                lines.append(OCRLine(text=text_line.strip(), confidence=confidence))
-        return OCRResult(text=text.strip(), lines=lines)
-
+        words, text = WordBoxes.from_tesseract(data)
+        lines = [
+            OCRLine(text=word, confidence=float(conf), box=tuple(float(v) for v in box))
+            for word, conf, box in zip(words.words, words.conf, words.boxes)
+        ]
+        return OCRResult(text=text.strip(), lines=lines, words=words)
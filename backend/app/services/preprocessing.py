@@ -4,13 +4,14 @@ from __future__ import annotations
 
 import io
 from dataclasses import dataclass
-from pathlib import Path
 
 import cv2
+import fitz  # PyMuPDF
 import numpy as np
-from pdf2image import convert_from_bytes, convert_from_path
 from PIL import Image
 
+from .rasterize import pixmap_array, render_page
+
 
 @dataclass
 class PreprocessResult:
@@ -33,11 +34,9 @@ class PreprocessingService:
         """Convert file bytes to an OpenCV image."""
 
         if mime_type == "application/pdf":
-            images = convert_from_bytes(file_bytes)
-            with io.BytesIO() as buffer:
-                images[0].save(buffer, format="PNG")
-                buffer.seek(0)
-                return self.load_bytes(buffer.read(), "image/png")
+            with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+                pix = render_page(doc[0], gray=False)
+                return cv2.cvtColor(pixmap_array(pix), cv2.COLOR_RGB2BGR)
         pil_image = Image.open(io.BytesIO(file_bytes)).convert("RGB")
         return cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
 
@@ -0,0 +1,101 @@
+"""Zero-copy image handoff between PyMuPDF, NumPy and Tesseract."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import fitz  # PyMuPDF
+import numpy as np
+import pytesseract
+from PIL import Image
+
+from ..core.config import settings
+from .layout import WordBoxes
+
+
+def render_page(page: fitz.Page, dpi: int | None = None, gray: bool = True) -> fitz.Pixmap:
+    """Rasterize a page straight into a (grayscale) pixmap without alpha."""
+
+    zoom = (dpi or settings.ocr_render_dpi) / 72
+    colorspace = fitz.csGRAY if gray else fitz.csRGB
+    return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=colorspace, alpha=False)
+
+
+def image_pixmap(doc: fitz.Document, xref: int) -> fitz.Pixmap:
+    """Decode an embedded image once into a grayscale pixmap without alpha."""
+
+    pix = fitz.Pixmap(doc, xref)
+    if pix.alpha:
+        pix = fitz.Pixmap(pix, 0)
+    if pix.n != 1:
+        pix = fitz.Pixmap(fitz.csGRAY, pix)
+    return pix
+
+
+def pixmap_array(pix: fitz.Pixmap) -> np.ndarray:
+    """View pixmap samples as an ``(h, w)`` or ``(h, w, n)`` uint8 array.
+
+    The array shares memory with the pixmap, which must outlive it.
+    """
+
+    rows = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride)
+    array = rows[:, : pix.width * pix.n]
+    if pix.n == 1:
+        return array
+    return array.reshape(pix.height, pix.width, pix.n)
+
+
+@contextmanager
+def pnm_file(array: np.ndarray) -> Iterator[str]:
+    """Expose a uint8 gray/RGB array to Tesseract as an uncompressed PNM file.
+
+    Writing a header plus the raw buffer avoids the PNG encode pytesseract
+    performs for in-memory images.
+    """
+
+    height, width = array.shape[:2]
+    channels = 1 if array.ndim == 2 else array.shape[2]
+    magic = b"P5" if channels == 1 else b"P6"
+    handle = tempfile.NamedTemporaryFile(suffix=".pgm" if channels == 1 else ".ppm", delete=False)
+    try:
+        with handle:
+            handle.write(b"%s\n%d %d\n255\n" % (magic, width, height))
+            handle.write(np.ascontiguousarray(array).data)
+        yield handle.name
+    finally:
+        os.unlink(handle.name)
+
+
+def ocr_array(
+    array: np.ndarray, lang: str | None = None, config: str = ""
+) -> tuple[str, WordBoxes]:
+    """Run Tesseract once on a uint8 array, returning text and word boxes in pixels."""
+
+    with pnm_file(array) as path:
+        data = pytesseract.image_to_data(
+            path,
+            lang=lang or settings.ocr_languages or "eng",
+            config=config,
+            output_type=pytesseract.Output.DICT,
+        )
+    boxes, text = WordBoxes.from_tesseract(data)
+    return text.strip(), boxes
+
+
+def ocr_pixmap(
+    pix: fitz.Pixmap, lang: str | None = None, config: str = ""
+) -> tuple[str, WordBoxes]:
+    """Run Tesseract directly on pixmap samples."""
+
+    return ocr_array(pixmap_array(pix), lang=lang, config=config)
+
+
+def pil_to_gray_array(image: Image.Image) -> np.ndarray:
+    """Convert a PIL image to a grayscale uint8 array for OCR."""
+
+    if image.mode != "L":
+        image = image.convert("L")
+    return np.asarray(image)
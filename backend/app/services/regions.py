@@ -0,0 +1,248 @@
+"""Region-of-interest OCR: segment scanned pages into blocks, read valuable ones first."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import fitz  # PyMuPDF
+import numpy as np
+from PIL import Image
+
+from ..core.config import settings
+from .languages import page_languages
+from .layout import LayoutBuilder, WordBoxes
+from .rasterize import ocr_array, pil_to_gray_array, pixmap_array
+from .resolution import choose_scale, estimate_text_height, render_for_ocr, rescale
+from .text_extraction import ExtractedText, page_text_layer
+
+logger = logging.getLogger(__name__)
+
+OcrFunction = Callable[[np.ndarray], tuple[str, WordBoxes]]
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".tiff"}
+
+
+@dataclass
+class Region:
+    """A text block in page pixels with its field-likelihood score."""
+
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    score: float = 0.0
+
+
+def detect_regions(gray: np.ndarray, text_height: float | None = None) -> list[Region]:
+    """Text blocks found by closing glyphs into lines and lines into paragraphs.
+
+    Kernels are sized from the glyph height so the same parameters work at
+    any resolution. Regions come back in reading order.
+    """
+
+    height, width = gray.shape
+    glyph = text_height or estimate_text_height(gray) or max(height, width) / 100
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    # Words into lines (gaps under ~2 glyphs), lines into blocks (leading under ~1.8 glyphs).
+    line_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(int(glyph * 2), 3), 1))
+    block_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(int(glyph * 1.8), 3)))
+    merged = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, line_kernel)
+    merged = cv2.morphologyEx(merged, cv2.MORPH_CLOSE, block_kernel)
+    contours, _ = cv2.findContours(merged, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    pad = max(int(glyph * 0.4), 2)
+    regions = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if h < glyph * 0.6 or w < glyph or (w > width * 0.9 and h < glyph * 0.5):
+            continue
+        x0, y0 = max(x - pad, 0), max(y - pad, 0)
+        regions.append(Region(x0, y0, min(x + w + pad, width), min(y + h + pad, height)))
+    regions.sort(key=lambda region: (region.y0 // max(int(glyph), 1), region.x0))
+    return regions
+
+
+def rank_regions(
+    regions: list[Region], width: int, height: int, page_index: int, page_count: int
+) -> list[Region]:
+    """Score regions by where invoice fields usually are.
+
+    Number, date and supplier sit in the header of the first page; totals
+    sit in the lower (mostly right-hand) part of the last page.
+    """
+
+    for region in regions:
+        cx = (region.x0 + region.x1) / 2 / width
+        cy = (region.y0 + region.y1) / 2 / height
+        header = (1 - cy) ** 2 if page_index == 0 else 0.0
+        totals = cy * (0.5 + 0.5 * cx) if page_index == page_count - 1 else 0.0
+        region.score = round(max(header, totals), 3)
+    return regions
+
+
+class RegionReader:
+    """Reads scanned PDFs and images region by region.
+
+    :meth:`read_priority` OCRs only regions scoring at least
+    ``ocr_region_min_score`` on the first and last pages. :meth:`read_all`
+    OCRs whatever is left and reuses what was already read. Born-digital
+    pages always use their text layer.
+    """
+
+    def __init__(
+        self, file_path: str, mime_type: str | None = None, ocr: OcrFunction | None = None
+    ) -> None:
+        self.file_path = file_path
+        # The default OCR follows the languages detected for the current page.
+        self.ocr = ocr or (lambda array: ocr_array(array, lang=self._lang, config="--psm 6"))
+        self.detect_languages = ocr is None
+        self._lang: str | None = None
+        self._languages: dict[int, str | None] = {}
+        self.is_image = Path(file_path).suffix.lower() in IMAGE_SUFFIXES or bool(
+            mime_type and mime_type.startswith("image/")
+        )
+        self._regions: dict[int, list[Region]] = {}
+        self._results: dict[tuple[int, int], tuple[str, WordBoxes]] = {}
+        self.ocr_runs = 0
+        self.deferred = 0
+
+    @classmethod
+    def applies(cls, file_path: str, mime_type: str | None = None) -> bool:
+        """True for images and PDFs with at least one page that needs OCR."""
+
+        suffix = Path(file_path).suffix.lower()
+        if suffix in IMAGE_SUFFIXES or (mime_type or "").startswith("image/"):
+            return True
+        if suffix != ".pdf" and mime_type != "application/pdf":
+            return False
+        try:
+            with fitz.open(file_path) as doc:
+                return any(page_text_layer(page) is None for page in doc)
+        except Exception:  # noqa: BLE001
+            return False
+
+    def read_priority(self) -> ExtractedText:
+        return self._read(settings.ocr_region_min_score)
+
+    def read_all(self) -> ExtractedText:
+        return self._read(None)
+
+    def _read(self, min_score: float | None) -> ExtractedText:
+        self.deferred = 0
+        if self.is_image:
+            with Image.open(self.file_path) as image:
+                gray = pil_to_gray_array(image)
+            decision = choose_scale(gray)
+            text, words = self._read_page(
+                0, 1, rescale(gray, decision.scale), min_score, 1 / decision.scale
+            )
+            layout = LayoutBuilder(unit="px")
+            layout.add_page(gray.shape[1], gray.shape[0], text, words)
+            return self._finish([text], layout, [self._block_starts(0)], min_score)
+
+        chunks: list[str] = []
+        starts: list[list[int]] = []
+        layout = LayoutBuilder(unit="pt")
+        with fitz.open(self.file_path) as doc:
+            last = doc.page_count - 1
+            for index, page in enumerate(doc):
+                width, height = page.rect.width, page.rect.height
+                text_layer = page_text_layer(page)
+                if text_layer is not None:
+                    joined, block_starts = text_layer
+                    words = WordBoxes.from_pymupdf(page.get_text("words"))
+                    text, page_starts = joined, block_starts
+                    layout.add_page(width, height, joined.strip(), words)
+                elif min_score is not None and index not in (0, last):
+                    # Middle pages (line items, terms) wait for the full pass.
+                    self.deferred += 1
+                    text, page_starts = "", [0]
+                    layout.add_page(width, height, "", WordBoxes())
+                else:
+                    pix = render_for_ocr(page)
+                    text, words = self._read_page(
+                        index, doc.page_count, pixmap_array(pix), min_score, width / pix.width
+                    )
+                    page_starts = self._block_starts(index)
+                    layout.add_page(width, height, text, words)
+                chunks.append(text)
+                starts.append(page_starts)
+        return self._finish(chunks, layout, starts, min_score)
+
+    def _read_page(
+        self,
+        index: int,
+        page_count: int,
+        gray: np.ndarray,
+        min_score: float | None,
+        scale: float,
+    ) -> tuple[str, WordBoxes]:
+        """OCR regions scoring ``min_score`` or more (all when None), best first.
+
+        Word boxes are mapped to page units by ``scale``.
+        """
+
+        regions = self._regions.get(index)
+        if regions is None:
+            height, width = gray.shape
+            regions = rank_regions(detect_regions(gray), width, height, index, page_count)
+            self._regions[index] = regions
+        if self.detect_languages and index not in self._languages:
+            self._languages[index] = page_languages(gray, f"page {index + 1}")
+        self._lang = self._languages.get(index)
+        for number in sorted(range(len(regions)), key=lambda n: regions[n].score, reverse=True):
+            region = regions[number]
+            if (index, number) in self._results:
+                continue
+            if min_score is not None and region.score < min_score:
+                self.deferred += 1
+                continue
+            try:
+                text, words = self.ocr(gray[region.y0 : region.y1, region.x0 : region.x1])
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("Region OCR failed on page %s: %s", index + 1, exc)
+                text, words = "", WordBoxes()
+            self.ocr_runs += 1
+            self._results[(index, number)] = (
+                text.strip(),
+                words.transformed(region.x0 * scale, region.y0 * scale, scale, scale),
+            )
+        done = self._page_results(index)
+        return "\n".join(text for text, _ in done if text), WordBoxes.concat(
+            [words for _, words in done]
+        )
+
+    def _page_results(self, index: int) -> list[tuple[str, WordBoxes]]:
+        """OCR'd regions of a page in reading order."""
+
+        return [
+            self._results[(index, number)]
+            for number in range(len(self._regions.get(index, ())))
+            if (index, number) in self._results
+        ]
+
+    def _block_starts(self, index: int) -> list[int]:
+        starts, position = [], 0
+        for text, _ in self._page_results(index):
+            if text:
+                starts.append(position)
+                position += len(text) + 1
+        return starts or [0]
+
+    def _finish(
+        self,
+        chunks: list[str],
+        layout: LayoutBuilder,
+        starts: list[list[int]],
+        min_score: float | None,
+    ) -> ExtractedText:
+        logger.info(
+            "%s pass on %s: %s regions OCR'd in total, %s regions/pages deferred.",
+            "Priority" if min_score is not None else "Full",
+            self.file_path,
+            self.ocr_runs,
+            self.deferred,
+        )
+        return ExtractedText.from_pages(chunks, layout.build(), starts)
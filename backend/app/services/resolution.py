@@ -0,0 +1,154 @@
+"""Pick the OCR resolution from the estimated height of the text."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+import cv2
+import fitz  # PyMuPDF
+import numpy as np
+
+from ..core.config import settings
+from .layout import WordBoxes
+from .rasterize import ocr_array, pixmap_array, render_page
+
+logger = logging.getLogger(__name__)
+
+MIN_COMPONENTS = 20
+PROBE_MAX_SIDE = 2000
+
+
+def estimate_text_height(gray: np.ndarray) -> float | None:
+    """Median height in pixels of glyph-sized connected components.
+
+    Text is assumed darker than the background (Otsu split). Returns None
+    when too few glyph-like components are found (photos, blank pages).
+    """
+
+    if gray.ndim != 2 or min(gray.shape) < 16:
+        return None
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    if count <= 1:
+        return None
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    # Drop specks, rules/table borders and blobs (images, stamps).
+    glyphs = (
+        (heights >= 3)
+        & (heights <= gray.shape[0] / 8)
+        & (widths <= heights * 4)
+        & (areas >= 4)
+        & (areas <= widths * heights * 0.95)
+    )
+    if np.count_nonzero(glyphs) < MIN_COMPONENTS:
+        return None
+    return float(np.median(heights[glyphs]))
+
+
+@dataclass
+class ScaleDecision:
+    """Chosen rescale factor and what it trades."""
+
+    scale: float
+    text_height: float | None
+    pixels_before: int
+    pixels_after: int
+
+    def log(self, source: str) -> None:
+        if self.text_height is None:
+            logger.info("%s: no text height estimate, OCR at native resolution.", source)
+            return
+        logger.info(
+            "%s: text height %.1f px -> %.1f px (scale %.2f), %d -> %d px (%.1fx fewer pixels).",
+            source,
+            self.text_height,
+            self.text_height * self.scale,
+            self.scale,
+            self.pixels_before,
+            self.pixels_after,
+            self.pixels_before / max(self.pixels_after, 1),
+        )
+
+
+def choose_scale(gray: np.ndarray, target: float | None = None) -> ScaleDecision:
+    """Scale that brings the median glyph height to ``target`` pixels.
+
+    Tesseract accuracy plateaus once glyphs are roughly 20–30 px tall while
+    its run time keeps growing with the pixel count, so larger text is
+    downscaled and very small text moderately upscaled (at most 2x).
+    """
+
+    target = target or settings.ocr_target_text_px
+    probe, probe_scale = gray, 1.0
+    if max(gray.shape) > PROBE_MAX_SIDE:
+        probe_scale = PROBE_MAX_SIDE / max(gray.shape)
+        probe = cv2.resize(gray, None, fx=probe_scale, fy=probe_scale, interpolation=cv2.INTER_AREA)
+    height = estimate_text_height(probe)
+    pixels = int(gray.shape[0] * gray.shape[1])
+    if height is None:
+        return ScaleDecision(1.0, None, pixels, pixels)
+    height /= probe_scale
+    scale = min(max(target / height, 0.2), 2.0)
+    if abs(scale - 1.0) < 0.15:
+        scale = 1.0
+    after = int(round(gray.shape[0] * scale) * round(gray.shape[1] * scale))
+    return ScaleDecision(scale, height, pixels, after)
+
+
+def rescale(gray: np.ndarray, scale: float) -> np.ndarray:
+    if scale == 1.0:
+        return gray
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+    return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+
+
+def ocr_adaptive(
+    gray: np.ndarray, source: str = "image", lang: str | None = None
+) -> tuple[str, WordBoxes]:
+    """OCR a grayscale array at its chosen scale; boxes stay in the input's pixels."""
+
+    if not settings.ocr_adaptive_resolution:
+        return ocr_array(gray, lang=lang)
+    decision = choose_scale(gray)
+    decision.log(source)
+    text, boxes = ocr_array(rescale(gray, decision.scale), lang=lang)
+    if decision.scale != 1.0:
+        boxes = boxes.transformed(0, 0, 1 / decision.scale, 1 / decision.scale)
+    return text, boxes
+
+
+def choose_page_dpi(page: fitz.Page) -> tuple[int, fitz.Pixmap | None]:
+    """DPI for OCR of a scanned page, from a probe render at ``ocr_probe_dpi``.
+
+    Returns the probe pixmap too when it is already close enough to reuse.
+    """
+
+    if not settings.ocr_adaptive_resolution:
+        return settings.ocr_render_dpi, None
+    probe_dpi = settings.ocr_probe_dpi
+    probe = render_page(page, dpi=probe_dpi)
+    height = estimate_text_height(pixmap_array(probe))
+    if height is None:
+        return settings.ocr_render_dpi, None
+    dpi = probe_dpi * settings.ocr_target_text_px / height
+    dpi = int(min(max(dpi, settings.ocr_min_dpi), settings.ocr_max_dpi))
+    logger.info(
+        "Page %s: text height %.1f px at %d DPI, OCR at %d DPI (%.1fx the pixels of %d DPI).",
+        page.number + 1,
+        height,
+        probe_dpi,
+        dpi,
+        (dpi / settings.ocr_render_dpi) ** 2,
+        settings.ocr_render_dpi,
+    )
+    if abs(dpi - probe_dpi) <= probe_dpi * 0.1:
+        return probe_dpi, probe
+    return dpi, None
+
+
+def render_for_ocr(page: fitz.Page) -> fitz.Pixmap:
+    dpi, probe = choose_page_dpi(page)
+    return probe if probe is not None else render_page(page, dpi=dpi)
@@ -0,0 +1,109 @@
+"""Optional cache of serialized document responses (in-process or Redis)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any, Protocol
+
+import redis
+
+from ..core.config import settings
+
+
+class ResponseCache(Protocol):
+    def get(self, key: str) -> dict[str, Any] | None: ...
+
+    def set(self, key: str, value: dict[str, Any]) -> None: ...
+
+    def delete(self, keys: Iterable[str]) -> None: ...
+
+
+class MemoryResponseCache:
+    """LRU with a TTL, private to one process.
+
+    Invalidations issued by Celery workers cannot reach it, so rely on the TTL
+    or use the Redis backend when workers reprocess documents.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class RedisResponseCache:
+    """Shared across API processes and workers; entries expire after the TTL.
+
+    The client is synchronous, so async code calls it through ``asyncio.to_thread``.
+    """
+
+    def __init__(self, url: str, ttl: int) -> None:
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        raw = self.client.get(key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        self.client.setex(key, self.ttl, json.dumps(value))
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if keys:
+            self.client.delete(*keys)
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache | None:
+    """Return the configured cache, or None when ``response_cache_backend`` is "none"."""
+
+    if settings.response_cache_backend == "memory":
+        return MemoryResponseCache(settings.response_cache_max_entries, settings.response_cache_ttl)
+    if settings.response_cache_backend == "redis":
+        return RedisResponseCache(settings.redis_url, settings.response_cache_ttl)
+    return None
+
+
+def document_cache_key(document_id: str) -> str:
+    return f"response:document:{document_id}"
+
+
+async def invalidate_documents(document_ids: Iterable[str]) -> None:
+    """Drop cached responses after corrections, reprocessing or archival."""
+
+    cache = get_response_cache()
+    if cache is not None:
+        keys = [document_cache_key(document_id) for document_id in document_ids]
+        await asyncio.to_thread(cache.delete, keys)
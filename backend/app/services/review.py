@@ -0,0 +1,210 @@
+"""Prioritized review worklist with claim/lease semantics."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models import Document, Extraction, ReviewItem
+from .confidence import META_FIELDS
+from .corrections import apply_correction
+from .response_cache import invalidate_documents
+
+
+def review_summary(scores: dict[str, float], threshold: float) -> tuple[float, list[str]]:
+    """Return the lowest field confidence and the fields below ``threshold``."""
+
+    fields = {key: value for key, value in scores.items() if key not in META_FIELDS}
+    if not fields:
+        return 0.0, []
+    low = sorted((key for key, value in fields.items() if value < threshold), key=fields.get)
+    return min(fields.values()), low
+
+
+class ReviewQueue:
+    """Database-backed worklist of extractions needing human review."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    def enqueue(self, document: Document, scores: dict[str, float]) -> ReviewItem | None:
+        """Add a document to the worklist if any field is below the review threshold."""
+
+        min_confidence, low_fields = review_summary(scores, settings.review_confidence_threshold)
+        if not low_fields:
+            return None
+        item = ReviewItem(
+            document_id=document.id,
+            min_confidence=min_confidence,
+            low_fields=low_fields,
+        )
+        self.session.add(item)
+        return item
+
+    async def requeue(self, document: Document, scores: dict[str, float]) -> ReviewItem | None:
+        """Like :meth:`enqueue`, for a document that may already have an item.
+
+        After reprocessing, an existing item is reset to pending with the new
+        scores, or removed when no field needs review any more.
+        """
+
+        item = await self.session.scalar(
+            select(ReviewItem).where(ReviewItem.document_id == document.id)
+        )
+        if item is None:
+            return self.enqueue(document, scores)
+        min_confidence, low_fields = review_summary(scores, settings.review_confidence_threshold)
+        if not low_fields:
+            await self.session.delete(item)
+            return None
+        item.min_confidence = min_confidence
+        item.low_fields = low_fields
+        item.status = "pending"
+        item.claimed_by = None
+        item.lease_expires_at = None
+        item.reviewed_at = None
+        item.reviewed_by = None
+        return item
+
+    @staticmethod
+    def _available(now: datetime):  # type: ignore[no-untyped-def]
+        return or_(
+            ReviewItem.status == "pending",
+            and_(ReviewItem.status == "claimed", ReviewItem.lease_expires_at < now),
+        )
+
+    def _listing(self):  # type: ignore[no-untyped-def]
+        # Explicit columns keep the potentially large OCR text out of the payload.
+        return (
+            select(
+                ReviewItem.id,
+                ReviewItem.document_id,
+                ReviewItem.min_confidence,
+                ReviewItem.low_fields,
+                ReviewItem.status,
+                ReviewItem.claimed_by,
+                ReviewItem.lease_expires_at,
+                ReviewItem.created_at,
+                Document.filename,
+                Extraction.document_type,
+                Extraction.extracted_data,
+                Extraction.confidence_scores,
+            )
+            .join(Document, Document.id == ReviewItem.document_id)
+            .join(Extraction, Extraction.document_id == ReviewItem.document_id)
+            .order_by(ReviewItem.min_confidence, ReviewItem.created_at)
+        )
+
+    async def list(self, limit: int, include_claimed: bool = False) -> list[dict[str, Any]]:
+        query = self._listing().limit(limit)
+        if include_claimed:
+            query = query.where(ReviewItem.status != "reviewed")
+        else:
+            query = query.where(self._available(datetime.utcnow()))
+        rows = await self.session.execute(query)
+        return [dict(row._mapping) for row in rows]
+
+    async def claim(self, reviewer: str, limit: int, lease_seconds: int) -> list[dict[str, Any]]:
+        """Lease the next ``limit`` items to ``reviewer``."""
+
+        now = datetime.utcnow()
+        lease = now + timedelta(seconds=lease_seconds)
+        candidates = (
+            select(ReviewItem.id)
+            .where(self._available(now))
+            .order_by(ReviewItem.min_confidence, ReviewItem.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        ids = list(await self.session.scalars(candidates))
+        if not ids:
+            return []
+        # The availability predicate is re-checked so concurrent claimers on
+        # databases without SKIP LOCKED cannot both win the same row.
+        await self.session.execute(
+            update(ReviewItem)
+            .where(ReviewItem.id.in_(ids), self._available(now))
+            .values(status="claimed", claimed_by=reviewer, lease_expires_at=lease)
+        )
+        await self.session.commit()
+        rows = await self.session.execute(
+            self._listing().where(
+                ReviewItem.id.in_(ids),
+                ReviewItem.claimed_by == reviewer,
+                ReviewItem.lease_expires_at == lease,
+            )
+        )
+        return [dict(row._mapping) for row in rows]
+
+    async def release(self, item_id: str, reviewer: str) -> bool:
+        result = await self.session.execute(
+            update(ReviewItem)
+            .where(
+                ReviewItem.id == item_id,
+                ReviewItem.status == "claimed",
+                ReviewItem.claimed_by == reviewer,
+            )
+            .values(status="pending", claimed_by=None, lease_expires_at=None)
+        )
+        await self.session.commit()
+        return bool(result.rowcount)
+
+    async def submit(self, reviewer: str, corrections: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Apply many corrections in one transaction and close their review items."""
+
+        document_ids = [item["document_id"] for item in corrections]
+        extractions = {
+            extraction.document_id: extraction
+            for extraction in await self.session.scalars(
+                select(Extraction).where(Extraction.document_id.in_(document_ids))
+            )
+        }
+        items = {
+            item.document_id: item
+            for item in await self.session.scalars(
+                select(ReviewItem).where(ReviewItem.document_id.in_(document_ids))
+            )
+        }
+        now = datetime.utcnow()
+        results = []
+        for correction in corrections:
+            document_id = correction["document_id"]
+            extraction = extractions.get(document_id)
+            item = items.get(document_id)
+            if extraction is None:
+                results.append({"document_id": document_id, "status": "not_found"})
+                continue
+            if (
+                item is not None
+                and item.status == "claimed"
+                and item.claimed_by != reviewer
+                and item.lease_expires_at
+                and item.lease_expires_at > now
+            ):
+                results.append({"document_id": document_id, "status": "conflict"})
+                continue
+            apply_correction(
+                extraction,
+                correction.get("extracted_data") or {},
+                correction.get("confidence_scores"),
+            )
+            if item is not None:
+                mark_reviewed(item, reviewer, now)
+            results.append({"document_id": document_id, "status": "ok"})
+        await self.session.commit()
+        await invalidate_documents(
+            row["document_id"] for row in results if row["status"] == "ok"
+        )
+        return results
+
+
+def mark_reviewed(item: ReviewItem, reviewer: str | None, when: datetime | None = None) -> None:
+    item.status = "reviewed"
+    item.reviewed_by = reviewer
+    item.reviewed_at = when or datetime.utcnow()
+    item.claimed_by = None
+    item.lease_expires_at = None
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import hashlib
 import shutil
 from pathlib import Path
+from typing import BinaryIO
 
 from fastapi import UploadFile
 
@@ -27,8 +29,74 @@ class StorageService:
             shutil.copyfileobj(file.file, dest)
         return destination
 
+    def save_stream(
+        self,
+        filename: str,
+        stream: BinaryIO,
+        head: bytes = b"",
+        max_bytes: int | None = None,
+        chunk_size: int = 1024 * 1024,
+        digest: hashlib._Hash | None = None,
+    ) -> tuple[Path, int] | None:
+        """Copy a stream to storage in chunks and return its path and size.
+
+        ``head`` holds bytes already consumed from the stream (e.g. for magic
+        sniffing). ``digest`` is updated with every byte written. Returns None,
+        leaving nothing behind, once ``max_bytes`` is exceeded.
+        """
+
+        destination = resolve_storage_path(self.base_dir, filename)
+        size = 0
+        with destination.open("wb") as dest:
+            chunk = head or stream.read(chunk_size)
+            while chunk:
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    break
+                dest.write(chunk)
+                if digest is not None:
+                    digest.update(chunk)
+                chunk = stream.read(chunk_size)
+        if max_bytes is not None and size > max_bytes:
+            destination.unlink(missing_ok=True)
+            return None
+        return destination, size
+
     def read_bytes(self, path: str | Path) -> bytes:
         """Return file bytes for downstream processing."""
 
         return Path(path).read_bytes()
 
+    def artifacts_dir(self, owner: str) -> Path:
+        """Directory holding auxiliary artifacts (profiles, caches) for an owner."""
+
+        return self.base_dir / "artifacts" / sanitize_filename(owner)
+
+    def save_artifact(self, owner: str, name: str, data: bytes | str) -> Path:
+        """Persist an artifact next to the document it belongs to."""
+
+        directory = self.artifacts_dir(owner)
+        directory.mkdir(parents=True, exist_ok=True)
+        destination = resolve_storage_path(directory, name)
+        if isinstance(data, str):
+            destination.write_text(data, encoding="utf-8")
+        else:
+            destination.write_bytes(data)
+        return destination
+
+    def list_artifacts(self, owner: str, prefix: str = "") -> list[str]:
+        """Return artifact names for an owner, newest first."""
+
+        directory = self.artifacts_dir(owner)
+        if not directory.is_dir():
+            return []
+        return sorted(
+            (path.name for path in directory.iterdir() if path.name.startswith(prefix)),
+            reverse=True,
+        )
+
+    def artifact_path(self, owner: str, name: str) -> Path | None:
+        """Resolve an existing artifact path, or None if it does not exist."""
+
+        path = resolve_storage_path(self.artifacts_dir(owner), name)
+        return path if path.is_file() else None
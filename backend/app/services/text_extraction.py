@@ -2,20 +2,165 @@
 
 from __future__ import annotations
 
-import io
+import hashlib
 import logging
+from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
 
 import fitz  # PyMuPDF
 import pytesseract
-from docx import Document as DocxDocument
 from PIL import Image
 
 from ..core.config import settings
+from ..core.security import DOC_MIME_TYPE, DOCX_MIME_TYPE
+from .docx_reader import read_doc, read_docx
+from .languages import page_languages
+from .layout import DocumentLayout, LayoutBuilder, WordBoxes
+from .rasterize import image_pixmap, ocr_pixmap, pil_to_gray_array, pixmap_array
+from .resolution import ocr_adaptive, render_for_ocr
 
 logger = logging.getLogger(__name__)
 
 
+PAGE_SEPARATOR = "\n\n"
+
+
+@dataclass
+class ExtractedText:
+    """Document text plus word geometry when the source has any.
+
+    ``page_offsets`` holds the character offset where each page starts in
+    ``text`` followed by the text length, so page ``i`` is
+    ``text[page_offsets[i]:page_offsets[i + 1]]`` (with its trailing separator).
+    ``block_offsets`` lists where each text block (PDF block, DOCX paragraph or table)
+    starts, in the same coordinates.
+    """
+
+    text: str
+    layout: DocumentLayout | None = None
+    page_offsets: list[int] | None = None
+    block_offsets: list[int] | None = None
+
+    @classmethod
+    def from_pages(
+        cls,
+        pages: list[str],
+        layout: DocumentLayout | None = None,
+        blocks: list[list[int]] | None = None,
+    ) -> "ExtractedText":
+        """Join pages; ``blocks`` gives block starts within each (unstripped) page."""
+
+        text, offsets = join_pages(pages)
+        block_offsets: list[int] = []
+        for index, page in enumerate(pages):
+            stripped = page.strip()
+            if not stripped:
+                continue
+            lead = len(page) - len(page.lstrip())
+            starts = blocks[index] if blocks and blocks[index] else [0]
+            block_offsets.extend(
+                offsets[index] + min(max(start - lead, 0), len(stripped)) for start in starts
+            )
+        return cls(text, layout, offsets, sorted(set(block_offsets)))
+
+
+def join_pages(pages: list[str], separator: str = PAGE_SEPARATOR) -> tuple[str, list[int]]:
+    """Join stripped page texts, skipping empty pages, and return page offsets.
+
+    Empty pages become zero-length slices at the start of the next page, which
+    keeps indices aligned with the layout artifact's page numbering.
+    """
+
+    parts: list[str] = []
+    starts: list[int | None] = []
+    length = 0
+    for page in pages:
+        page = page.strip()
+        if not page:
+            starts.append(None)
+            continue
+        if parts:
+            length += len(separator)
+        starts.append(length)
+        parts.append(page)
+        length += len(page)
+    offsets: list[int] = []
+    following = length
+    for start in reversed(starts):
+        following = following if start is None else start
+        offsets.append(following)
+    offsets.reverse()
+    offsets.append(length)
+    return separator.join(parts), offsets
+
+
+def page_text_layer(page: fitz.Page) -> tuple[str, list[int]] | None:
+    """Text blocks of a born-digital page and their start offsets, or None to OCR it."""
+
+    # Block type 1 is an image placeholder ("<image: ...>"), not text.
+    blocks = [
+        block[4]
+        for block in page.get_text("blocks")
+        if block[6] == 0 and block[4] and block[4].strip()
+    ]
+    if not blocks:
+        return None
+    starts, position = [], 0
+    for block in blocks:
+        starts.append(position)
+        position += len(block) + 1
+    return "\n".join(blocks), starts
+
+
+class ImageOCRCache:
+    """Per-document memo of embedded-image OCR, keyed by xref and content hash.
+
+    Letterheads, logos and stamps repeated on every page are OCR'd once;
+    images too small to carry readable text are skipped.
+    """
+
+    def __init__(self, doc: fitz.Document, min_side: int | None = None) -> None:
+        self.doc = doc
+        self.min_side = settings.ocr_min_image_px if min_side is None else min_side
+        self._digest_by_xref: dict[int, str] = {}
+        self._results: dict[str, tuple[str, WordBoxes]] = {}
+        self.ocr_runs = 0
+        self.reused = 0
+        self.skipped = 0
+
+    def is_tiny(self, width: int, height: int) -> bool:
+        if min(width, height) < self.min_side:
+            self.skipped += 1
+            return True
+        return False
+
+    def ocr_for(self, xref: int) -> tuple[str, WordBoxes]:
+        """OCR an image xref at most once per content; boxes are in image pixels."""
+
+        digest = self._digest_by_xref.get(xref)
+        if digest is None:
+            # Hash the raw (still compressed) stream: cheap, and catches the same
+            # image embedded under several xrefs.
+            raw = self.doc.xref_stream_raw(xref) or b""
+            digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+            self._digest_by_xref[xref] = digest
+        if digest in self._results:
+            self.reused += 1
+            return self._results[digest]
+
+        try:
+            pix = image_pixmap(self.doc, xref)
+            gray, source = pixmap_array(pix), f"image xref {xref}"
+            result = ocr_adaptive(gray, source=source, lang=page_languages(gray, source))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Image OCR failed for xref %s: %s", xref, exc)
+            result = ("", WordBoxes())
+        self.ocr_runs += 1
+        self._results[digest] = result
+        return result
+
+
 class TextExtractionService:
     """Extracts text from PDFs, images, DOCX and TXT files."""
 
@@ -25,17 +170,22 @@ class TextExtractionService:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
 
     def extract_text(self, file_path: str, mime_type: str | None = None) -> str:
+        return self.extract(file_path, mime_type).text
+
+    def extract(self, file_path: str, mime_type: str | None = None) -> ExtractedText:
+        """Extract text, and word boxes for PDFs and images."""
+
         ext = Path(file_path).suffix.lower()
         logger.info("Extracting text from %s (%s)", file_path, ext or mime_type)
 
         if ext == ".pdf" or mime_type == "application/pdf":
             return self._read_pdf(file_path)
-        if ext in {".docx", ".doc"} or mime_type in {
-            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        }:
-            return self._read_docx(file_path)
+        if ext == ".docx" or mime_type == DOCX_MIME_TYPE:
+            return self._read_word(file_path, read_docx, "DOCX")
+        if ext == ".doc" or mime_type == DOC_MIME_TYPE:
+            return self._read_word(file_path, read_doc, "DOC")
         if ext in {".txt", ".md", ".log"} or mime_type == "text/plain":
-            return self._read_txt(file_path)
+            return ExtractedText.from_pages([self._read_txt(file_path)])
         if ext in {".jpg", ".jpeg", ".png", ".bmp", ".tiff"} or (
             mime_type and mime_type.startswith("image/")
         ):
@@ -44,77 +194,117 @@ class TextExtractionService:
         logger.warning("Unsupported file type %s; attempting OCR fallback", ext or mime_type)
         return self._read_image(file_path)
 
-    def _read_pdf(self, file_path: str) -> str:
+    def _read_pdf(self, file_path: str) -> ExtractedText:
+        # One entry per page, empty when nothing was found, so boundaries survive the join.
         text_chunks: list[str] = []
+        block_starts: list[list[int]] = []
+        layout = LayoutBuilder(unit="pt")
         try:
             with fitz.open(file_path) as doc:
                 logger.info("PDF %s: %s pages detected.", file_path, len(doc))
+                image_cache = ImageOCRCache(doc)
                 for page_index, page in enumerate(doc, start=1):
-                    page_text = page.get_text("blocks")
-                    if page_text:
-                        collected = "\n".join(
-                            block[4] for block in page_text if block[4] and block[4].strip()
+                    width, height = page.rect.width, page.rect.height
+                    text_layer = page_text_layer(page)
+                    if text_layer is not None:
+                        joined, starts = text_layer
+                        block_starts.append(starts)
+                        logger.debug(
+                            "PDF page %s: extracted %s characters via text blocks.",
+                            page_index,
+                            len(joined.strip()),
                         )
-                        if collected.strip():
-                            logger.debug(
-                                "PDF page %s: extracted %s characters via text blocks.",
-                                page_index,
-                                len(collected),
-                            )
-                            text_chunks.append(collected)
-                            continue
+                        text_chunks.append(joined)
+                        words = WordBoxes.from_pymupdf(page.get_text("words"))
+                        layout.add_page(width, height, joined.strip(), words)
+                        continue
 
                     logger.debug("PDF page %s: falling back to OCR.", page_index)
-                    ocr_text = self._ocr_pdf_page(page)
-                    if ocr_text:
-                        text_chunks.append(ocr_text)
+                    ocr_text, words = self._ocr_pdf_page(page, image_cache)
+                    text_chunks.append(ocr_text)
+                    block_starts.append([0])
+                    layout.add_page(width, height, ocr_text, words)
 
-            combined = "\n\n".join(text_chunks).strip()
-            if combined:
-                logger.info("Extracted %s characters from PDF %s.", len(combined), file_path)
+                if image_cache.ocr_runs or image_cache.reused or image_cache.skipped:
+                    logger.info(
+                        "PDF %s: OCR'd %s unique images, reused %s, skipped %s tiny.",
+                        file_path,
+                        image_cache.ocr_runs,
+                        image_cache.reused,
+                        image_cache.skipped,
+                    )
+
+            extracted = ExtractedText.from_pages(text_chunks, layout.build(), block_starts)
+            if extracted.text:
+                logger.info("Extracted %s characters from PDF %s.", len(extracted.text), file_path)
             else:
                 logger.warning("No text extracted from PDF %s.", file_path)
-            return combined
+            return extracted
         except Exception as exc:  # noqa: BLE001
             logger.exception("Failed to read PDF %s: %s", file_path, exc)
-            return ""
+            return ExtractedText("")
+
+    def _ocr_pdf_page(
+        self, page: fitz.Page, image_cache: ImageOCRCache | None = None
+    ) -> tuple[str, WordBoxes]:
+        """OCR a page; returned boxes are in page points."""
 
-    def _ocr_pdf_page(self, page: fitz.Page) -> str:
+        image_cache = image_cache or ImageOCRCache(page.parent)
         text_chunks: list[str] = []
-        image_list = page.get_images(full=True)
-        if image_list:
-            for xref, *_rest in image_list:
+        boxes: list[WordBoxes] = []
+        seen: set[int] = set()
+        eligible = [
+            (xref, width, height)
+            for xref, _smask, width, height, *_rest in page.get_images(full=True)
+            if not image_cache.is_tiny(width, height)
+        ]
+        if eligible:
+            for xref, width, height in eligible:
+                if xref in seen:
+                    continue
+                seen.add(xref)
                 try:
-                    base_image = page.parent.extract_image(xref)
-                    image_bytes = base_image["image"]
-                    image = Image.open(io.BytesIO(image_bytes))
-                    ocr_text = self._ocr_image(image)
+                    ocr_text, words = image_cache.ocr_for(xref)
                     if ocr_text:
                         text_chunks.append(ocr_text)
+                        rects = page.get_image_rects(xref)
+                        if rects:
+                            rect = rects[0]
+                            boxes.append(
+                                words.transformed(
+                                    rect.x0, rect.y0, rect.width / width, rect.height / height
+                                )
+                            )
                 except Exception as img_err:  # noqa: BLE001
                     logger.debug("Image OCR failed on page %s: %s", page.number + 1, img_err)
         else:
             try:
-                mat = fitz.Matrix(300 / 72, 300 / 72)
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("png")
-                image = Image.open(io.BytesIO(img_data))
-                ocr_text = self._ocr_image(image)
+                pix = render_for_ocr(page)
+                lang = page_languages(pixmap_array(pix), f"page {page.number + 1}")
+                ocr_text, words = ocr_pixmap(pix, lang=lang)
                 if ocr_text:
                     text_chunks.append(ocr_text)
+                    scale = page.rect.width / pix.width
+                    boxes.append(words.transformed(0, 0, scale, scale))
             except Exception as exc:  # noqa: BLE001
                 logger.debug("Full-page OCR failed on page %s: %s", page.number + 1, exc)
-        return "\n".join(text_chunks).strip()
+        return "\n".join(text_chunks).strip(), WordBoxes.concat(boxes)
+
+    def _read_word(
+        self,
+        file_path: str,
+        reader: Callable[[str], tuple[str, list[int]]],
+        kind: str,
+    ) -> ExtractedText:
+        """Paragraphs and tables (one row per line) in order; each is a block."""
 
-    def _read_docx(self, file_path: str) -> str:
         try:
-            doc = DocxDocument(file_path)
-            text = "\n".join(p.text for p in doc.paragraphs if p.text.strip()).strip()
-            logger.info("Extracted %s characters from DOCX %s.", len(text), file_path)
-            return text
+            text, blocks = reader(file_path)
+            logger.info("Extracted %s characters from %s %s.", len(text), kind, file_path)
+            return ExtractedText.from_pages([text], blocks=[blocks])
         except Exception as exc:  # noqa: BLE001
-            logger.exception("Failed to read DOCX %s: %s", file_path, exc)
-            return ""
+            logger.exception("Failed to read %s %s: %s", kind, file_path, exc)
+            return ExtractedText("")
 
     def _read_txt(self, file_path: str) -> str:
         try:
@@ -126,17 +316,18 @@ class TextExtractionService:
             logger.exception("Failed to read TXT %s: %s", file_path, exc)
             return ""
 
-    def _read_image(self, file_path: str) -> str:
+    def _read_image(self, file_path: str) -> ExtractedText:
         try:
             image = Image.open(file_path)
-            text = self._ocr_image(image)
+            text, words = self._ocr_image(image)
             logger.info("Extracted %s characters via OCR from image %s.", len(text), file_path)
-            return text
+            layout = LayoutBuilder(unit="px")
+            layout.add_page(image.width, image.height, text, words)
+            return ExtractedText.from_pages([text], layout.build())
         except Exception as exc:  # noqa: BLE001
             logger.exception("Failed to OCR image %s: %s", file_path, exc)
-            return ""
-
-    def _ocr_image(self, image: Image.Image) -> str:
-        text = pytesseract.image_to_string(image, lang=settings.ocr_languages or "eng").strip()
-        return text
+            return ExtractedText("")
 
+    def _ocr_image(self, image: Image.Image) -> tuple[str, WordBoxes]:
+        gray = pil_to_gray_array(image)
+        return ocr_adaptive(gray, lang=page_languages(gray, "image"))
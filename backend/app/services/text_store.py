@@ -0,0 +1,148 @@
+"""Compact page-indexed text artifact with O(1) page access."""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import zlib
+from bisect import bisect_right
+from pathlib import Path
+
+import numpy as np
+
+TEXT_ARTIFACT = "text.bin"
+MAGIC = b"DTXT"
+VERSION = 1
+CODEC_NONE, CODEC_ZLIB = 0, 1
+# magic, version, codec, page count, block count
+HEADER = struct.Struct("<4sHHII")
+OFFSET_DTYPE = np.dtype("<i8")
+
+
+def encode_text_store(
+    text: str,
+    page_offsets: list[int],
+    block_offsets: list[int] | None = None,
+    compress: bool = True,
+) -> bytes:
+    """Serialize document text as independently compressed UTF-8 page frames.
+
+    Layout: header, then four little-endian int64 arrays — page character
+    offsets, page byte offsets into the UTF-8 text, frame offsets into the
+    data section, block character offsets — then the frames. Each page is
+    its own zlib frame, so reading one page never touches the others.
+    """
+
+    pages = [text[page_offsets[i] : page_offsets[i + 1]] for i in range(len(page_offsets) - 1)]
+    blocks = list(block_offsets or [])
+    byte_offsets, frame_offsets, frames = [0], [0], []
+    for page in pages:
+        raw = page.encode("utf-8")
+        frame = zlib.compress(raw, 6) if compress else raw
+        byte_offsets.append(byte_offsets[-1] + len(raw))
+        frame_offsets.append(frame_offsets[-1] + len(frame))
+        frames.append(frame)
+    arrays = [
+        np.asarray(values, dtype=OFFSET_DTYPE).tobytes()
+        for values in (page_offsets, byte_offsets, frame_offsets, [*blocks, len(text)])
+    ]
+    header = HEADER.pack(
+        MAGIC, VERSION, CODEC_ZLIB if compress else CODEC_NONE, len(pages), len(blocks)
+    )
+    return b"".join([header, *arrays, *frames])
+
+
+class TextStore:
+    """Read side of :func:`encode_text_store`, over a memory map or bytes.
+
+    Offsets are loaded eagerly (a few integers per page); page frames stay in
+    the mapped file until asked for.
+    """
+
+    def __init__(self, buffer: bytes | mmap.mmap) -> None:
+        magic, version, codec, page_count, block_count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a text store")
+        self._buffer = buffer
+        self._codec = codec
+        position = HEADER.size
+        arrays = []
+        for count in (page_count + 1, page_count + 1, page_count + 1, block_count + 1):
+            arrays.append(
+                np.frombuffer(buffer, dtype=OFFSET_DTYPE, count=count, offset=position).copy()
+            )
+            position += count * OFFSET_DTYPE.itemsize
+        self.char_offsets, self.byte_offsets, self._frames, block_offsets = arrays
+        self.block_offsets = block_offsets[:-1]
+        self._data_start = position
+
+    @classmethod
+    def open(cls, path: str | Path) -> "TextStore":
+        with open(path, "rb") as handle:
+            return cls(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self) -> "TextStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def page_count(self) -> int:
+        return len(self.char_offsets) - 1
+
+    @property
+    def text_length(self) -> int:
+        return int(self.char_offsets[-1])
+
+    @property
+    def page_offsets(self) -> list[int]:
+        return self.char_offsets.tolist()
+
+    def page(self, index: int) -> str:
+        """Text of one page: a single frame read and decompress."""
+
+        if not 0 <= index < self.page_count:
+            raise IndexError(index)
+        start = self._data_start + int(self._frames[index])
+        end = self._data_start + int(self._frames[index + 1])
+        raw = self._buffer[start:end]
+        if self._codec == CODEC_ZLIB:
+            raw = zlib.decompress(raw)
+        return raw.decode("utf-8")
+
+    def pages(self, first: int, last: int) -> str:
+        """Concatenated text of pages ``[first, last)``."""
+
+        return "".join(self.page(index) for index in range(first, min(last, self.page_count)))
+
+    def page_of(self, offset: int) -> int:
+        """Page holding character ``offset`` (empty pages never hold one)."""
+
+        return min(bisect_right(self.page_offsets, offset) - 1, self.page_count - 1)
+
+    def span(self, start: int, end: int) -> str:
+        """Characters ``[start, end)``, decompressing only the pages they cover."""
+
+        end = min(end, self.text_length)
+        if start >= end:
+            return ""
+        first, last = self.page_of(start), self.page_of(end - 1)
+        text = self.pages(first, last + 1)
+        base = int(self.char_offsets[first])
+        return text[start - base : end - base]
+
+    def block(self, index: int) -> str:
+        """Text of one block, separators between blocks included."""
+
+        start = int(self.block_offsets[index])
+        end = (
+            int(self.block_offsets[index + 1])
+            if index + 1 < len(self.block_offsets)
+            else self.text_length
+        )
+        return self.span(start, end)
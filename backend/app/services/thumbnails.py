@@ -0,0 +1,163 @@
+"""Low-resolution page renders cached on disk with LRU eviction."""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from ..core.config import settings
+from ..core.security import sanitize_filename
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailCache:
+    """Renders each (document, page, width) once and keeps the PNG on disk.
+
+    Hits refresh the file's mtime, so eviction removes the least recently
+    used thumbnails first. The cache size is counted once and then kept up
+    to date per render, so the directory is only scanned again when a render
+    pushes the count past ``max_bytes``. That scan also resyncs the count with
+    renders by other processes. Images open in PyMuPDF as one-page documents.
+    """
+
+    def __init__(self, root: Path | None = None, max_bytes: int | None = None) -> None:
+        self.root = root or settings.uploads_dir / "thumbnails"
+        self.max_bytes = (
+            settings.thumbnail_cache_mb * 1024 * 1024 if max_bytes is None else max_bytes
+        )
+        self._locks: dict[Path, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self._size: int | None = None
+
+    def path_for(self, document_id: str, page: int, width: int) -> Path:
+        return self.root / sanitize_filename(document_id) / f"p{page}-w{width}.png"
+
+    @staticmethod
+    def page_count(source: str | Path) -> int:
+        with fitz.open(source) as doc:
+            return doc.page_count
+
+    def get(self, source: str | Path, document_id: str, page: int, width: int) -> Path:
+        """Return the cached thumbnail, rendering it on first use.
+
+        Raises IndexError when ``page`` does not exist in the source file.
+        """
+
+        path = self.path_for(document_id, page, width)
+        if self._touch(path):
+            return path
+        try:
+            with self._lock_for(path):
+                if self._touch(path):
+                    return path
+                data = self.render(source, page, width)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                handle, temp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+                with os.fdopen(handle, "wb") as file:
+                    file.write(data)
+                os.replace(temp, path)
+        finally:
+            with self._guard:
+                self._locks.pop(path, None)
+        if self._grow(len(data)) > self.max_bytes:
+            self.evict()
+        return path
+
+    @staticmethod
+    def render(source: str | Path, page: int, width: int) -> bytes:
+        with fitz.open(source) as doc:
+            if not 0 <= page < doc.page_count:
+                raise IndexError(page)
+            loaded = doc[page]
+            zoom = width / max(loaded.rect.width, 1)
+            pix = loaded.get_pixmap(
+                matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csRGB, alpha=False
+            )
+            return pix.tobytes("png")
+
+    def _grow(self, size: int) -> int:
+        """Add a new render to the counted size and return the total."""
+
+        with self._guard:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._scan())
+            else:
+                self._size += size
+            return self._size
+
+    def _scan(self) -> list[tuple[float, int, str]]:
+        """(mtime, size, path) of every cached thumbnail."""
+
+        entries = []
+        if not self.root.is_dir():
+            return entries
+        for directory in os.scandir(self.root):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                if entry.name.endswith(".png"):
+                    info = entry.stat()
+                    entries.append((info.st_mtime, info.st_size, entry.path))
+        return entries
+
+    def evict(self) -> int:
+        """Delete least recently used thumbnails until under ``max_bytes``."""
+
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        if total <= self.max_bytes:
+            with self._guard:
+                self._size = total
+            return removed
+        for _, size, path in sorted(entries):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            removed += 1
+            if total <= self.max_bytes:
+                break
+        with self._guard:
+            self._size = total
+        logger.debug("Evicted %s thumbnails, cache now %s bytes", removed, total)
+        return removed
+
+    def clear(self, document_id: str) -> None:
+        directory = self.root / sanitize_filename(document_id)
+        if directory.is_dir():
+            freed = 0
+            for entry in directory.iterdir():
+                freed += entry.stat().st_size
+                entry.unlink(missing_ok=True)
+            directory.rmdir()
+            with self._guard:
+                if self._size is not None:
+                    self._size = max(self._size - freed, 0)
+
+    @staticmethod
+    def _touch(path: Path) -> bool:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _lock_for(self, path: Path) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+
+@lru_cache
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Return the process-wide thumbnail cache (one lock table per process)."""
+
+    return ThumbnailCache()
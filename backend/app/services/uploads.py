@@ -0,0 +1,255 @@
+"""Upload handshake and resumable chunked uploads."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.security import (
+    ALLOWED_MIME_TYPES,
+    MAGIC_BYTES,
+    detect_mime_type,
+    resolve_storage_path,
+)
+from ..models import Document, UploadSession
+from ..schemas.upload import UploadDeclaration
+from .storage import StorageService
+
+logger = logging.getLogger(__name__)
+
+SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+class UploadOffsetMismatch(ValueError):
+    """A chunk did not start where the received bytes end."""
+
+    def __init__(self, expected: int) -> None:
+        super().__init__(f"Expected a chunk at offset {expected}.")
+        self.expected = expected
+
+
+class UploadIntegrityError(ValueError):
+    """The assembled file does not match its declared hash or type."""
+
+
+class UploadTooLarge(ValueError):
+    """A chunk runs past the size declared in the handshake."""
+
+
+class UploadManager:
+    """Decides per announced file whether to skip, reject or receive it.
+
+    Files already stored (same SHA-256, see ``Document.content_hash``) are
+    answered with the existing document; the rest get an upload session,
+    resumed when one for the same content is still open. Chunks are written
+    at their offset into ``uploads/partial`` and the document is created once
+    the last byte has arrived and its hash and type check out.
+    """
+
+    def __init__(self, session: AsyncSession, storage: StorageService | None = None) -> None:
+        self.session = session
+        self.storage = storage or StorageService()
+        self.partial_dir = self.storage.base_dir / "partial"
+        self.chunk_size = settings.upload_chunk_size_mb * 1024 * 1024
+        self.max_bytes = settings.max_upload_size_mb * 1024 * 1024
+
+    def part_path(self, upload_id: str) -> Path:
+        return resolve_storage_path(self.partial_dir, f"{upload_id}.part")
+
+    def _rejection(self, declaration: UploadDeclaration) -> str | None:
+        if declaration.mime_type not in ALLOWED_MIME_TYPES:
+            return f"Unsupported file type: {declaration.mime_type}"
+        if declaration.size <= 0:
+            return "Empty file."
+        if declaration.size > self.max_bytes:
+            return f"File exceeds {settings.max_upload_size_mb} MB."
+        if not SHA256_PATTERN.fullmatch(declaration.sha256):
+            return "sha256 must be 64 lowercase hex digits."
+        return None
+
+    async def handshake(self, declarations: list[UploadDeclaration]) -> list[dict[str, Any]]:
+        """One decision per file: ``have``, ``rejected`` or ``send`` (with an offset)."""
+
+        await self.purge_expired()
+        decisions: list[dict[str, Any]] = []
+        for declaration in declarations:
+            decision: dict[str, Any] = {"filename": declaration.filename}
+            reason = self._rejection(declaration)
+            existing = None if reason else await self._stored(declaration.sha256)
+            if reason is not None:
+                decision.update(status="rejected", reason=reason)
+            elif existing is not None:
+                decision.update(status="have", document_id=existing)
+            else:
+                upload = await self._open_session(declaration)
+                decision.update(
+                    status="send",
+                    upload_id=upload.id,
+                    offset=upload.received,
+                    chunk_size=self.chunk_size,
+                )
+            decisions.append(decision)
+        await self.session.commit()
+        return decisions
+
+    async def _stored(self, content_hash: str) -> str | None:
+        """A stored, not failed document with exactly these bytes."""
+
+        return await self.session.scalar(
+            select(Document.id)
+            .where(Document.content_hash == content_hash, Document.status != "failed")
+            .limit(1)
+        )
+
+    async def _open_session(self, declaration: UploadDeclaration) -> UploadSession:
+        upload = await self.session.scalar(
+            select(UploadSession)
+            .where(
+                UploadSession.content_hash == declaration.sha256,
+                UploadSession.size == declaration.size,
+            )
+            .order_by(UploadSession.received.desc())
+            .limit(1)
+        )
+        expires_at = datetime.utcnow() + timedelta(hours=settings.upload_session_ttl_hours)
+        if upload is not None:
+            upload.expires_at = expires_at
+            return upload
+        upload = UploadSession(
+            id=str(uuid.uuid4()),
+            filename=declaration.filename,
+            mime_type=declaration.mime_type,
+            size=declaration.size,
+            content_hash=declaration.sha256,
+            received=0,
+            expires_at=expires_at,
+        )
+        self.session.add(upload)
+        return upload
+
+    async def get(self, upload_id: str) -> UploadSession:
+        upload = await self.session.get(UploadSession, upload_id)
+        if upload is None or upload.expires_at < datetime.utcnow():
+            raise LookupError(upload_id)
+        return upload
+
+    async def write_chunk(
+        self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]
+    ) -> tuple[UploadSession, Document | None]:
+        """Write a chunk at ``offset``; returns the document once the file is complete."""
+
+        upload = await self.get(upload_id)
+        if offset != upload.received:
+            raise UploadOffsetMismatch(upload.received)
+        path = self.part_path(upload.id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = await asyncio.to_thread(open, path, "r+b" if path.exists() else "wb")
+        end = offset
+        try:
+            await asyncio.to_thread(handle.seek, offset)
+            async for data in chunks:
+                end += len(data)
+                if end > upload.size:
+                    raise UploadTooLarge(
+                        f"Chunk runs past the declared size of {upload.size} bytes."
+                    )
+                await asyncio.to_thread(handle.write, data)
+        finally:
+            await asyncio.to_thread(handle.close)
+
+        # Conditional on the old offset, so a concurrent retry of the same chunk
+        # cannot advance the session twice.
+        advanced = await self.session.execute(
+            update(UploadSession)
+            .where(UploadSession.id == upload.id, UploadSession.received == offset)
+            .values(received=end)
+        )
+        if advanced.rowcount == 0:
+            await self.session.refresh(upload)
+            raise UploadOffsetMismatch(upload.received)
+        await self.session.commit()
+        await self.session.refresh(upload)
+        if upload.received < upload.size:
+            return upload, None
+        return upload, await self._complete(upload)
+
+    async def _complete(self, upload: UploadSession) -> Document:
+        path = self.part_path(upload.id)
+        digest, head = await asyncio.to_thread(_sha256_and_head, path)
+        detected = detect_mime_type(head)
+        if digest != upload.content_hash:
+            problem = "Uploaded bytes do not match the declared sha256."
+        elif detected is None:
+            problem = "File content does not match expected format."
+        elif detected != upload.mime_type:
+            problem = f"File content is {detected}, declared as {upload.mime_type}."
+        else:
+            problem = None
+        if problem is not None:
+            await self.discard(upload)
+            raise UploadIntegrityError(problem)
+        document_id = str(uuid.uuid4())
+        # Prefixed with the id like bulk ingestion, so equal filenames do not collide.
+        destination = resolve_storage_path(
+            self.storage.base_dir, f"{document_id}_{upload.filename}"
+        )
+        await asyncio.to_thread(os.replace, path, destination)
+        document = Document(
+            id=document_id,
+            filename=upload.filename,
+            file_path=str(destination),
+            file_size=upload.size,
+            mime_type=upload.mime_type,
+            content_hash=digest,
+            status="pending",
+        )
+        self.session.add(document)
+        await self.session.delete(upload)
+        await self.session.commit()
+        logger.info("Upload %s complete as document %s.", upload.id, document_id)
+        return document
+
+    async def discard(self, upload: UploadSession) -> None:
+        self.part_path(upload.id).unlink(missing_ok=True)
+        await self.session.delete(upload)
+        await self.session.commit()
+
+    async def purge_expired(self) -> int:
+        """Drop sessions past their TTL with their partial files; the caller commits."""
+
+        expired = list(
+            (
+                await self.session.scalars(
+                    select(UploadSession.id).where(UploadSession.expires_at < datetime.utcnow())
+                )
+            ).all()
+        )
+        if not expired:
+            return 0
+        for upload_id in expired:
+            self.part_path(upload_id).unlink(missing_ok=True)
+        await self.session.execute(delete(UploadSession).where(UploadSession.id.in_(expired)))
+        return len(expired)
+
+
+def _sha256_and_head(path: Path) -> tuple[str, bytes]:
+    digest = hashlib.sha256()
+    head = b""
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            if not head:
+                head = chunk[:MAGIC_BYTES]
+            digest.update(chunk)
+    return digest.hexdigest(), head
@@ -5,39 +5,83 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from datetime import datetime
 
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from ..core.celery_app import celery_app
 from ..core.config import settings
-from ..core.database import SessionLocal, init_models
+from ..core.database import SessionLocal
+from ..core.partitions import add_months, ensure_partitions, month_start
+from ..core.profiling import StackSampler, profile_filename
 from ..models import Document
+from ..services.archive import Archiver
 from ..services.extraction import ExtractionPipeline
+from ..services.response_cache import invalidate_documents
+from ..services.storage import StorageService
 from ..services.tasks import TaskTracker
 
 logger = logging.getLogger(__name__)
 tracker = TaskTracker()
-_db_initialized = False
-_db_init_lock = asyncio.Lock()
 worker_loop = asyncio.new_event_loop()
 asyncio.set_event_loop(worker_loop)
 
 
-async def ensure_db_initialized() -> None:
-    """Run database migrations once per worker process."""
+async def run_processing(
+    document_id: str,
+    task_id: str,
+    session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+) -> str:
+    """Run the extraction pipeline for a document and report progress."""
 
-    global _db_initialized
-    if _db_initialized:
-        return
-    async with _db_init_lock:
-        if not _db_initialized:
-            await init_models()
-            _db_initialized = True
+    async with session_factory() as session:
+        pipeline = ExtractionPipeline(session=session)
+
+        tracker.set_progress(
+            task_id,
+            status="processing",
+            current_step=1,
+            total_steps=5,
+            message="Fetching document",
+        )
+
+        document = await session.scalar(select(Document).where(Document.id == document_id))
+        if not document:
+            raise ValueError("Document not found")
+        document.status = "processing"
+        await session.commit()
+        # A reprocessed document must not keep being served as completed.
+        await invalidate_documents([document_id])
+
+        tracker.set_progress(
+            task_id,
+            status="processing",
+            current_step=2,
+            total_steps=5,
+            message="Running pipeline",
+        )
+
+        extraction_result = await pipeline.run(document_id)
+
+        tracker.set_progress(
+            task_id,
+            status="completed",
+            current_step=5,
+            total_steps=5,
+            message="Completed",
+            result_id=extraction_result.document.id,
+        )
+        return extraction_result.document.id
 
 
 @celery_app.task(bind=True, max_retries=3, name="process_document")
-def process_document(self, document_id: str) -> str:
-    """Background document processing pipeline."""
+def process_document(self, document_id: str, profile: bool = False) -> str:
+    """Background document processing pipeline.
+
+    Pass ``profile=True`` to store a stack-sampling profile of the job as a
+    document artifact.
+    """
 
     task_id = self.request.id or document_id
     tracker.set_progress(
@@ -48,47 +92,18 @@ def process_document(self, document_id: str) -> str:
         message="Starting processing",
     )
 
-    async def _run() -> str:
-        await ensure_db_initialized()
-        async with SessionLocal() as session:
-            pipeline = ExtractionPipeline(session=session)
-
-            tracker.set_progress(
-                task_id,
-                status="processing",
-                current_step=1,
-                total_steps=5,
-                message="Fetching document",
-            )
-
-            document = await session.scalar(select(Document).where(Document.id == document_id))
-            if not document:
-                raise ValueError("Document not found")
-            document.status = "processing"
-            await session.commit()
-
-            tracker.set_progress(
-                task_id,
-                status="processing",
-                current_step=2,
-                total_steps=5,
-                message="Running pipeline",
-            )
-
-            extraction_result = await pipeline.run(document_id)
-
-            tracker.set_progress(
-                task_id,
-                status="completed",
-                current_step=5,
-                total_steps=5,
-                message="Completed",
-                result_id=extraction_result.document.id,
-            )
-            return extraction_result.document.id
-
     try:
-        return worker_loop.run_until_complete(_run())
+        if not profile:
+            return worker_loop.run_until_complete(run_processing(document_id, task_id))
+        sampler = StackSampler()
+        sampler.start()
+        try:
+            return worker_loop.run_until_complete(run_processing(document_id, task_id))
+        finally:
+            sampler.stop()
+            StorageService().save_artifact(
+                document_id, profile_filename("process"), sampler.folded()
+            )
     except Exception as exc:  # noqa: BLE001
         logger.exception("Processing failed for %s: %s", document_id, exc)
         tracker.set_progress(
@@ -100,3 +115,22 @@ def process_document(self, document_id: str) -> str:
         )
         raise self.retry(exc=exc, countdown=60)
 
+
+async def run_archival(session_factory: async_sessionmaker[AsyncSession] = SessionLocal) -> dict:
+    """Create upcoming partitions, then archive months past the retention window."""
+
+    cutoff = add_months(month_start(datetime.utcnow()), -settings.archive_after_months)
+    async with session_factory() as session:
+        connection = await session.connection()
+        await connection.run_sync(ensure_partitions, settings.partition_months_ahead)
+        await session.commit()
+        return await Archiver(session).archive_before(cutoff)
+
+
+@celery_app.task(name="archive_documents")
+def archive_documents() -> dict:
+    """Monthly job moving old documents to Parquet cold storage."""
+
+    moved = worker_loop.run_until_complete(run_archival())
+    logger.info("Archival moved %s", moved or "nothing")
+    return moved
@@ -0,0 +1 @@
+"""Load-test harness for the upload → process → fetch API flow."""
@@ -0,0 +1,71 @@
+"""Command-line entrypoint: `python -m loadtest --help`."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from .harness import SCENARIOS, LoadTestConfig, run_load_test, write_report
+
+
+def _parse_mix(raw: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DOC-IA API load test")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Run length in seconds")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds to start all users")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean pause between actions")
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default="upload=1,browse=6,export=1",
+        help="Weighted scenario mix, e.g. upload=1,browse=6,export=1",
+    )
+    parser.add_argument("--pages", type=int, default=1, help="Pages per generated PDF")
+    parser.add_argument("--base-url", help="Target a running deployment instead of in-process")
+    parser.add_argument("--database-url", help="In-process DB (default: temporary SQLite)")
+    parser.add_argument("--redis-url", help="In-process Redis (default: in-memory)")
+    parser.add_argument("--workers", type=int, default=2, help="In-process worker threads")
+    parser.add_argument(
+        "--gemini-latency", type=float, default=0.0, help="Simulated Gemini latency in seconds"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="Write the summary to this JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    config = LoadTestConfig(
+        users=args.users,
+        duration=args.duration,
+        ramp_up=args.ramp_up,
+        think_time=args.think_time,
+        mix=args.mix,
+        pages_per_file=args.pages,
+        base_url=args.base_url,
+        database_url=args.database_url,
+        redis_url=args.redis_url,
+        workers=args.workers,
+        gemini_latency=args.gemini_latency,
+        seed=args.seed,
+    )
+    metrics = asyncio.run(run_load_test(config))
+    print(metrics.render())
+    if args.json:
+        write_report(metrics, config, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""In-process stand-ins for external services used by the load-test harness."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import defaultdict
+
+import fitz  # PyMuPDF
+
+INVOICE_TEMPLATE = """FACTURE N° {number}
+Fournisseur : {supplier}
+Date : {date}
+
+Montant HT : {ht:.2f} EUR
+TVA 20% : {tva:.2f} EUR
+Montant TTC : {ttc:.2f} EUR
+"""
+
+
+class InMemoryRedis:
+    """Thread-safe subset of the Redis client API used by `TaskTracker`."""
+
+    def __init__(self) -> None:
+        self._hashes: dict[str, dict[str, str]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def hset(self, name: str, mapping: dict) -> int:
+        with self._lock:
+            self._hashes[name].update({key: str(value) for key, value in mapping.items()})
+        return len(mapping)
+
+    def hgetall(self, name: str) -> dict[str, str]:
+        with self._lock:
+            return dict(self._hashes.get(name, {}))
+
+    def expire(self, name: str, seconds: int) -> bool:  # noqa: ARG002
+        return name in self._hashes
+
+
+class FakeGemini:
+    """Deterministic replacement for `GeminiService` with simulated latency."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+
+    def extract(self, ocr_text: str, fields: list[str] | None = None) -> dict:  # noqa: ARG002
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        return {
+            "document_type": "invoice" if "facture" in ocr_text.lower() else "other",
+            "invoice_number": "LT-0001",
+            "supplier": "Load Test SARL",
+            "date": "2024-01-31",
+            "amount_ht": 100.0,
+            "tva": 20.0,
+            "amount_ttc": 120.0,
+            "currency": "EUR",
+            "confidence_score": 0.9,
+        }
+
+
+def build_invoice_pdf(seed: int, pages: int = 1) -> bytes:
+    """Render a small born-digital invoice PDF for upload."""
+
+    rng = random.Random(seed)
+    ht = rng.uniform(50, 5000)
+    text = INVOICE_TEMPLATE.format(
+        number=f"{seed:08d}",
+        supplier=rng.choice(["ACME SAS", "Dupont & Fils", "Globex Ltd"]),
+        date=f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        ht=ht,
+        tva=ht * 0.2,
+        ttc=ht * 1.2,
+    )
+    with fitz.open() as doc:
+        for _ in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), text, fontsize=11)
+        return doc.tobytes()
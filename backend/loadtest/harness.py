@@ -0,0 +1,386 @@
+"""Virtual-user driver, in-process stack and latency reporting."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import random
+import socket
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+from .fakes import FakeGemini, InMemoryRedis, build_invoice_pdf
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS = ("upload", "browse", "export")
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class LoadTestConfig:
+    """Parameters for a single load-test run."""
+
+    users: int = 10
+    duration: float = 30.0
+    ramp_up: float = 5.0
+    think_time: float = 1.0
+    mix: dict[str, float] = field(
+        default_factory=lambda: {"upload": 1.0, "browse": 6.0, "export": 1.0}
+    )
+    files_per_upload: tuple[int, int] = (1, 3)
+    pages_per_file: int = 1
+    poll_interval: float = 0.5
+    poll_timeout: float = 120.0
+    base_url: str | None = None
+    database_url: str | None = None
+    redis_url: str | None = None
+    workers: int = 2
+    gemini_latency: float = 0.0
+    seed: int = 0
+
+
+@dataclass
+class Sample:
+    """One observed request."""
+
+    label: str
+    latency: float
+    ok: bool
+
+
+class Metrics:
+    """Collects per-endpoint samples and renders a summary."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[Sample]] = defaultdict(list)
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+
+    def record(self, label: str, latency: float, ok: bool) -> None:
+        self.samples[label].append(Sample(label=label, latency=latency, ok=ok))
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        report: dict[str, dict[str, float]] = {}
+        for label, samples in sorted(self.samples.items()):
+            latencies = sorted(sample.latency for sample in samples)
+            errors = sum(1 for sample in samples if not sample.ok)
+            row = {
+                "count": len(samples),
+                "errors": errors,
+                "error_rate": errors / len(samples),
+                "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+                "mean_ms": 1000 * sum(latencies) / len(latencies),
+                "max_ms": 1000 * latencies[-1],
+            }
+            for pct in PERCENTILES:
+                row[f"p{pct}_ms"] = 1000 * _percentile(latencies, pct)
+            report[label] = row
+        return report
+
+    def render(self) -> str:
+        header = f"{'endpoint':<28}{'count':>8}{'err%':>7}{'rps':>8}" + "".join(
+            f"{'p' + str(pct):>9}" for pct in PERCENTILES
+        ) + f"{'max':>9}"
+        lines = [header, "-" * len(header)]
+        for label, row in self.summary().items():
+            lines.append(
+                f"{label:<28}{row['count']:>8}{100 * row['error_rate']:>6.1f}%"
+                f"{row['throughput_rps']:>8.2f}"
+                + "".join(f"{row[f'p{pct}_ms']:>9.1f}" for pct in PERCENTILES)
+                + f"{row['max_ms']:>9.1f}"
+            )
+        lines.append("(latencies in ms)")
+        return "\n".join(lines)
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class InProcessStack:
+    """Runs the API under uvicorn plus thread-based workers in this process."""
+
+    def __init__(self, config: LoadTestConfig) -> None:
+        self.config = config
+        self.workdir = Path(tempfile.mkdtemp(prefix="docia-loadtest-"))
+        self.jobs: queue.Queue[str | None] = queue.Queue()
+        self.threads: list[threading.Thread] = []
+        self.server = None
+        self.base_url = ""
+
+    def start(self) -> str:
+        database_url = self.config.database_url or (
+            f"sqlite+aiosqlite:///{self.workdir / 'loadtest.db'}"
+        )
+        # Settings and the engine are created at import time, so the
+        # environment must be in place before the first `app` import.
+        os.environ.update(
+            {
+                "DATABASE_URL": database_url,
+                "UPLOADS_DIR": str(self.workdir / "uploads"),
+                "DATA_DIR": str(self.workdir / "data"),
+                "DEBUG": "false",
+            }
+        )
+        if self.config.redis_url:
+            os.environ["REDIS_URL"] = self.config.redis_url
+
+        import uvicorn
+
+        from app.api.v1.endpoints import tasks as task_endpoints
+        from app.api.v1.endpoints import upload as upload_endpoints
+        from app.main import app
+        from app.services import extraction as extraction_module
+        from app.workers import tasks as worker_tasks
+
+        FakeGemini.latency = self.config.gemini_latency
+        FakeGemini.jitter = self.config.gemini_latency / 4
+        extraction_module.GeminiService = FakeGemini  # type: ignore[misc,assignment]
+        if not self.config.redis_url:
+            shared = InMemoryRedis()
+            task_endpoints.tracker.client = shared  # type: ignore[assignment]
+            worker_tasks.tracker.client = shared  # type: ignore[assignment]
+        upload_endpoints.process_document = _QueueDispatcher(self.jobs)  # type: ignore[assignment]
+        asyncio.run(self._migrate(database_url))
+        logging.getLogger().setLevel(logging.WARNING)
+
+        port = _free_port()
+        self.server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+        )
+        server_thread = threading.Thread(target=self.server.run, daemon=True)
+        server_thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+
+        for index in range(self.config.workers):
+            worker = threading.Thread(
+                target=self._worker,
+                args=(database_url, worker_tasks.run_processing),
+                name=f"loadtest-worker-{index}",
+                daemon=True,
+            )
+            worker.start()
+            self.threads.append(worker)
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    @staticmethod
+    async def _migrate(database_url: str) -> None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.pool import NullPool
+
+        from app.core.migrations import upgrade_database
+
+        engine = create_async_engine(database_url, poolclass=NullPool)
+        await upgrade_database(engine)
+        await engine.dispose()
+
+    def _worker(self, database_url: str, run_processing) -> None:  # type: ignore[no-untyped-def]
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+        from sqlalchemy.pool import NullPool
+
+        loop = asyncio.new_event_loop()
+        engine = create_async_engine(database_url, poolclass=NullPool)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        while True:
+            document_id = self.jobs.get()
+            if document_id is None:
+                break
+            try:
+                loop.run_until_complete(
+                    run_processing(document_id, document_id, session_factory=session_factory)
+                )
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Worker failed on %s: %s", document_id, exc)
+        loop.run_until_complete(engine.dispose())
+        loop.close()
+
+    def stop(self) -> None:
+        for _ in self.threads:
+            self.jobs.put(None)
+        for worker in self.threads:
+            worker.join(timeout=10)
+        if self.server is not None:
+            self.server.should_exit = True
+
+
+class _QueueDispatcher:
+    """Mimics `process_document.apply_async` by pushing onto the local job queue."""
+
+    def __init__(self, jobs: queue.Queue[str | None]) -> None:
+        self.jobs = jobs
+
+    def apply_async(  # noqa: ARG002
+        self, args: list[str], kwargs: dict | None = None, task_id: str | None = None
+    ) -> None:
+        self.jobs.put(args[0])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class VirtualUser:
+    """Executes weighted scenarios against the API until the deadline."""
+
+    def __init__(
+        self,
+        index: int,
+        client: httpx.AsyncClient,
+        config: LoadTestConfig,
+        metrics: Metrics,
+        known_ids: list[str],
+    ) -> None:
+        self.index = index
+        self.client = client
+        self.config = config
+        self.metrics = metrics
+        self.known_ids = known_ids
+        self.rng = random.Random(config.seed * 10_000 + index)
+        self.counter = 0
+
+    async def run(self, deadline: float) -> None:
+        scenarios = [name for name in SCENARIOS if self.config.mix.get(name)]
+        weights = [self.config.mix[name] for name in scenarios]
+        while time.perf_counter() < deadline:
+            scenario = self.rng.choices(scenarios, weights=weights)[0]
+            await getattr(self, f"_scenario_{scenario}")()
+            await asyncio.sleep(self.rng.expovariate(1 / self.config.think_time))
+
+    async def _call(
+        self, label: str, method: str, url: str, *, accept: tuple[int, ...] = (), **kwargs
+    ) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.metrics.record(label, time.perf_counter() - start, ok=False)
+            logger.debug("%s failed: %s", label, exc)
+            return None
+        ok = response.status_code < 400 or response.status_code in accept
+        self.metrics.record(label, time.perf_counter() - start, ok=ok)
+        return response
+
+    async def _scenario_upload(self) -> None:
+        low, high = self.config.files_per_upload
+        files = []
+        for _ in range(self.rng.randint(low, high)):
+            self.counter += 1
+            seed = self.index * 1_000_000 + self.counter
+            content = build_invoice_pdf(seed, pages=self.config.pages_per_file)
+            files.append(("files", (f"lt-{self.index}-{self.counter}.pdf", content, "application/pdf")))
+        started = time.perf_counter()
+        response = await self._call("POST /upload", "POST", "/api/v1/upload", files=files)
+        if response is None or response.status_code >= 400:
+            return
+        document_ids = response.json().get("documents", [])
+        self.known_ids.extend(document_ids)
+        for document_id in document_ids:
+            completed = await self._poll(document_id)
+            self.metrics.record(
+                "pipeline upload→completed", time.perf_counter() - started, ok=completed
+            )
+            await self._call("GET /documents/{id}", "GET", f"/api/v1/documents/{document_id}")
+
+    async def _poll(self, task_id: str) -> bool:
+        deadline = time.perf_counter() + self.config.poll_timeout
+        while time.perf_counter() < deadline:
+            # 404 means no worker has picked the task up yet.
+            response = await self._call(
+                "GET /tasks/{id}", "GET", f"/api/v1/tasks/{task_id}", accept=(404,)
+            )
+            if response is not None and response.status_code == 200:
+                status = response.json().get("status")
+                if status == "completed":
+                    return True
+                if status == "failed":
+                    return False
+            await asyncio.sleep(self.config.poll_interval)
+        return False
+
+    async def _scenario_browse(self) -> None:
+        params: dict[str, str | int] = {"page": self.rng.randint(1, 5), "limit": 20}
+        if self.rng.random() < 0.3:
+            params["type"] = "invoice"
+        response = await self._call("GET /documents", "GET", "/api/v1/documents", params=params)
+        if response is None or response.status_code >= 400:
+            return
+        rows = response.json().get("data", [])
+        if rows:
+            document_id = self.rng.choice(rows)["id"]
+            await self._call("GET /documents/{id}", "GET", f"/api/v1/documents/{document_id}")
+
+    async def _scenario_export(self) -> None:
+        if not self.known_ids:
+            return
+        sample = self.rng.sample(self.known_ids, min(len(self.known_ids), 50))
+        await self._call(
+            "POST /export",
+            "POST",
+            "/api/v1/export",
+            json={"document_ids": sample, "format": self.rng.choice(["csv", "json"])},
+        )
+
+
+async def run_load_test(config: LoadTestConfig) -> Metrics:
+    """Drive the configured user mix and return collected metrics."""
+
+    stack: InProcessStack | None = None
+    base_url = config.base_url
+    if not base_url:
+        stack = InProcessStack(config)
+        base_url = await asyncio.to_thread(stack.start)
+
+    metrics = Metrics()
+    known_ids: list[str] = []
+    limits = httpx.Limits(max_connections=config.users * 2)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+            deadline = time.perf_counter() + config.duration
+            users = []
+            for index in range(config.users):
+                user = VirtualUser(index, client, config, metrics, known_ids)
+                users.append(asyncio.create_task(user.run(deadline)))
+                if config.ramp_up and config.users > 1:
+                    await asyncio.sleep(config.ramp_up / config.users)
+            await asyncio.gather(*users)
+    finally:
+        metrics.finished = time.perf_counter()
+        if stack is not None:
+            await asyncio.to_thread(stack.stop)
+    return metrics
+
+
+def write_report(metrics: Metrics, config: LoadTestConfig, path: Path) -> None:
+    """Persist the summary as JSON for comparison across runs."""
+
+    payload = {
+        "config": {
+            "users": config.users,
+            "duration": config.duration,
+            "mix": config.mix,
+            "workers": config.workers if not config.base_url else None,
+            "target": config.base_url or "in-process",
+        },
+        "endpoints": metrics.summary(),
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
@@ -0,0 +1,195 @@
+"""OCR resolution benchmark: `python -m loadtest.ocr_resolution [SCANS_DIR]`.
+
+Runs Tesseract on every PDF page and image in the directory twice: at the
+fixed ``--dpi`` (full resolution for images), then at the adaptively chosen
+resolution. It reports pixels, time and agreement for each file. Agreement is
+the character similarity of the adaptive text to the baseline text. When a
+``<name>.json`` with expected fields sits next to a scan, the invoice fields
+found by the local rules are also compared against it for both runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import pytesseract
+from PIL import Image
+
+from app.core.config import settings
+from app.services.local_extraction import INVOICE_FIELDS, LocalInvoiceExtractor
+from app.services.rasterize import ocr_array, ocr_pixmap, pil_to_gray_array, render_page
+from app.services.resolution import choose_scale, ocr_adaptive, render_for_ocr
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp"}
+
+
+@dataclass
+class Run:
+    pixels: int = 0
+    seconds: float = 0.0
+    text: str = ""
+
+
+@dataclass
+class FileResult:
+    name: str
+    pages: int
+    baseline_pixels: int
+    adaptive_pixels: int
+    baseline_seconds: float
+    adaptive_seconds: float
+    agreement: float
+    baseline_fields: int | None
+    adaptive_fields: int | None
+    expected_fields: int | None
+
+    @property
+    def speedup(self) -> float:
+        return self.baseline_seconds / max(self.adaptive_seconds, 1e-9)
+
+
+def _pdf_runs(path: Path, dpi: int) -> tuple[int, Run, Run]:
+    baseline, adaptive = Run(), Run()
+    with fitz.open(path) as doc:
+        for page in doc:
+            started = time.perf_counter()
+            pix = render_page(page, dpi=dpi)
+            text, _ = ocr_pixmap(pix)
+            baseline.seconds += time.perf_counter() - started
+            baseline.pixels += pix.width * pix.height
+            baseline.text += text + "\n\n"
+
+            started = time.perf_counter()
+            pix = render_for_ocr(page)
+            text, _ = ocr_pixmap(pix)
+            adaptive.seconds += time.perf_counter() - started
+            adaptive.pixels += pix.width * pix.height
+            adaptive.text += text + "\n\n"
+        return doc.page_count, baseline, adaptive
+
+
+def _image_runs(path: Path) -> tuple[int, Run, Run]:
+    with Image.open(path) as image:
+        gray = pil_to_gray_array(image)
+    started = time.perf_counter()
+    text, _ = ocr_array(gray)
+    baseline = Run(gray.shape[0] * gray.shape[1], time.perf_counter() - started, text)
+
+    started = time.perf_counter()
+    decision = choose_scale(gray)
+    text, _ = ocr_adaptive(gray, source=path.name)
+    adaptive = Run(decision.pixels_after, time.perf_counter() - started, text)
+    return 1, baseline, adaptive
+
+
+def _field_hits(text: str, expected: dict) -> int:
+    found = LocalInvoiceExtractor().extract(text).values()
+    return sum(
+        1
+        for name in INVOICE_FIELDS
+        if expected.get(name) is not None and found.get(name) == expected[name]
+    )
+
+
+def benchmark(directory: Path, dpi: int) -> list[FileResult]:
+    results = []
+    for path in sorted(directory.iterdir()):
+        suffix = path.suffix.lower()
+        if suffix == ".pdf":
+            pages, baseline, adaptive = _pdf_runs(path, dpi)
+        elif suffix in IMAGE_SUFFIXES:
+            pages, baseline, adaptive = _image_runs(path)
+        else:
+            continue
+        expected_path = path.with_suffix(".json")
+        expected = (
+            json.loads(expected_path.read_text("utf-8")) if expected_path.is_file() else None
+        )
+        results.append(
+            FileResult(
+                name=path.name,
+                pages=pages,
+                baseline_pixels=baseline.pixels,
+                adaptive_pixels=adaptive.pixels,
+                baseline_seconds=baseline.seconds,
+                adaptive_seconds=adaptive.seconds,
+                agreement=difflib.SequenceMatcher(
+                    None, baseline.text, adaptive.text, autojunk=False
+                ).ratio(),
+                baseline_fields=_field_hits(baseline.text, expected) if expected else None,
+                adaptive_fields=_field_hits(adaptive.text, expected) if expected else None,
+                expected_fields=(
+                    sum(1 for name in INVOICE_FIELDS if expected.get(name) is not None)
+                    if expected
+                    else None
+                ),
+            )
+        )
+    return results
+
+
+def render(results: list[FileResult], dpi: int) -> str:
+    header = (
+        f"{'file':<32} {'pages':>5} {'Mpx@' + str(dpi):>9} {'Mpx adap':>9} "
+        f"{'s@' + str(dpi):>8} {'s adap':>8} {'speedup':>8} {'agree':>6} {'fields':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for row in results:
+        fields = (
+            f"{row.baseline_fields}/{row.adaptive_fields}/{row.expected_fields}"
+            if row.expected_fields is not None
+            else "-"
+        )
+        lines.append(
+            f"{row.name[:32]:<32} {row.pages:>5} {row.baseline_pixels / 1e6:>9.1f} "
+            f"{row.adaptive_pixels / 1e6:>9.1f} {row.baseline_seconds:>8.2f} "
+            f"{row.adaptive_seconds:>8.2f} {row.speedup:>7.2f}x {row.agreement:>6.3f} {fields:>9}"
+        )
+    if results:
+        total_base = sum(row.baseline_seconds for row in results)
+        total_adaptive = sum(row.adaptive_seconds for row in results)
+        lines.append(
+            f"total: {total_base:.2f}s -> {total_adaptive:.2f}s "
+            f"({total_base / max(total_adaptive, 1e-9):.2f}x), mean agreement "
+            f"{sum(row.agreement for row in results) / len(results):.3f}"
+        )
+    lines.append("(fields: baseline/adaptive/expected)")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fixed vs adaptive OCR resolution")
+    parser.add_argument(
+        "directory",
+        type=Path,
+        nargs="?",
+        default=Path(__file__).resolve().parents[2] / "sample_data",
+    )
+    parser.add_argument("--dpi", type=int, default=settings.ocr_render_dpi, help="Baseline DPI")
+    parser.add_argument("--json", type=Path, help="Write per-file results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Log each scale decision")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    try:
+        pytesseract.get_tesseract_version()
+    except pytesseract.TesseractNotFoundError as exc:
+        raise SystemExit(f"Tesseract is required for this benchmark: {exc}") from exc
+    results = benchmark(args.directory, args.dpi)
+    if not results:
+        raise SystemExit(f"No PDFs or images found in {args.directory}")
+    print(render(results, args.dpi))
+    if args.json:
+        payload = [{**asdict(row), "speedup": row.speedup} for row in results]
+        args.json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
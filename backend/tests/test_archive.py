@@ -0,0 +1,196 @@
+import asyncio
+from datetime import date, datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import get_session
+from app.main import app
+from app.models import Base, Document, Extraction, ReviewItem
+from app.services import archive as archive_module
+from app.services import response_cache
+from app.services.archive import Archiver, ArchiveStore
+from app.services.response_cache import MemoryResponseCache, document_cache_key
+from app.services.storage import StorageService
+
+
+def _document(name, uploaded_at, doc_type="invoice"):
+    document = Document(
+        id=name,
+        filename=f"{name}.pdf",
+        file_path=f"/tmp/{name}.pdf",
+        file_size=10,
+        mime_type="application/pdf",
+        status="completed",
+        uploaded_at=uploaded_at,
+    )
+    extraction = Extraction(
+        document=document,
+        document_type=doc_type,
+        extracted_data={"amount_ttc": 12.5},
+        confidence_scores={"amount_ttc": 0.9},
+        ocr_text=f"text of {name}",
+    )
+    return document, extraction
+
+
+def test_archive_moves_old_months_and_lists_them_on_request(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    store = ArchiveStore(StorageService(tmp_path / "store"))
+    monkeypatch.setattr(archive_module, "ArchiveStore", lambda: store)
+    from app.api.v1.endpoints import documents as documents_endpoint
+
+    monkeypatch.setattr(documents_endpoint, "ArchiveStore", lambda: store)
+    cache = MemoryResponseCache(max_entries=10, ttl=60)
+    for name in ("jan-a", "hot-a"):
+        cache.set(document_cache_key(name), {"payload": name})
+    monkeypatch.setattr(response_cache, "get_response_cache", lambda: cache)
+
+    async def seed_and_archive():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            for name, when, doc_type in [
+                ("jan-a", datetime(2023, 1, 5), "invoice"),
+                ("jan-b", datetime(2023, 1, 20), "receipt"),
+                ("feb-a", datetime(2023, 2, 3), "invoice"),
+                ("hot-a", datetime(2024, 6, 1), "invoice"),
+            ]:
+                session.add_all(_document(name, when, doc_type))
+            session.add(ReviewItem(document_id="jan-a", min_confidence=0.2, low_fields=["x"]))
+            await session.commit()
+            moved = await Archiver(session, store).archive_before(date(2023, 3, 1))
+            remaining = await session.scalar(select(func.count()).select_from(Document))
+            extractions = await session.scalar(select(func.count()).select_from(Extraction))
+            reviews = await session.scalar(select(func.count()).select_from(ReviewItem))
+        return moved, remaining, extractions, reviews
+
+    moved, remaining, extractions, reviews = asyncio.run(seed_and_archive())
+    assert moved == {"2023-01": 2, "2023-02": 1}
+    assert (remaining, extractions, reviews) == (1, 1, 0)
+    assert store.months() == ["2023-01", "2023-02"]
+    # Archived documents are no longer served from the response cache.
+    assert cache.get(document_cache_key("jan-a")) is None
+    assert cache.get(document_cache_key("hot-a")) == {"payload": "hot-a"}
+
+    async def override_session():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_session
+    try:
+        client = TestClient(app)
+        hot_only = client.get("/api/v1/documents").json()
+        assert [row["id"] for row in hot_only["data"]] == ["hot-a"]
+
+        everything = client.get("/api/v1/documents?include_archived=true&limit=2").json()
+        assert everything["total"] == 4
+        assert [row["id"] for row in everything["data"]] == ["hot-a", "feb-a"]
+        second = client.get("/api/v1/documents?include_archived=true&limit=2&page=2").json()
+        assert [row["id"] for row in second["data"]] == ["jan-b", "jan-a"]
+        assert "ocr_text" not in second["data"][0]
+        assert second["data"][0]["extracted_data"] == {"amount_ttc": 12.5}
+
+        filtered = client.get(
+            "/api/v1/documents?include_archived=true&type=receipt&date_to=2023-01-31"
+        ).json()
+        assert [row["id"] for row in filtered["data"]] == ["jan-b"]
+
+        assert client.get("/api/v1/documents/jan-a").status_code == 404
+        archived = client.get("/api/v1/documents/jan-a?include_archived=true").json()
+        assert archived["archived"] and "ocr_text" not in archived
+        assert archived["text_length"] == len("text of jan-a")
+        archived = client.get(
+            "/api/v1/documents/jan-a?include_archived=true&include_text=true"
+        ).json()
+        assert archived["ocr_text"] == "text of jan-a"
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_extraction_carries_its_document_upload_month(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            # Uploaded on the last day of January, processed in February.
+            session.add_all(_document("late", datetime(2023, 1, 31, 23, 0)))
+            session.add(
+                Document(
+                    id="later",
+                    filename="later.pdf",
+                    file_path="/tmp/later.pdf",
+                    file_size=10,
+                    mime_type="application/pdf",
+                    uploaded_at=datetime(2023, 3, 1),
+                )
+            )
+            await session.commit()
+            # Only the id is known here, as in the worker.
+            session.add(
+                Extraction(
+                    document_id="later",
+                    document_type="invoice",
+                    ocr_text="",
+                    created_at=datetime(2023, 4, 2),
+                )
+            )
+            await session.commit()
+            rows = await session.execute(
+                select(Extraction.document_id, Extraction.document_uploaded_at)
+            )
+            return dict(rows.all())
+
+    assert asyncio.run(run()) == {
+        "late": datetime(2023, 1, 31, 23, 0),
+        "later": datetime(2023, 3, 1),
+    }
+
+
+def test_archive_query_reads_only_the_page(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    store = ArchiveStore(StorageService(tmp_path / "store"))
+
+    async def seed_and_archive():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            for name, when in [
+                ("jan-z", datetime(2023, 1, 5)),
+                ("feb-b", datetime(2023, 2, 3)),
+                ("mar-a", datetime(2023, 3, 9)),
+                ("mar-c", datetime(2023, 3, 20)),
+            ]:
+                session.add_all(_document(name, when))
+            await session.commit()
+            await Archiver(session, store).archive_before(date(2023, 4, 1))
+
+    asyncio.run(seed_and_archive())
+    reads = []
+    open_dataset = store._dataset
+
+    class Spy:
+        def __init__(self, dataset):
+            self.dataset = dataset
+
+        def to_table(self, columns=None, **kwargs):
+            reads.append(columns)
+            return self.dataset.to_table(columns=columns, **kwargs)
+
+    monkeypatch.setattr(store, "_dataset", lambda: Spy(open_dataset()))
+
+    newest = store.query(2)
+    assert [row["id"] for row in newest] == ["mar-c", "mar-a"]
+    assert newest[0]["extracted_data"] == {"amount_ttc": 12.5}
+    # March fills the page: one key scan, then the list columns of two rows.
+    assert reads == [["uploaded_at", "id"], archive_module.LIST_COLUMNS]
+
+    by_name = store.query(3, sort_by="filename", descending=False)
+    assert [row["id"] for row in by_name] == ["feb-b", "jan-z", "mar-a"]
+    assert store.query(0) == []
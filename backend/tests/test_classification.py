@@ -0,0 +1,36 @@
+from app.services.classification import DEFAULT_VOCABULARY, KeywordClassifier
+
+
+def test_scores_all_types_and_picks_weighted_winner():
+    classifier = KeywordClassifier(DEFAULT_VOCABULARY)
+    text = (
+        "FACTURE N° 2024-001\nMontant HT : 100,00\nTVA 20% : 20,00\nMontant TTC : 120,00\n"
+        "Paiement par virement."
+    )
+    result = classifier.classify(text)
+    assert result.document_type == "invoice"
+    assert result.scores["invoice"] > result.scores.get("receipt", 0.0)
+
+
+def test_matches_whole_words_and_unaccented_ocr_text():
+    classifier = KeywordClassifier(DEFAULT_VOCABULARY)
+    assert classifier.classify("Ticket de caisse - RECU - especes").document_type == "receipt"
+    # "tva" inside another word must not count.
+    assert classifier.classify("activation").document_type is None
+
+
+def test_language_filter_and_custom_vocabulary():
+    vocabulary = {"payslip": {"fr": {"bulletin de paie": 5.0}, "de": {"lohnabrechnung": 5.0}}}
+    classifier = KeywordClassifier(vocabulary, languages=["fr"])
+    assert classifier.classify("BULLETIN  DE\nPAIE mars").document_type == "payslip"
+    assert classifier.classify("Lohnabrechnung").document_type is None
+
+
+def test_keyword_shared_by_languages_scores_once():
+    classifier = KeywordClassifier(DEFAULT_VOCABULARY)
+    result = classifier.classify("clause")
+    assert result.scores == {"contract": 1.5}
+    assert result.document_type is None
+
+    vocabulary = {"contract": {"fr": {"clause": 1.0}, "en": {"clause": 2.5}}}
+    assert KeywordClassifier(vocabulary).classify("Clause 4").scores == {"contract": 2.5}
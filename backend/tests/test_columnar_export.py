@@ -0,0 +1,144 @@
+import asyncio
+import io
+from datetime import date, datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import get_session
+from app.main import app
+from app.models import Base, Document, Extraction
+from app.services.columnar import ColumnarExporter, coerce, export_schema
+
+
+def test_coerce_types_follow_the_payload_schema():
+    schema = export_schema()
+    assert coerce("1 234,50", schema.field("amount_ttc").type) == 1234.5
+    assert coerce("12/03/2024", schema.field("date").type) == date(2024, 3, 12)
+    assert coerce("not a date", schema.field("date").type) is None
+    assert coerce("eur", schema.field("currency").type) == "EUR"
+    assert coerce("€", schema.field("currency").type) is None
+    assert coerce(True, schema.field("tva").type) is None
+    items = coerce(
+        [{"description": "Pose", "quantity": "2", "amount": "170,00"}, "x"],
+        schema.field("line_items").type,
+    )
+    assert items == [
+        {
+            "description": "Pose",
+            "quantity": 2.0,
+            "unit_price": None,
+            "vat_rate": None,
+            "amount": 170.0,
+            "page": None,
+        }
+    ]
+
+
+def test_incremental_export_by_watermark(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            for index, updated in enumerate([datetime(2024, 1, 1), datetime(2024, 2, 1)]):
+                document = Document(
+                    id=f"doc-{index}",
+                    filename=f"{index}.pdf",
+                    file_path="/tmp/x",
+                    file_size=1,
+                    mime_type="application/pdf",
+                    status="completed",
+                )
+                session.add(document)
+                session.add(
+                    Extraction(
+                        document=document,
+                        document_type="invoice",
+                        extracted_data={
+                            "invoice_number": f"F-{index}",
+                            "date": "2024-01-15",
+                            "amount_ttc": "120,00",
+                            "currency": "EUR",
+                        },
+                        confidence_scores={"amount_ttc": 0.75},
+                        ocr_text="",
+                        updated_at=updated,
+                    )
+                )
+            await session.commit()
+        async with factory() as session:
+            full = await ColumnarExporter(session, row_group_size=1).write(
+                tmp_path / "full.parquet"
+            )
+        return full
+
+    full = asyncio.run(seed())
+    assert full.rows == 2 and full.watermark == datetime(2024, 2, 1)
+    parquet = pq.ParquetFile(tmp_path / "full.parquet")
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert table.column("amount_ttc").to_pylist() == [120.0, 120.0]
+    assert table.schema.field("date").type == pa.date32()
+    assert table.column("confidence_amount_ttc").to_pylist() == [0.75, 0.75]
+
+    async def override_session():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_session
+    try:
+        client = TestClient(app)
+        response = client.get(
+            "/api/v1/export/columnar", params={"format": "arrow", "since": "2024-01-15T00:00:00"}
+        )
+        assert response.status_code == 200
+        assert response.headers["x-export-rows"] == "1"
+        assert response.headers["x-export-watermark"] == "2024-02-01T00:00:00"
+        table = pa.ipc.open_file(io.BytesIO(response.content)).read_all()
+        assert table.column("document_id").to_pylist() == ["doc-1"]
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_incremental_export_rereads_rows_committed_late(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    def extraction(name, updated):
+        document = Document(
+            id=name, filename=f"{name}.pdf", file_path="/tmp/x", file_size=1, mime_type="pdf"
+        )
+        return document, Extraction(
+            document=document, extracted_data={}, ocr_text="", updated_at=updated
+        )
+
+    async def scenario():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            session.add_all(extraction("early", datetime(2024, 1, 1, 12, 0)))
+            await session.commit()
+            first = await ColumnarExporter(session).write(tmp_path / "first.parquet")
+            # Flushed before the first export ran, committed after it.
+            session.add_all(extraction("late", datetime(2024, 1, 1, 11, 58)))
+            await session.commit()
+            second = await ColumnarExporter(session, lag=timedelta(minutes=5)).write(
+                tmp_path / "second.parquet", since=first.watermark
+            )
+            # Only window rows left: the watermark does not go back.
+            third = await ColumnarExporter(session, lag=timedelta(minutes=5)).write(
+                tmp_path / "third.parquet", since=second.watermark
+            )
+            return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert third.rows == 2 and third.watermark == second.watermark
+    assert first.watermark == datetime(2024, 1, 1, 12, 0)
+    exported = pq.read_table(tmp_path / "second.parquet").column("document_id").to_pylist()
+    assert exported == ["late", "early"]
+    assert second.watermark == datetime(2024, 1, 1, 12, 0)
@@ -0,0 +1,46 @@
+from app.services.confidence import FieldConfidenceScorer
+from app.services.local_extraction import LocalInvoiceExtractor
+
+TEXT = """FACTURE N° F-42
+Date : 15/03/2024
+Montant HT : 100,00
+TVA 20% : 20,00
+Montant TTC : 120,00
+"""
+
+
+def test_scores_differ_per_field():
+    payload = {
+        "document_type": "invoice",
+        "invoice_number": "F-42",
+        "supplier": "Globex",
+        "date": "2024-03-15",
+        "amount_ht": 100.0,
+        "tva": 20.0,
+        "amount_ttc": 120.0,
+        "confidence_score": 0.8,
+    }
+    scores = FieldConfidenceScorer().score(payload, TEXT)
+    assert scores["amount_ttc"] > 0.9
+    assert scores["date"] > 0.9
+    # A supplier absent from the source text is the one to review.
+    assert scores["supplier"] < 0.6
+    assert scores["confidence_score"] == 0.8
+
+
+def test_vat_mismatch_lowers_amount_scores():
+    payload = {"amount_ht": 100.0, "tva": 20.0, "amount_ttc": 150.0}
+    local = LocalInvoiceExtractor().extract(TEXT)
+    scores = FieldConfidenceScorer().score(payload, TEXT, local=local)
+    consistent = FieldConfidenceScorer().score(
+        {"amount_ht": 100.0, "tva": 20.0, "amount_ttc": 120.0}, TEXT, local=local
+    )
+    assert scores["amount_ht"] < consistent["amount_ht"]
+    assert scores["amount_ttc"] < 0.6
+
+
+def test_amounts_returned_as_strings_are_parsed():
+    payload = {"amount_ht": "100,00", "tva": "20,00", "amount_ttc": "120,00 €"}
+    scores = FieldConfidenceScorer().score(payload, TEXT)
+    assert all(scores[name] > 0.9 for name in payload)
+    assert FieldConfidenceScorer().score({"amount_ttc": "n/a"}, TEXT)["amount_ttc"] < 0.5
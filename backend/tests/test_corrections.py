@@ -0,0 +1,143 @@
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base, Document, Extraction, ReviewItem
+from app.services.corrections import apply_correction, bulk_apply_corrections
+
+
+def test_bulk_corrections_merge_and_report_per_item():
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        async with factory() as session:
+            for name in ("a", "b"):
+                document = Document(
+                    id=name, filename=name, file_path="/tmp/x", file_size=1, mime_type="pdf"
+                )
+                session.add(document)
+                session.add(
+                    Extraction(
+                        document=document,
+                        extracted_data={"date": "2024-01-01", "tva": 2.0},
+                        confidence_scores={"date": 0.4, "tva": 0.5},
+                        ocr_text="",
+                    )
+                )
+            session.add(ReviewItem(document_id="a", min_confidence=0.4, low_fields=["date"]))
+            await session.commit()
+
+            results = await bulk_apply_corrections(
+                session,
+                [
+                    {"document_id": "a", "extracted_data": {"date": "2024-02-02"}},
+                    {"document_id": "missing", "extracted_data": {"tva": 1.0}},
+                    {"document_id": "a", "extracted_data": {"tva": 3.0}},
+                    {"document_id": "b", "extracted_data": {}, "confidence_scores": {"tva": 0.9}},
+                ],
+            )
+            assert results == [
+                {"document_id": "a", "status": "ok"},
+                {"document_id": "missing", "status": "not_found"},
+                {"document_id": "b", "status": "ok"},
+            ]
+
+            session.expire_all()
+            rows = {
+                row.document_id: row for row in await session.scalars(select(Extraction))
+            }
+            assert rows["a"].extracted_data == {"date": "2024-02-02", "tva": 3.0}
+            assert rows["a"].confidence_scores == {"date": 1.0, "tva": 1.0}
+            assert rows["a"].manually_corrected
+            assert rows["b"].confidence_scores == {"date": 0.4, "tva": 0.9}
+            item = await session.scalar(select(ReviewItem))
+            assert item.status == "reviewed"
+
+    asyncio.run(scenario())
+
+
+def test_null_correction_clears_the_field_and_its_score():
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        async with factory() as session:
+            document = Document(
+                id="a", filename="a", file_path="/tmp/x", file_size=1, mime_type="pdf"
+            )
+            session.add(document)
+            session.add(
+                Extraction(
+                    document=document,
+                    extracted_data={"date": "2024-01-01", "tva": 2.0, "supplier": None},
+                    confidence_scores={"date": 0.4, "tva": 0.5, "supplier": 0.0},
+                    ocr_text="",
+                )
+            )
+            await session.commit()
+
+            await bulk_apply_corrections(
+                session, [{"document_id": "a", "extracted_data": {"tva": None, "date": "x"}}]
+            )
+            session.expire_all()
+            return await session.scalar(select(Extraction))
+
+    extraction = asyncio.run(scenario())
+    assert extraction.extracted_data == {"date": "x", "supplier": None}
+    assert extraction.confidence_scores == {"date": 1.0, "supplier": 0.0}
+
+    # The single-document path gives the same result.
+    single = Extraction(
+        extracted_data={"date": "2024-01-01", "tva": 2.0, "supplier": None},
+        confidence_scores={"date": 0.4, "tva": 0.5, "supplier": 0.0},
+    )
+    apply_correction(single, {"tva": None, "date": "x"})
+    assert single.extracted_data == extraction.extracted_data
+    assert single.confidence_scores == extraction.confidence_scores
+
+
+def test_bulk_and_single_corrections_replace_nested_fields_whole():
+    base = {
+        "supplier": {"name": "Globex", "vat_number": "FR12"},
+        "paid": True,
+        "line_items": [{"amount": 10.0}],
+        "tva": 2.0,
+    }
+    patch = {"supplier": {"name": "Initech"}, "paid": False}
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        async with factory() as session:
+            document = Document(
+                id="a", filename="a", file_path="/tmp/x", file_size=1, mime_type="pdf"
+            )
+            session.add(document)
+            session.add(
+                Extraction(
+                    document=document, extracted_data=base, confidence_scores={}, ocr_text=""
+                )
+            )
+            await session.commit()
+            await bulk_apply_corrections(session, [{"document_id": "a", "extracted_data": patch}])
+            session.expire_all()
+            return await session.scalar(select(Extraction))
+
+    extraction = asyncio.run(scenario())
+    # Top-level keys only, as with ``||`` on PostgreSQL: vat_number is not kept.
+    assert extraction.extracted_data == {
+        "supplier": {"name": "Initech"},
+        "paid": False,
+        "line_items": [{"amount": 10.0}],
+        "tva": 2.0,
+    }
+    single = Extraction(extracted_data=base, confidence_scores={})
+    apply_correction(single, patch)
+    assert single.extracted_data == extraction.extracted_data
+    assert single.confidence_scores == extraction.confidence_scores
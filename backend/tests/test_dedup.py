@@ -0,0 +1,209 @@
+import asyncio
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.models import Base, Document, DocumentFingerprint, Extraction, SignatureBand
+from app.services import dedup as dedup_module
+from app.services.dedup import (
+    DuplicateIndex,
+    Fingerprint,
+    MinHasher,
+    dhash,
+    hamming,
+)
+from app.services.extraction import ExtractionPipeline
+from app.services.storage import StorageService
+from app.services.text_extraction import ExtractedText
+from app.services.text_store import TEXT_ARTIFACT
+
+INVOICE = (
+    "FACTURE N° FA-2024-0042\nDate : 12/03/2024\nClient : Atelier Dupont SARL\n"
+    "Désignation Quantité Prix unitaire\nMaintenance annuelle 1 1 200,00\n"
+    "Déplacement technicien 2 85,00\nMontant HT 1 370,00 €\nTVA 20% 274,00 €\n"
+    "Montant TTC 1 644,00 €\n"
+    "Conditions : paiement à 30 jours, pénalités de retard 3x taux légal"
+)
+RESCAN = INVOICE.replace("Désignation", "Desiqnation").replace("Atelier", "Ateller")
+OTHER = (
+    "CONTRAT DE PRESTATION DE SERVICES\nEntre les soussignés, la société Martin Conseil "
+    "et le client désigné ci-après, il a été convenu ce qui suit. Article 1 : objet du "
+    "contrat. Article 2 : durée et résiliation. Article 3 : confidentialité des données."
+)
+
+
+def test_minhash_tolerates_ocr_noise():
+    hasher = MinHasher()
+    original, rescan, other = (hasher.signature(text) for text in (INVOICE, RESCAN, OTHER))
+    assert MinHasher.similarity(original, rescan) >= settings.duplicate_text_threshold
+    assert MinHasher.similarity(original, other) < 0.2
+    assert hasher.signature("trop court") is None
+
+
+def test_dhash_survives_rescaling_and_brightness():
+    rng = np.random.default_rng(0)
+    page = (rng.random((64, 48)) * 255).astype(np.uint8)
+    page = np.kron(page, np.ones((8, 8), dtype=np.uint8))
+    brighter = np.clip(page.astype(np.int16) + 20, 0, 255).astype(np.uint8)
+    assert hamming(dhash(page), dhash(brighter[::2, ::2])) <= 6
+    assert hamming(dhash(page), dhash(page[::-1])) > 20
+
+
+def _session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    return factory, create
+
+
+def _document(document_id, path):
+    return Document(
+        id=document_id,
+        filename=f"{document_id}.txt",
+        file_path=str(path),
+        file_size=path.stat().st_size,
+        mime_type="text/plain",
+        status="processing",
+    )
+
+
+def test_index_links_near_duplicates_through_lsh_bands():
+    factory, create = _session_factory()
+    hasher = MinHasher()
+
+    def fingerprint(content_hash, text):
+        return Fingerprint(content_hash, hasher.signature(text), None)
+
+    async def scenario():
+        await create()
+        async with factory() as session:
+            index = DuplicateIndex(session)
+            await index.add("a", fingerprint("h1", INVOICE), None)
+            await index.add("b", fingerprint("h2", OTHER), None)
+            await session.flush()
+
+            match = await index.find(fingerprint("h3", RESCAN), exclude="c")
+            assert match.document_id == "a" and match.kind == "text"
+            await index.add("c", fingerprint("h3", RESCAN), match)
+            await session.flush()
+
+            exact = await index.find(fingerprint("h3", "x"), exclude="d")
+            # Copies link to the original, not to each other.
+            assert (exact.document_id, exact.kind, exact.similarity) == ("a", "exact", 1.0)
+            assert await index.find(fingerprint("h4", OTHER[::-1]), exclude="e") is None
+
+    asyncio.run(scenario())
+
+
+
+def test_index_verifies_the_documents_sharing_most_bands(monkeypatch):
+    factory, create = _session_factory()
+    hasher = MinHasher()
+    monkeypatch.setattr(dedup_module, "MAX_CANDIDATES", 1)
+    probe = Fingerprint("h3", hasher.signature(RESCAN), None)
+
+    async def scenario():
+        await create()
+        async with factory() as session:
+            index = DuplicateIndex(session)
+            await index.add("strong", Fingerprint("h1", hasher.signature(INVOICE), None), None)
+            # Would be an exact match, but shares a single band with the probe.
+            session.add(DocumentFingerprint(document_id="a-weak", content_hash="h3"))
+            session.add(SignatureBand(band=probe.bands()[0], document_id="a-weak"))
+            await session.flush()
+            return await index.find(probe, exclude="c")
+
+    match = asyncio.run(scenario())
+    assert (match.document_id, match.kind) == ("strong", "text")
+
+
+class _Reader:
+    def __init__(self, text):
+        self.text = text
+
+    def extract(self, file_path, mime_type=None):
+        return ExtractedText.from_pages([self.text])
+
+
+class _Gemini:
+    def __init__(self):
+        self.calls = 0
+
+    def extract(self, text, fields=None):
+        self.calls += 1
+        return {"document_type": "invoice", "invoice_number": "FA-2024-0042", "supplier": "X"}
+
+
+def test_pipeline_reuses_the_siblings_extraction(tmp_path, monkeypatch):
+    factory, create = _session_factory()
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path)
+    monkeypatch.setattr(settings, "local_extraction_enabled", False)
+    monkeypatch.setattr(settings, "duplicate_reuse_extraction", True)
+    monkeypatch.setattr(settings, "duplicate_reuse_threshold", 0.85)
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    first.write_text(INVOICE, encoding="utf-8")
+    second.write_text(RESCAN, encoding="utf-8")
+    gemini = _Gemini()
+
+    async def scenario():
+        await create()
+        async with factory() as session:
+            session.add_all([_document("a", first), _document("b", second)])
+            await session.commit()
+            for document_id, text in (("a", INVOICE), ("b", RESCAN)):
+                pipeline = ExtractionPipeline(session, text_reader=_Reader(text), gemini=gemini)
+                await pipeline.run(document_id)
+            copy = await session.get(DocumentFingerprint, "b")
+            reused = await session.scalar(select(Extraction).where(Extraction.document_id == "b"))
+            return copy, reused
+
+    copy, reused = asyncio.run(scenario())
+    assert gemini.calls == 1
+    assert copy.duplicate_of == "a" and copy.similarity >= 0.85
+    assert reused.extracted_data["invoice_number"] == "FA-2024-0042"
+
+
+def test_pipeline_reuses_a_stored_copy_without_reading_it(tmp_path, monkeypatch):
+    factory, create = _session_factory()
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path)
+    monkeypatch.setattr(settings, "local_extraction_enabled", False)
+    monkeypatch.setattr(settings, "duplicate_reuse_extraction", True)
+    path = tmp_path / "a.txt"
+    path.write_text(INVOICE, encoding="utf-8")
+    reads = []
+
+    class Reader(_Reader):
+        def extract(self, file_path, mime_type=None):
+            reads.append(file_path)
+            return super().extract(file_path, mime_type)
+
+    reader, gemini = Reader(INVOICE), _Gemini()
+
+    async def scenario():
+        await create()
+        async with factory() as session:
+            for document_id in ("a", "b"):
+                document = _document(document_id, path)
+                document.content_hash = "same-bytes"
+                session.add(document)
+            await session.commit()
+            for document_id in ("a", "b"):
+                await ExtractionPipeline(session, text_reader=reader, gemini=gemini).run(document_id)
+            copy = await session.get(DocumentFingerprint, "b")
+            rows = {
+                row.document_id: row for row in await session.scalars(select(Extraction))
+            }
+            return copy, rows
+
+    copy, rows = asyncio.run(scenario())
+    assert len(reads) == 1 and gemini.calls == 1
+    assert copy.duplicate_of == "a" and copy.similarity == 1.0
+    assert rows["b"].ocr_text == rows["a"].ocr_text
+    assert rows["b"].extracted_data == rows["a"].extracted_data
+    assert StorageService().artifact_path("b", TEXT_ARTIFACT) is not None
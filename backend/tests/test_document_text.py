@@ -0,0 +1,113 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.endpoints import documents as documents_endpoint
+from app.core.config import settings
+from app.core.database import get_session
+from app.main import app
+from app.models import Base, Document, Extraction
+from app.services.storage import StorageService
+from app.services.text_extraction import join_pages
+from app.services.text_store import TEXT_ARTIFACT, encode_text_store
+
+PAGES = ["Facture 1", "", "Total TTC 12,00 €", "Conditions générales"]
+
+
+def test_join_pages_keeps_empty_pages_addressable():
+    text, offsets = join_pages(PAGES)
+    assert text == "Facture 1\n\nTotal TTC 12,00 €\n\nConditions générales"
+    assert len(offsets) == len(PAGES) + 1
+    slices = [text[offsets[i] : offsets[i + 1]].strip() for i in range(len(PAGES))]
+    assert slices == PAGES
+    assert join_pages([]) == ("", [0])
+
+
+def _client(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    text, offsets = join_pages(PAGES)
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            for document_id, page_offsets in (("paged", offsets), ("legacy", None)):
+                document = Document(
+                    id=document_id,
+                    filename="a.pdf",
+                    file_path="/tmp/a.pdf",
+                    file_size=1,
+                    mime_type="application/pdf",
+                    status="completed",
+                )
+                session.add(document)
+                session.add(
+                    Extraction(
+                        document=document,
+                        extracted_data={},
+                        confidence_scores={},
+                        ocr_text=text,
+                        page_offsets=page_offsets,
+                    )
+                )
+            await session.commit()
+
+    asyncio.run(seed())
+
+    async def override_session():
+        async with factory() as session:
+            yield session
+
+    monkeypatch.setitem(app.dependency_overrides, get_session, override_session)
+    monkeypatch.setattr(documents_endpoint, "get_response_cache", lambda: None)
+    return TestClient(app), text
+
+
+def test_text_endpoint_serves_page_and_character_ranges(tmp_path, monkeypatch):
+    client, text = _client(tmp_path, monkeypatch)
+
+    page = client.get("/api/v1/documents/paged/text?page=2")
+    body = page.json()
+    assert body["text"].strip() == PAGES[2]
+    assert (body["page_start"], body["page_end"], body["page_count"]) == (2, 3, 4)
+    assert client.get(
+        "/api/v1/documents/paged/text?page=2", headers={"If-None-Match": page.headers["etag"]}
+    ).status_code == 304
+
+    both = client.get("/api/v1/documents/paged/text?page=2&pages=5").json()
+    assert both["text"] == text[both["start"] :] and both["page_end"] == 4
+    assert client.get("/api/v1/documents/paged/text?page=4").status_code == 404
+
+    span = client.get("/api/v1/documents/paged/text?start=11&length=9").json()
+    assert span["text"] == "Total TTC"
+    assert (span["page_start"], span["page_end"]) == (2, 3)
+
+    legacy = client.get("/api/v1/documents/legacy/text").json()
+    assert legacy["page_count"] == 1 and legacy["text"] == text
+    assert client.get("/api/v1/documents/missing/text").status_code == 404
+
+
+def test_text_endpoint_prefers_the_text_store(tmp_path, monkeypatch):
+    client, text = _client(tmp_path, monkeypatch)
+    _, offsets = join_pages(PAGES)
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path)
+    StorageService().save_artifact("legacy", TEXT_ARTIFACT, encode_text_store(text, offsets))
+
+    page = client.get("/api/v1/documents/legacy/text?page=2").json()
+    assert page["page_count"] == 4 and page["text"].strip() == PAGES[2]
+    span = client.get("/api/v1/documents/legacy/text?start=11&length=9").json()
+    assert span["text"] == "Total TTC"
+
+
+def test_get_document_omits_text_unless_requested(tmp_path, monkeypatch):
+    client, text = _client(tmp_path, monkeypatch)
+
+    summary = client.get("/api/v1/documents/paged").json()
+    assert "ocr_text" not in summary
+    assert summary["text_length"] == len(text) and summary["page_count"] == 4
+
+    full = client.get("/api/v1/documents/paged?include_text=true")
+    assert full.json()["ocr_text"] == text
+    assert full.headers["etag"] != client.get("/api/v1/documents/paged").headers["etag"]
@@ -0,0 +1,144 @@
+import io
+import zipfile
+
+from docx import Document as DocxDocument
+
+from app.core.config import settings
+from app.core.security import (
+    DOC_MIME_TYPE,
+    DOCX_MIME_TYPE,
+    MAGIC_BYTES,
+    OLE2_MAGIC,
+    detect_mime_type,
+)
+from app.services.docx_reader import DOCUMENT_PART, iter_docx_blocks, read_docx
+from app.services.local_extraction import LocalInvoiceExtractor
+from app.services.text_extraction import TextExtractionService
+
+
+def _invoice_docx(path):
+    doc = DocxDocument()
+    doc.add_paragraph("FACTURE N° FA-2024-0042")
+    doc.add_paragraph("Date : 12/03/2024")
+    doc.add_paragraph("")
+    items = doc.add_table(rows=3, cols=4)
+    for row, values in zip(
+        items.rows,
+        (
+            ("Désignation", "Quantité", "Prix unitaire", "Total"),
+            ("Maintenance annuelle", "1", "1 200,00", "1 200,00"),
+            ("Déplacement", "2", "85,00", "170,00"),
+        ),
+    ):
+        for cell, value in zip(row.cells, values):
+            cell.text = value
+    totals = doc.add_table(rows=3, cols=3)
+    amounts = (("Montant HT", "1 370,00"), ("TVA 20%", "274,00"), ("Montant TTC", "1 644,00"))
+    for row, (label, value) in zip(totals.rows, amounts):
+        row.cells[0].text = label
+        row.cells[2].text = value
+    nested = totals.rows[0].cells[1].add_table(rows=1, cols=2)
+    nested.rows[0].cells[0].text = "Remise"
+    nested.rows[0].cells[1].text = "0,00"
+    doc.add_paragraph("Conditions : paiement à 30 jours")
+    doc.save(path)
+
+
+def test_tables_are_read_in_order_one_row_per_line(tmp_path):
+    path = tmp_path / "invoice.docx"
+    _invoice_docx(path)
+
+    blocks = list(iter_docx_blocks(path))
+    assert blocks[0] == "FACTURE N° FA-2024-0042"
+    assert blocks[2].splitlines()[1] == "Maintenance annuelle | 1 | 1 200,00 | 1 200,00"
+    # Empty cells are dropped, so amounts sit right after their labels.
+    totals = blocks[3].splitlines()
+    assert totals[0] == "Montant HT | Remise | 0,00 | 1 370,00"
+    assert totals[2] == "Montant TTC | 1 644,00"
+    assert blocks[-1] == "Conditions : paiement à 30 jours"
+
+    text, starts = read_docx(path)
+    assert [text[start:].split("\n", 1)[0] for start in starts[:2]] == blocks[0:2]
+    fields = LocalInvoiceExtractor().extract(text).values(0.9)
+    assert (fields["amount_ht"], fields["tva"], fields["amount_ttc"]) == (1370.0, 274.0, 1644.0)
+
+
+def test_word_files_are_sniffed_and_legacy_doc_fails_soft(tmp_path, monkeypatch):
+    path = tmp_path / "invoice.docx"
+    _invoice_docx(path)
+    assert detect_mime_type(path.read_bytes()[:MAGIC_BYTES]) == DOCX_MIME_TYPE
+    assert detect_mime_type(OLE2_MAGIC + b"\0" * 56) == DOC_MIME_TYPE
+
+    extracted = TextExtractionService().extract(str(path), DOCX_MIME_TYPE)
+    assert "Montant TTC | 1 644,00" in extracted.text
+    # Paragraphs and whole tables are blocks; the empty paragraph is skipped.
+    assert len(extracted.block_offsets) == 5
+
+    legacy = tmp_path / "old.doc"
+    legacy.write_bytes(OLE2_MAGIC + b"\0" * 512)
+    monkeypatch.setattr(settings, "doc_converter", str(tmp_path / "missing-soffice"))
+    assert TextExtractionService().extract(str(legacy), DOC_MIME_TYPE).text == ""
+
+
+def _ooxml_package(path, main_part, compression=zipfile.ZIP_DEFLATED):
+    with zipfile.ZipFile(path, "w", compression) as package:
+        package.writestr("[Content_Types].xml", "<Types/>")
+        package.writestr("_rels/.rels", "<Relationships/>")
+        package.writestr(main_part, "<root/>" * 200)
+
+
+def test_other_office_packages_are_not_taken_for_word(tmp_path):
+    others = (("book.xlsx", "xl/workbook.xml"), ("deck.pptx", "ppt/presentation.xml"))
+    for name, main_part in others:
+        path = tmp_path / name
+        _ooxml_package(path, main_part)
+        assert detect_mime_type(path.read_bytes()[:MAGIC_BYTES]) is None
+
+    # The same layout with the Word main part, stored or streamed, is a DOCX.
+    stored = tmp_path / "stored.docx"
+    _ooxml_package(stored, "word/document.xml", zipfile.ZIP_STORED)
+    assert detect_mime_type(stored.read_bytes()) == DOCX_MIME_TYPE
+    streamed = io.BytesIO()
+    with zipfile.ZipFile(_Unseekable(streamed), "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", "<Types/>")
+        package.writestr("word/document.xml", "<w:document/>")
+    assert detect_mime_type(streamed.getvalue()) == DOCX_MIME_TYPE
+
+
+class _Unseekable(io.RawIOBase):
+    """Makes zipfile write data descriptors, with zero sizes in the local headers."""
+
+    def __init__(self, target):
+        self.target = target
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.target.write(data)
+
+    def seekable(self):
+        return False
+
+
+def _paragraph(text):
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def test_a_table_in_a_text_box_does_not_swallow_the_rest(tmp_path):
+    text_box_table = (
+        "<w:p><w:r><w:pict><v:shape><v:textbox><w:txbxContent><w:tbl><w:tr>"
+        f"<w:tc>{_paragraph('Total')}</w:tc><w:tc>{_paragraph('100')}</w:tc>"
+        "</w:tr></w:tbl></w:txbxContent></v:textbox></v:shape></w:pict></w:r></w:p>"
+    )
+    body = _paragraph("Before") + text_box_table + _paragraph("After")
+    path = tmp_path / "text-box.docx"
+    with zipfile.ZipFile(path, "w") as package:
+        package.writestr("[Content_Types].xml", "<Types/>")
+        package.writestr(
+            DOCUMENT_PART,
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+            f'xmlns:v="urn:schemas-microsoft-com:vml"><w:body>{body}</w:body></w:document>',
+        )
+
+    assert list(iter_docx_blocks(path)) == ["Before", "Total | 100", "After"]
@@ -0,0 +1,170 @@
+import asyncio
+import os
+
+import fitz
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.endpoints import files as files_endpoint
+from app.core.database import get_session
+from app.core.file_response import RangeFileResponse, parse_range
+from app.main import app
+from app.models import Base, Document
+from app.services.thumbnails import ThumbnailCache
+
+
+def _pdf(path, pages=3):
+    doc = fitz.open()
+    for number in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {number}")
+    doc.save(path)
+    doc.close()
+
+
+def _client(tmp_path, monkeypatch, file_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            session.add(
+                Document(
+                    id="doc",
+                    filename="a.pdf",
+                    file_path=str(file_path),
+                    file_size=file_path.stat().st_size,
+                    mime_type="application/pdf",
+                    status="completed",
+                )
+            )
+            await session.commit()
+
+    asyncio.run(seed())
+
+    async def override_session():
+        async with factory() as session:
+            yield session
+
+    cache = ThumbnailCache(root=tmp_path / "thumbnails")
+    monkeypatch.setitem(app.dependency_overrides, get_session, override_session)
+    monkeypatch.setattr(files_endpoint, "get_thumbnail_cache", lambda: cache)
+    return TestClient(app), cache
+
+
+def test_parse_range_forms():
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    assert parse_range("bytes=100-", 100) is None
+    for ignored in ("bytes=0-1,5-6", "items=0-1", "bytes=-"):
+        try:
+            parse_range(ignored, 100)
+        except ValueError:
+            continue
+        raise AssertionError(ignored)
+
+
+def test_zero_copy_extension_receives_the_range(tmp_path):
+    source = tmp_path / "blob.bin"
+    source.write_bytes(bytes(range(256)))
+    messages = []
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            os.lseek(message["file"], message["offset"], os.SEEK_SET)
+            message = {**message, "data": os.read(message["file"], message["count"])}
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "headers": [(b"range", b"bytes=16-31")],
+        "extensions": {"http.response.zerocopysend": {}},
+    }
+    asyncio.run(RangeFileResponse(source)(scope, None, send))
+    assert messages[0]["status"] == 206
+    assert messages[1]["type"] == "http.response.zerocopysend"
+    assert messages[1]["data"] == bytes(range(16, 32))
+
+
+def test_download_serves_byte_ranges(tmp_path, monkeypatch):
+    source = tmp_path / "a.pdf"
+    _pdf(source)
+    data = source.read_bytes()
+    client, _ = _client(tmp_path, monkeypatch, source)
+
+    full = client.get("/api/v1/files/doc")
+    assert full.status_code == 200
+    assert full.content == data
+    assert full.headers["accept-ranges"] == "bytes"
+
+    partial = client.get("/api/v1/files/doc", headers={"Range": "bytes=10-29"})
+    assert partial.status_code == 206
+    assert partial.content == data[10:30]
+    assert partial.headers["content-range"] == f"bytes 10-29/{len(data)}"
+
+    stale = client.get("/api/v1/files/doc", headers={"Range": "bytes=0-9", "If-Range": '"x"'})
+    assert stale.status_code == 200 and stale.content == data
+
+    unsatisfiable = client.get("/api/v1/files/doc", headers={"Range": f"bytes={len(data)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(data)}"
+
+    head = client.head("/api/v1/files/doc")
+    assert head.status_code == 200 and head.content == b""
+    assert client.get("/api/v1/files/missing").status_code == 404
+
+
+def test_thumbnails_are_cached_and_evicted(tmp_path, monkeypatch):
+    source = tmp_path / "a.pdf"
+    _pdf(source)
+    client, cache = _client(tmp_path, monkeypatch, source)
+
+    assert client.get("/api/v1/files/doc/pages").json()["page_count"] == 3
+    first = client.get("/api/v1/files/doc/pages/0/thumbnail?width=64")
+    assert first.status_code == 200
+    assert first.content.startswith(b"\x89PNG")
+    cached = cache.path_for("doc", 0, 64)
+    os.utime(cached, (1, 1))
+    assert client.get("/api/v1/files/doc/pages/0/thumbnail?width=64").content == first.content
+    assert cached.stat().st_mtime > 1
+    assert client.get("/api/v1/files/doc/pages/9/thumbnail").status_code == 404
+
+    client.get("/api/v1/files/doc/pages/1/thumbnail?width=64")
+    client.get("/api/v1/files/doc/pages/2/thumbnail?width=64")
+    os.utime(cache.path_for("doc", 1, 64), (1, 1))
+    cache.max_bytes = sum(
+        cache.path_for("doc", page, 64).stat().st_size for page in (0, 2)
+    )
+    cache.evict()
+    assert not cache.path_for("doc", 1, 64).exists()
+    assert cache.path_for("doc", 0, 64).exists() and cache.path_for("doc", 2, 64).exists()
+
+
+def test_thumbnail_renders_under_the_limit_do_not_rescan(tmp_path, monkeypatch):
+    source = tmp_path / "a.pdf"
+    _pdf(source)
+    client, cache = _client(tmp_path, monkeypatch, source)
+    scans = []
+    scan = cache._scan
+    monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or scan())
+
+    for page in range(3):
+        client.get(f"/api/v1/files/doc/pages/{page}/thumbnail?width=64")
+    assert len(scans) == 1
+    sizes = [cache.path_for("doc", page, 64).stat().st_size for page in range(3)]
+    assert cache._size == sum(sizes)
+
+    cache.clear("doc")
+    assert cache._size == 0
+    cache.max_bytes = max(sizes)
+    client.get("/api/v1/files/doc/pages/0/thumbnail?width=64")
+    os.utime(cache.path_for("doc", 0, 64), (1, 1))
+    assert len(scans) == 1
+    client.get("/api/v1/files/doc/pages/1/thumbnail?width=64")
+    assert len(scans) == 2
+    assert not cache.path_for("doc", 0, 64).exists()
+    assert cache._size == sizes[1]
@@ -0,0 +1,107 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.endpoints import documents as documents_endpoint
+from app.core.database import get_session
+from app.main import app
+from app.models import Base, Document, Extraction
+from app.services import response_cache
+from app.services.response_cache import MemoryResponseCache
+
+
+def _client(tmp_path, monkeypatch, cache=None):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            document = Document(
+                id="doc",
+                filename="a.pdf",
+                file_path="/tmp/a.pdf",
+                file_size=1,
+                mime_type="application/pdf",
+                status="completed",
+            )
+            session.add(document)
+            session.add(
+                Extraction(
+                    document=document,
+                    extracted_data={"amount_ttc": 10.0},
+                    confidence_scores={"amount_ttc": 0.5},
+                    ocr_text="text",
+                )
+            )
+            await session.commit()
+
+    asyncio.run(seed())
+
+    async def override_session():
+        async with factory() as session:
+            yield session
+
+    monkeypatch.setitem(app.dependency_overrides, get_session, override_session)
+    monkeypatch.setattr(documents_endpoint, "get_response_cache", lambda: cache)
+    monkeypatch.setattr(response_cache, "get_response_cache", lambda: cache)
+    return TestClient(app)
+
+
+def test_document_etag_revalidates_and_changes_on_correction(tmp_path, monkeypatch):
+    client = _client(tmp_path, monkeypatch)
+    first = client.get("/api/v1/documents/doc")
+    etag = first.headers["etag"]
+    assert first.headers["last-modified"]
+
+    assert client.get("/api/v1/documents/doc", headers={"If-None-Match": etag}).status_code == 304
+    modified_since = {"If-Modified-Since": first.headers["last-modified"]}
+    assert client.get("/api/v1/documents/doc", headers=modified_since).status_code == 304
+
+    listing = client.get("/api/v1/documents")
+    list_etag = listing.headers["etag"]
+    assert client.get("/api/v1/documents", headers={"If-None-Match": list_etag}).status_code == 304
+
+    client.patch("/api/v1/documents/doc/extracted-data", json={"extracted_data": {"tva": 2.0}})
+    refreshed = client.get("/api/v1/documents/doc", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["extracted_data"]["tva"] == 2.0
+    assert client.get("/api/v1/documents", headers={"If-None-Match": list_etag}).status_code == 200
+
+
+def test_completed_documents_are_served_from_cache_until_invalidated(tmp_path, monkeypatch):
+    cache = MemoryResponseCache(max_entries=10, ttl=60)
+    client = _client(tmp_path, monkeypatch, cache)
+
+    first = client.get("/api/v1/documents/doc")
+    assert cache.get("response:document:doc")["payload"] == first.json()
+
+    # A cache hit answers without touching the database.
+    cache.set(
+        "response:document:doc",
+        {**cache.get("response:document:doc"), "payload": {"id": "doc", "from": "cache"}},
+    )
+    assert client.get("/api/v1/documents/doc").json() == {"id": "doc", "from": "cache"}
+    cached_etag = first.headers["etag"]
+    hit = client.get("/api/v1/documents/doc", headers={"If-None-Match": cached_etag})
+    assert hit.status_code == 304
+
+    client.patch("/api/v1/documents/doc/extracted-data", json={"extracted_data": {"tva": 1.0}})
+    assert cache.get("response:document:doc") is None
+    assert client.get("/api/v1/documents/doc").json()["extracted_data"]["tva"] == 1.0
+
+
+def test_list_etag_changes_when_a_document_changes_status(tmp_path, monkeypatch):
+    client = _client(tmp_path, monkeypatch)
+    list_etag = client.get("/api/v1/documents").headers["etag"]
+
+    async def reprocess():
+        async for session in app.dependency_overrides[get_session]():
+            document = await session.get(Document, "doc")
+            document.status = "processing"
+            await session.commit()
+
+    asyncio.run(reprocess())
+    assert client.get("/api/v1/documents", headers={"If-None-Match": list_etag}).status_code == 200
@@ -0,0 +1,55 @@
+import io
+
+import fitz
+from PIL import Image
+
+from app.services import text_extraction
+from app.services.layout import WordBoxes
+from app.services.text_extraction import ImageOCRCache, TextExtractionService
+
+
+def _png(size, shade):
+    buffer = io.BytesIO()
+    Image.new("L", size, shade).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _scanned_pdf():
+    """Two image-only pages: a letterhead on both (once through a second xref
+    with the same stream) and a tiny stamp on the first."""
+
+    doc = fitz.open()
+    letterhead = _png((120, 80), 100)
+    first = doc.new_page()
+    xref = first.insert_image(fitz.Rect(50, 50, 290, 210), stream=letterhead)
+    first.insert_image(fitz.Rect(300, 50, 310, 60), stream=_png((10, 10), 0))
+    second = doc.new_page()
+    second.insert_image(fitz.Rect(50, 50, 290, 210), stream=letterhead)
+    copy = doc.get_new_xref()
+    doc.update_object(copy, doc.xref_object(xref))
+    doc.update_stream(copy, doc.xref_stream_raw(xref), compress=False)
+    second.insert_image(fitz.Rect(50, 300, 290, 460), xref=copy)
+    return doc, xref, copy
+
+
+def test_repeated_images_are_ocrd_once_and_tiny_ones_skipped(monkeypatch):
+    calls = []
+
+    def fake_ocr(gray, source="", lang=None):
+        calls.append((source, gray.shape))
+        return "ACME SARL", WordBoxes()
+
+    monkeypatch.setattr(text_extraction, "ocr_adaptive", fake_ocr)
+    monkeypatch.setattr(text_extraction, "page_languages", lambda gray, source: None)
+    doc, xref, copy = _scanned_pdf()
+    assert {image[0] for image in doc[1].get_images()} == {xref, copy}
+
+    service = TextExtractionService()
+    cache = ImageOCRCache(doc, min_side=48)
+    texts = [service._ocr_pdf_page(page, cache)[0] for page in doc]
+
+    assert calls == [(f"image xref {xref}", (80, 120))]
+    assert cache.ocr_runs == 1
+    assert cache.reused == 2
+    assert cache.skipped == 1
+    assert texts == ["ACME SARL", "ACME SARL\nACME SARL"]
@@ -0,0 +1,145 @@
+import asyncio
+import functools
+import hashlib
+import io
+import tarfile
+import zipfile
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.endpoints import ingest as ingest_endpoint
+from app.core.config import settings
+from app.core.database import get_session
+from app.main import app
+from app.models import Base, Document
+from app.services.ingest import BulkIngestor, iter_archive, iter_directory
+from app.services.storage import StorageService
+
+PDF = b"%PDF-1.4\n" + b"0" * 2048
+PNG = b"\x89PNG\r\n\x1a\n" + b"1" * 64
+
+
+def _run(members, tmp_path, batch_size=2):
+    enqueued: list[list[str]] = []
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        async with factory() as session:
+            ingestor = BulkIngestor(
+                session,
+                storage=StorageService(tmp_path / "store"),
+                batch_size=batch_size,
+                enqueue=enqueued.append,
+            )
+            report = await ingestor.ingest(members)
+            documents = list(await session.scalars(select(Document)))
+        return report, documents
+
+    report, documents = asyncio.run(scenario())
+    return report, documents, enqueued
+
+
+def test_tar_stream_is_ingested_in_batches(tmp_path):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in [
+            ("a/scan.pdf", PDF),
+            ("b/scan.pdf", PDF),
+            ("notes.txt", b"hello"),
+            ("c/photo.png", PNG),
+        ]:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    buffer.seek(0)
+
+    report, documents, enqueued = _run(iter_archive(buffer), tmp_path)
+
+    assert report.created == 3 and report.skipped == 1
+    assert report.skipped_items == [{"name": "notes.txt", "reason": "unsupported file type"}]
+    assert [len(batch) for batch in enqueued] == [2, 1]
+    assert sorted(doc.mime_type for doc in documents) == [
+        "application/pdf",
+        "application/pdf",
+        "image/png",
+    ]
+    # Repeated basenames must not overwrite each other on disk.
+    paths = {doc.file_path for doc in documents}
+    assert len(paths) == 3
+    for doc in documents:
+        with open(doc.file_path, "rb") as handle:
+            assert hashlib.sha256(handle.read()).hexdigest() == doc.content_hash
+    assert {doc.content_hash for doc in documents} == {
+        hashlib.sha256(PDF).hexdigest(),
+        hashlib.sha256(PNG).hexdigest(),
+    }
+
+
+def test_zip_and_directory_sources(tmp_path):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("one.pdf", PDF)
+        archive.writestr("dir/", b"")
+    buffer.seek(0)
+    report, _, _ = _run(iter_archive(buffer), tmp_path)
+    assert report.created == 1 and report.skipped == 0
+
+    source = tmp_path / "source"
+    (source / "nested").mkdir(parents=True)
+    (source / "x.pdf").write_bytes(PDF)
+    (source / "nested" / "y.png").write_bytes(PNG)
+    names = [member.name for member in iter_directory(source)]
+    assert names == ["x.pdf", "nested/y.png"]
+    assert [m.name for m in iter_directory(source, recursive=False)] == ["x.pdf"]
+
+
+def test_archive_endpoint_returns_created_ids_and_caps_the_body(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create())
+
+    async def override_session():
+        async with factory() as session:
+            yield session
+
+    enqueued: list[list[str]] = []
+    monkeypatch.setitem(app.dependency_overrides, get_session, override_session)
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path / "uploads")
+    monkeypatch.setattr(
+        ingest_endpoint, "BulkIngestor", functools.partial(BulkIngestor, enqueue=enqueued.append)
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("one.pdf", PDF)
+        archive.writestr("two.png", PNG)
+    client = TestClient(app)
+
+    response = client.post("/api/v1/ingest/archive", content=buffer.getvalue())
+    assert response.status_code == 201
+    body = response.json()
+    assert body["created"] == 2 and len(body["documents"]) == 2
+    assert enqueued == [body["documents"]]
+
+    truncated = client.post("/api/v1/ingest/archive", content=buffer.getvalue()[:100])
+    assert truncated.status_code == 400
+    assert "Unsupported archive format" in truncated.json()["detail"]
+
+    monkeypatch.setattr(settings, "ingest_max_archive_mb", 0)
+    assert client.post("/api/v1/ingest/archive", content=buffer.getvalue()).status_code == 413
+
+    def chunks():
+        yield buffer.getvalue()
+
+    # Without a Content-Length the cap applies while spooling.
+    chunked = client.post("/api/v1/ingest/archive", content=chunks())
+    assert chunked.status_code == 413
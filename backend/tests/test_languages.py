@@ -0,0 +1,56 @@
+import fitz
+
+from app.core.config import settings
+from app.services import languages
+from app.services.languages import page_languages, select_languages
+from app.services.layout import WordBoxes
+from app.services.rasterize import pixmap_array, render_page
+
+FRENCH = (
+    "Facture pour la maintenance des équipements du site. Le montant est payable à "
+    "30 jours par virement sur le compte indiqué dans votre contrat."
+)
+ENGLISH = (
+    "Invoice for the maintenance of the equipment on site. The amount is due within "
+    "30 days by transfer to the account shown in your contract."
+)
+
+
+def test_single_language_pages_keep_one_traineddata():
+    assert select_languages(FRENCH, ("fra", "eng")).languages == ("fra",)
+    assert select_languages(ENGLISH, ("fra", "eng", "deu")).languages == ("eng",)
+
+
+def test_mixed_short_and_other_script_samples():
+    mixed = select_languages(f"{FRENCH}\n{ENGLISH}", ("fra", "eng"))
+    assert mixed.languages == ("fra", "eng")
+    # Too few stop words to decide: keep every candidate.
+    assert select_languages("TOTAL 120,00", ("fra", "eng")).languages == ("fra", "eng")
+    cyrillic = "Счёт на оплату № 42 от 12 марта, итого к оплате 120 рублей"
+    assert select_languages(cyrillic, ("fra", "eng", "rus")).languages == ("rus",)
+
+
+def test_page_sample_is_downscaled_and_drives_the_choice(monkeypatch):
+    doc = fitz.open()
+    page = doc.new_page()
+    y = 60
+    while y < 780:
+        page.insert_text((40, y), "Le montant de la facture est payable sous 30 jours", fontsize=11)
+        y += 18
+    pix = render_page(page, dpi=300)
+    gray = pixmap_array(pix)
+    samples = []
+
+    def fake_ocr(array, lang=None, config=""):
+        samples.append((array.shape, lang))
+        return FRENCH, WordBoxes()
+
+    monkeypatch.setattr(languages, "ocr_array", fake_ocr)
+    monkeypatch.setattr(settings, "ocr_languages", "fra+eng")
+    assert page_languages(gray) == "fra"
+    (shape, lang), = samples
+    assert lang == "fra+eng"
+    assert shape[0] * shape[1] < gray.size / 2
+
+    monkeypatch.setattr(settings, "ocr_language_detection", False)
+    assert page_languages(gray) is None
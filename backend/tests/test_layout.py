@@ -0,0 +1,79 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services.layout import LAYOUT_ARTIFACT, DocumentLayout, LayoutBuilder, WordBoxes
+from app.services.storage import StorageService
+
+
+def _boxes(words, line=None):
+    count = len(words)
+    return WordBoxes(
+        words=list(words),
+        boxes=np.arange(count * 4, dtype=np.float32).reshape(count, 4),
+        conf=np.linspace(0.5, 1.0, count, dtype=np.float32),
+        line=np.asarray(line if line is not None else [0] * count, dtype=np.int32),
+    )
+
+
+def _layout():
+    builder = LayoutBuilder(unit="pt")
+    first = _boxes(["Facture", "F-42", "Total", "120,00"], line=[0, 0, 1, 1])
+    builder.add_page(595.0, 842.0, "Facture F-42\nTotal 120,00", first)
+    builder.add_page(595.0, 842.0, "", WordBoxes())
+    builder.add_page(612.0, 792.0, "Merci €", _boxes(["Merci", "€", "absent"]))
+    return builder.build()
+
+
+def test_transformed_maps_boxes_and_keeps_words():
+    words = _boxes(["a", "b"])
+    moved = words.transformed(10, 20, 0.5, 2)
+    assert moved.words == ["a", "b"]
+    assert moved.boxes[1].tolist() == [4 * 0.5 + 10, 5 * 2 + 20, 6 * 0.5 + 10, 7 * 2 + 20]
+    assert moved.conf is words.conf and moved.line is words.line
+
+
+def test_concat_shifts_line_ids_and_skips_empty_parts():
+    merged = WordBoxes.concat([_boxes(["a", "b"], [0, 1]), WordBoxes(), _boxes(["c"], [0])])
+    assert merged.words == ["a", "b", "c"]
+    assert merged.line.tolist() == [0, 1, 2]
+    assert merged.boxes.shape == (3, 4)
+    empty = WordBoxes.concat([WordBoxes(), WordBoxes()])
+    assert len(empty) == 0 and empty.boxes.shape == (0, 4)
+
+
+def test_layout_round_trips_through_bytes_with_empty_pages():
+    layout = _layout()
+    restored = DocumentLayout.from_bytes(layout.to_bytes())
+
+    assert restored.unit == "pt" and restored.page_count == 3
+    assert restored.words == layout.words
+    assert restored.words == ["Facture", "F-42", "Total", "120,00", "Merci", "€", "absent"]
+    for name in ("page_sizes", "page", "boxes", "conf", "line", "start", "end"):
+        assert np.array_equal(getattr(restored, name), getattr(layout, name)), name
+    # Pages with text are joined by a blank line, empty pages add nothing, and
+    # words missing from the text get -1.
+    assert restored.start.tolist() == [0, 8, 13, 19, 27, 33, -1]
+    assert restored.page_payload(1)["words"] == []
+    assert [restored.words[i] for i in restored.words_in_span(8, 18)] == ["F-42", "Total"]
+
+    assert LayoutBuilder(unit="px").build() is None
+    blank = LayoutBuilder(unit="px")
+    blank.add_page(100.0, 100.0, "", WordBoxes())
+    assert DocumentLayout.from_bytes(blank.build().to_bytes()).words == []
+
+
+def test_layout_endpoint_serves_a_page(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path)
+    StorageService().save_artifact("doc", LAYOUT_ARTIFACT, _layout().to_bytes())
+    client = TestClient(app)
+
+    response = client.get("/api/v1/documents/doc/layout", params={"page": 2})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["page"], body["page_count"], body["width"]) == (2, 3, 612.0)
+    assert [word["text"] for word in body["words"]] == ["Merci", "€", "absent"]
+
+    assert client.get("/api/v1/documents/doc/layout", params={"page": 3}).status_code == 404
+    assert client.get("/api/v1/documents/missing/layout").status_code == 404
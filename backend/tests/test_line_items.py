@@ -0,0 +1,129 @@
+import asyncio
+
+import fitz
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.models import Base, Document, Extraction
+from app.services.extraction import ExtractionPipeline
+from app.services.line_items import LineItemExtractor
+from app.services.text_extraction import TextExtractionService
+
+HEADER = ((40, "Désignation"), (300, "Qté"), (360, "Prix unitaire"), (480, "Total HT"))
+ROWS = (
+    ("Maintenance annuelle", "1", "1 200,00", "1 200,00"),
+    ("Déplacement technicien", "2", "85,00", "170,00"),
+    ("Pièces détachées", "3", "12,50", "37,50"),
+)
+
+
+def _invoice_pdf(path):
+    """Born-digital invoice: left-aligned descriptions, right-aligned numbers."""
+
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((40, 60), "FACTURE N° FA-42", fontsize=12)
+    page.insert_text((40, 78), "Date : 12/03/2024", fontsize=10)
+    y = 200
+    right_edges = {}
+    for x, title in HEADER:
+        page.insert_text((x, y), title, fontsize=10)
+        right_edges[x] = x + fitz.get_text_length(title, fontsize=10)
+    for row in ROWS:
+        y += 16
+        for (x, _), value in zip(HEADER, row):
+            if x > 40:
+                x = right_edges[x] - fitz.get_text_length(value, fontsize=10)
+            page.insert_text((x, y), value, fontsize=10)
+    page.insert_text((40, y + 14), "avec kit de fixation", fontsize=10)
+    for offset, (label, amount) in enumerate(
+        (("Montant HT", "1 407,50"), ("TVA 20%", "281,50"), ("Montant TTC", "1 689,00"))
+    ):
+        page.insert_text((360, y + 60 + offset * 16), label, fontsize=10)
+        page.insert_text((480, y + 60 + offset * 16), amount, fontsize=10)
+    doc.save(path)
+
+
+def test_items_come_from_word_positions_and_match_the_totals(tmp_path):
+    path = tmp_path / "invoice.pdf"
+    _invoice_pdf(path)
+    extracted = TextExtractionService().extract(str(path))
+
+    table = LineItemExtractor().extract(extracted.layout, extracted.text)
+    rows = [(item.description, item.quantity, item.unit_price, item.amount) for item in table.items]
+    assert rows == [
+        ("Maintenance annuelle", 1.0, 1200.0, 1200.0),
+        ("Déplacement technicien", 2.0, 85.0, 170.0),
+        # The wrapped second line joins the description; the totals block is not an item.
+        ("Pièces détachées avec kit de fixation", 3.0, 12.5, 37.5),
+    ]
+    assert table.total == 1407.5
+    assert table.reconcile({"amount_ht": 1407.5, "amount_ttc": 1689.0}) == 1.0
+    assert table.reconcile({"amount_ht": 1500.0}) == 0.5
+
+
+def test_compact_table_rows_without_layout():
+    text = (
+        "FACTURE N° FA-7\n"
+        "Désignation | Quantité | Prix unitaire | TVA | Montant\n"
+        "Abonnement | 12 | 10,00 | 20% | 120,00\n"
+        "Installation | 2 | 85,00 | 20% | 180,00\n"
+        "Remise fidélité | -20,00\n"
+        "Montant HT | 280,00\n"
+        "Conditions : paiement à 30 jours"
+    )
+    table = LineItemExtractor().extract(None, text)
+
+    assert [item.description for item in table.items] == [
+        "Abonnement",
+        "Installation",
+        "Remise fidélité",
+    ]
+    assert table.items[0].vat_rate == 20.0
+    # Empty cells were dropped: the single number is the amount column.
+    assert table.items[2].amount == -20.0 and table.items[2].quantity is None
+    # 2 × 85 ≠ 180: the row is kept but lowers the confidence.
+    assert table.inconsistent_rows == 1
+    assert table.reconcile({"amount_ht": 280.0}) < 1.0
+
+
+def test_pipeline_stores_typed_line_items(tmp_path, monkeypatch):
+    path = tmp_path / "invoice.pdf"
+    _invoice_pdf(path)
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path)
+    monkeypatch.setattr(settings, "duplicate_detection_enabled", False)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def scenario():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            session.add(
+                Document(
+                    id="inv",
+                    filename="invoice.pdf",
+                    file_path=str(path),
+                    file_size=path.stat().st_size,
+                    mime_type="application/pdf",
+                    status="processing",
+                )
+            )
+            await session.commit()
+            # Local rules resolve every header field, so Gemini is never needed.
+            await ExtractionPipeline(session, gemini=object()).run("inv")
+            return await session.scalar(select(Extraction).where(Extraction.document_id == "inv"))
+
+    extraction = asyncio.run(scenario())
+    items = extraction.extracted_data["line_items"]
+    assert len(items) == 3
+    assert items[1] == {
+        "description": "Déplacement technicien",
+        "quantity": 2.0,
+        "unit_price": 85.0,
+        "vat_rate": None,
+        "amount": 170.0,
+        "page": 1,
+    }
+    assert extraction.confidence_scores["line_items"] == 1.0
@@ -0,0 +1,38 @@
+from app.services.local_extraction import LocalInvoiceExtractor, normalize_date, parse_amount
+
+FRENCH_INVOICE = """ACME SAS
+FACTURE N° F-2024-0012
+Date : 15/03/2024
+Date d'échéance : 15/04/2024
+Montant HT : 1 000,00 €
+TVA 20% : 200,00 €
+Montant TTC : 1 200,00 €
+"""
+
+
+def test_parses_french_invoice_and_confirms_vat_arithmetic():
+    result = LocalInvoiceExtractor().extract(FRENCH_INVOICE)
+    assert result.values() == {
+        "invoice_number": "F-2024-0012",
+        "date": "2024-03-15",
+        "currency": "EUR",
+        "amount_ht": 1000.0,
+        "tva": 200.0,
+        "amount_ttc": 1200.0,
+    }
+    assert result.unresolved(("amount_ht", "tva", "amount_ttc"), 0.95) == []
+
+
+def test_english_invoice_with_split_label_and_derived_vat():
+    text = "Invoice #: INV-778\nInvoice date: March 5, 2024\nSubtotal\n$1,250.00\nTotal due $1,375.00"
+    result = LocalInvoiceExtractor().extract(text)
+    assert result.fields["amount_ht"].value == 1250.0
+    assert result.fields["tva"].value == 125.0
+    assert result.fields["tva"].confidence < result.fields["amount_ttc"].confidence
+
+
+def test_amount_and_date_normalization():
+    assert parse_amount("1.234,56") == 1234.56
+    assert parse_amount("1,234.56") == 1234.56
+    assert normalize_date("1er août 2023") == "2023-08-01"
+    assert normalize_date("01/13/2024") == "2024-01-13"
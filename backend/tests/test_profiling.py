@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.profiling import StackSampler, profiling_requested
+from app.main import app, profile_request
+
+
+def test_profile_header_stores_downloadable_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path)
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    client = TestClient(app)
+
+    response = client.get("/healthz", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    profile_url = response.headers["X-Profile-Url"]
+
+    download = client.get(profile_url)
+    assert download.status_code == 200
+    assert download.text.startswith("# interval_ms=")
+
+
+def test_request_profile_includes_work_offloaded_to_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path)
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1)
+    offloaded = FastAPI()
+    offloaded.middleware("http")(profile_request)
+
+    def parse_pdf():
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            pass
+
+    @offloaded.get("/api/v1/parse")
+    async def parse():
+        await asyncio.to_thread(parse_pdf)
+        return {}
+
+    response = TestClient(offloaded).get("/api/v1/parse", headers={"X-Profile": "1"})
+    name = response.headers["X-Profile-Url"].rsplit("/", 1)[-1]
+    profile = (tmp_path / "artifacts" / "requests" / name).read_text()
+    assert ":parse_pdf:" in profile
+
+
+def test_no_profile_without_header(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path)
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    response = TestClient(app).get("/healthz")
+    assert "X-Profile-Url" not in response.headers
+
+
+def test_profile_header_is_ignored_unless_enabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path)
+    monkeypatch.setattr(settings, "profiling_enabled", False)
+    response = TestClient(app).get("/healthz", headers={"X-Profile": "1"})
+    assert "X-Profile-Url" not in response.headers
+    assert not any(tmp_path.rglob("profile-*"))
+
+
+def test_profiling_token_replaces_truthy_values(monkeypatch):
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_token", "s3cret")
+    assert not profiling_requested("1")
+    assert not profiling_requested("wrong")
+    assert profiling_requested("s3cret")
+
+
+def test_sampler_keeps_only_the_given_threads():
+    stop = threading.Event()
+
+    def busy_elsewhere():
+        while not stop.is_set():
+            sum(range(1000))
+
+    other = threading.Thread(target=busy_elsewhere, name="other-work")
+    other.start()
+    try:
+        with StackSampler(interval=0.001, thread_ids={threading.get_ident()}) as sampler:
+            deadline = time.perf_counter() + 0.1
+            while time.perf_counter() < deadline:
+                sum(range(1000))
+    finally:
+        stop.set()
+        other.join()
+
+    assert sampler.samples
+    assert not any("busy_elsewhere" in stack for stack in sampler.samples)
@@ -0,0 +1,47 @@
+import asyncio
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.v1.endpoints.documents import filter_documents
+from app.core.migrations import upgrade_database
+from app.models import Document
+
+
+def _plans(tmp_path, queries):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'plans.db'}")
+        await upgrade_database(engine)
+        plans = []
+        async with engine.connect() as conn:
+            for query in queries:
+                sql = str(query.compile(engine.sync_engine, compile_kwargs={"literal_binds": True}))
+                rows = await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+                plans.append(" | ".join(row[-1] for row in rows))
+        await engine.dispose()
+        return plans
+
+    return asyncio.run(scenario())
+
+
+def test_list_queries_are_index_driven(tmp_path):
+    page = select(Document).order_by(Document.uploaded_at.desc()).limit(20)
+    plans = _plans(
+        tmp_path,
+        [
+            page,
+            filter_documents(page, date_from="2024-01-01", date_to="2024-02-01"),
+            filter_documents(page, status="completed"),
+            filter_documents(page, type="invoice"),
+            filter_documents(select(func.count()).select_from(Document), status="failed"),
+        ],
+    )
+    assert "USING INDEX ix_document_uploaded_at" in plans[0]
+    assert "USING INDEX ix_document_uploaded_at" in plans[1]
+    assert "ix_document_status_uploaded_at" in plans[2]
+    assert "ix_extraction_document_type_document_id" in plans[3]
+    assert "ix_document_status_uploaded_at" in plans[4]
+    for plan in plans:
+        # A bare "SCAN <table>" without an index is a full table scan.
+        for step in plan.split(" | "):
+            assert not (step.startswith("SCAN") and "INDEX" not in step), plan
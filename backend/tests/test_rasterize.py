@@ -0,0 +1,107 @@
+import io
+import os
+
+import fitz
+import numpy as np
+import pytest
+import pytesseract
+from PIL import Image
+
+from app.services import rasterize
+from app.services.rasterize import image_pixmap, ocr_array, pixmap_array, pnm_file
+
+
+def _tesseract_data(*words):
+    return {
+        "text": list(words),
+        "conf": ["91"] * len(words),
+        "left": [10 * index for index in range(len(words))],
+        "top": [5] * len(words),
+        "width": [8] * len(words),
+        "height": [12] * len(words),
+        "block_num": [1] * len(words),
+        "par_num": [1] * len(words),
+        "line_num": [1] * len(words),
+    }
+
+
+def test_pixmap_array_drops_row_padding_and_keeps_channels():
+    gray = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 3, 2), False)
+    gray.set_rect(gray.irect, (200,))
+    assert pixmap_array(gray).shape == (2, 3)
+    assert (pixmap_array(gray) == 200).all()
+
+    rgb = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 3, 2), False)
+    rgb.set_rect(rgb.irect, (10, 20, 30))
+    array = pixmap_array(rgb)
+    assert array.shape == (2, 3, 3)
+    assert array[1, 2].tolist() == [10, 20, 30]
+
+
+def test_image_pixmap_converts_rgba_to_gray_without_alpha():
+    rgba = Image.new("RGBA", (16, 8), (255, 0, 0, 128))
+    buffer = io.BytesIO()
+    rgba.save(buffer, format="PNG")
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_image(fitz.Rect(0, 0, 160, 80), stream=buffer.getvalue())
+    xref = page.get_images()[0][0]
+
+    pix = image_pixmap(doc, xref)
+
+    assert pix.n == 1 and not pix.alpha
+    assert pixmap_array(pix).shape == (8, 16)
+
+
+@pytest.mark.parametrize(
+    ("array", "magic", "suffix"),
+    [
+        (np.full((2, 3), 7, dtype=np.uint8), b"P5", ".pgm"),
+        (np.full((2, 3, 3), 7, dtype=np.uint8), b"P6", ".ppm"),
+    ],
+)
+def test_pnm_file_writes_header_and_removes_the_file(array, magic, suffix):
+    with pnm_file(array) as path:
+        assert path.endswith(suffix)
+        with open(path, "rb") as handle:
+            content = handle.read()
+    assert content == b"%s\n3 2\n255\n" % magic + array.tobytes()
+    assert not os.path.exists(path)
+
+
+def test_pnm_file_accepts_non_contiguous_views():
+    array = np.arange(24, dtype=np.uint8).reshape(4, 6)[:, ::2]
+    with pnm_file(array) as path:
+        with open(path, "rb") as handle:
+            assert handle.read().endswith(np.ascontiguousarray(array).tobytes())
+
+
+def test_ocr_array_passes_the_pnm_path_and_cleans_up(monkeypatch):
+    seen = []
+
+    def fake_image_to_data(path, lang, config, output_type):
+        seen.append((path, os.path.exists(path), lang))
+        return _tesseract_data("Facture", "123")
+
+    monkeypatch.setattr(rasterize.pytesseract, "image_to_data", fake_image_to_data)
+    text, boxes = ocr_array(np.zeros((4, 4), dtype=np.uint8), lang="fra")
+
+    assert text == "Facture 123"
+    assert len(boxes.words) == 2
+    ((path, existed, lang),) = seen
+    assert existed and lang == "fra"
+    assert not os.path.exists(path)
+
+
+def test_ocr_array_removes_the_file_when_tesseract_fails(monkeypatch):
+    paths = []
+
+    def failing_image_to_data(path, **options):
+        paths.append(path)
+        raise pytesseract.TesseractError(1, "boom")
+
+    monkeypatch.setattr(rasterize.pytesseract, "image_to_data", failing_image_to_data)
+    with pytest.raises(pytesseract.TesseractError):
+        ocr_array(np.zeros((4, 4, 3), dtype=np.uint8))
+
+    assert paths and not os.path.exists(paths[0])
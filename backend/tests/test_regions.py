@@ -0,0 +1,235 @@
+import asyncio
+
+import fitz
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.models import Base, Document, Extraction
+from app.services import regions as regions_module
+from app.services import extraction as extraction_module
+from app.services.extraction import ExtractionPipeline
+from app.services.layout import WordBoxes
+from app.services.line_items import LineItemExtractor
+from app.services.local_extraction import LocalInvoiceExtractor
+from app.services.rasterize import pixmap_array, render_page
+from app.services.regions import RegionReader, detect_regions, rank_regions
+from app.services.text_extraction import ExtractedText, TextExtractionService
+
+FIELDS_TEXT = (
+    "FACTURE N° FA-42\nDate : 12/03/2024\nMontant HT 100,00\nTVA 20,00\nMontant TTC 120,00"
+)
+
+
+def _scanned_invoice(path, pages=3):
+    """Header on page 1, line items on every page, totals on the last; images only."""
+
+    source = fitz.open()
+    for number in range(pages):
+        page = source.new_page()
+        if number == 0:
+            page.insert_text((40, 60), "ACME SARL", fontsize=14)
+            page.insert_text((40, 80), "12 rue des Lilas, Paris", fontsize=10)
+            page.insert_text((380, 60), "FACTURE N° FA-42", fontsize=12)
+            page.insert_text((380, 78), "Date : 12/03/2024", fontsize=10)
+        for line in range(12):
+            page.insert_text(
+                (40, 300 + line * 16), f"Ligne {line} article quantite {line} prix {line}0,00"
+            )
+        if number == pages - 1:
+            page.insert_text((360, 720), "Montant HT 100,00", fontsize=10)
+            page.insert_text((360, 736), "TVA 20,00", fontsize=10)
+            page.insert_text((360, 752), "Montant TTC 120,00", fontsize=10)
+    scanned = fitz.open()
+    for page in source:
+        target = scanned.new_page(width=page.rect.width, height=page.rect.height)
+        target.insert_image(target.rect, pixmap=page.get_pixmap(dpi=150))
+    scanned.save(path)
+
+
+class _Gemini:
+    def __init__(self):
+        self.calls = 0
+
+    def extract(self, text, fields=None):
+        self.calls += 1
+        return {"document_type": "invoice", "invoice_number": "FA-42"}
+
+
+class _Ocr:
+    def __init__(self, text=""):
+        self.text = text
+        self.crops = []
+
+    def __call__(self, array):
+        self.crops.append(array.shape)
+        return self.text, WordBoxes()
+
+
+def test_header_and_totals_outrank_line_items(tmp_path):
+    path = tmp_path / "scan.pdf"
+    _scanned_invoice(path, pages=1)
+    with fitz.open(path) as doc:
+        pix = render_page(doc[0], dpi=150)
+        gray = pixmap_array(pix)
+        height, width = gray.shape
+        ranked = rank_regions(detect_regions(gray), width, height, 0, 1)
+
+    assert len(ranked) >= 3
+    top, bottom = ranked[0], ranked[-1]
+    items = max(ranked, key=lambda region: region.y1 - region.y0)
+    # Reading order, the twelve item lines closed into one block, header/totals first.
+    assert top.y0 < items.y0 < bottom.y0
+    assert items.score < settings.ocr_region_min_score
+    assert top.score > items.score and bottom.score > items.score
+
+
+def test_priority_pass_defers_items_and_full_pass_reads_only_the_rest(tmp_path, monkeypatch):
+    path = tmp_path / "scan.pdf"
+    _scanned_invoice(path, pages=3)
+    assert RegionReader.applies(str(path), "application/pdf")
+
+    ocr = _Ocr("texte")
+    reader = RegionReader(str(path), "application/pdf", ocr=ocr)
+    priority = reader.read_priority()
+    first_runs = reader.ocr_runs
+    assert first_runs > 0 and reader.deferred > 0
+    assert len(priority.page_offsets) == 4
+    # The middle page is only line items, so the priority pass leaves it empty.
+    assert priority.page_offsets[1] == priority.page_offsets[2]
+
+    full = reader.read_all()
+    assert reader.deferred == 0
+    assert len(full.page_offsets) == 4
+    # Regions read in the priority pass are not OCR'd again.
+    everything = _Ocr("texte")
+    RegionReader(str(path), "application/pdf", ocr=everything).read_all()
+    assert reader.ocr_runs == len(everything.crops) > first_runs
+
+
+def _session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def create():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    return factory, create
+
+
+def _run_pipeline(tmp_path, monkeypatch, text, fails=None, duplicates=False):
+    path = tmp_path / "scan.pdf"
+    _scanned_invoice(path, pages=3)
+    ocr = _Ocr(text)
+    monkeypatch.setattr(regions_module, "ocr_array", lambda array, **options: ocr(array))
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path)
+    monkeypatch.setattr(settings, "duplicate_detection_enabled", duplicates)
+    gemini = _Gemini()
+    factory, create = _session_factory()
+
+    async def scenario():
+        await create()
+        async with factory() as session:
+            session.add(
+                Document(
+                    id="scan",
+                    filename="scan.pdf",
+                    file_path=str(path),
+                    file_size=path.stat().st_size,
+                    mime_type="application/pdf",
+                    status="processing",
+                )
+            )
+            await session.commit()
+            pipeline = ExtractionPipeline(session, gemini=gemini)
+            if fails is None:
+                await pipeline.run("scan")
+            else:
+                with pytest.raises(fails):
+                    await pipeline.run("scan")
+            return await session.scalar(select(Extraction).where(Extraction.document_id == "scan"))
+
+    return ocr, gemini, asyncio.run(scenario())
+
+
+def test_pipeline_resolves_fields_from_priority_regions_then_completes_the_text(
+    tmp_path, monkeypatch
+):
+    texts = []
+    extract = LocalInvoiceExtractor.extract
+
+    def counting(extractor, text):
+        texts.append(text)
+        return extract(extractor, text)
+
+    item_texts = []
+    items = LineItemExtractor.extract
+
+    def reading_items(extractor, layout, text):
+        item_texts.append(text)
+        return items(extractor, layout, text)
+
+    monkeypatch.setattr(LocalInvoiceExtractor, "extract", counting)
+    fingerprinted = []
+    fingerprint = extraction_module.compute_fingerprint
+
+    def fingerprinting(path, mime_type, text, hasher):
+        fingerprinted.append(text)
+        return fingerprint(path, mime_type, text, hasher)
+
+    monkeypatch.setattr(LineItemExtractor, "extract", reading_items)
+    monkeypatch.setattr(extraction_module, "compute_fingerprint", fingerprinting)
+    ocr, gemini, extraction = _run_pipeline(tmp_path, monkeypatch, FIELDS_TEXT, duplicates=True)
+    # The local rules ran once, on the priority text, and their result was reused.
+    assert len(texts) == 1
+    complete = _Ocr()
+    RegionReader(str(tmp_path / "scan.pdf"), ocr=complete).read_all()
+    assert extraction.extracted_data["invoice_number"] == "FA-42"
+    assert extraction.extracted_data["amount_ttc"] == 120.0
+    assert gemini.calls == 0
+    # Fields nothing was asked for are not stored empty and scored 0.0.
+    assert not {"supplier", "currency"} & extraction.confidence_scores.keys()
+    assert min(extraction.confidence_scores.values()) > 0.0
+    # The deferred regions are read afterwards, each region OCR'd once.
+    assert len(ocr.crops) == len(complete.crops)
+    assert not extraction.text_partial
+    assert len(extraction.page_offsets) == 4
+    assert extraction.page_offsets[1] < extraction.page_offsets[2]
+    # Line items are read once, from the completed text with the item table.
+    assert item_texts == [extraction.ocr_text]
+    # The fingerprint taken from the partial text is replaced by the full one.
+    assert len(fingerprinted) == 2 and fingerprinted[-1] == extraction.ocr_text
+
+
+def test_fields_are_kept_and_marked_partial_when_the_rest_cannot_be_read(
+    tmp_path, monkeypatch
+):
+    def unreadable(reader):
+        raise RuntimeError("OCR engine gone")
+
+    monkeypatch.setattr(RegionReader, "read_all", unreadable)
+    _, gemini, extraction = _run_pipeline(tmp_path, monkeypatch, FIELDS_TEXT, fails=RuntimeError)
+    assert extraction.extracted_data["amount_ttc"] == 120.0
+    assert extraction.text_partial and gemini.calls == 0
+    # Only the first and last pages carry text.
+    assert extraction.page_offsets[1] == extraction.page_offsets[2]
+
+
+def test_pipeline_reads_the_whole_document_when_fields_are_missing(tmp_path, monkeypatch):
+    read = []
+
+    def extract(service, path, mime_type=None):
+        read.append(path)
+        return ExtractedText.from_pages(["FACTURE N° FA-42", "", "Montant TTC 120,00"])
+
+    monkeypatch.setattr(TextExtractionService, "extract", extract)
+    ocr, gemini, extraction = _run_pipeline(tmp_path, monkeypatch, "FACTURE N° FA-42")
+    priority = _Ocr()
+    RegionReader(str(tmp_path / "scan.pdf"), ocr=priority).read_priority()
+    # Past the priority regions, the text reader (and its image cache) reads the document.
+    assert len(ocr.crops) == len(priority.crops)
+    assert read == [str(tmp_path / "scan.pdf")]
+    assert "Montant TTC" in extraction.ocr_text and not extraction.text_partial
+    assert gemini.calls == 1
@@ -0,0 +1,42 @@
+import fitz
+import numpy as np
+
+from app.services.rasterize import pixmap_array, render_page
+from app.services.resolution import choose_page_dpi, choose_scale, estimate_text_height
+
+
+def _page(doc, fontsize):
+    page = doc.new_page()
+    y = 60
+    while y < 780:
+        page.insert_text((40, y), "Facture 2024 montant total hors taxes TVA", fontsize=fontsize)
+        y += fontsize * 1.6
+    return page
+
+
+def test_text_height_tracks_font_size_and_sets_the_dpi():
+    doc = fitz.open()
+    heights, dpis = [], []
+    for fontsize in (8, 12, 24):
+        page = _page(doc, fontsize)
+        pix = render_page(page, dpi=150)
+        heights.append(estimate_text_height(pixmap_array(pix)))
+        dpis.append(choose_page_dpi(page)[0])
+    assert heights[0] < heights[1] < heights[2]
+    assert 1.6 < heights[2] / heights[1] < 2.4
+    # Smaller type gets more pixels, bounded by ocr_min_dpi/ocr_max_dpi.
+    assert dpis[0] > dpis[1] > dpis[2]
+    assert 100 <= dpis[2] and dpis[0] <= 400
+
+
+def test_large_photos_are_downscaled_and_blank_images_left_alone():
+    doc = fitz.open()
+    page = _page(doc, 12)
+    # Simulates a phone photo: a page rendered at ~600 DPI, 5100 px tall.
+    pix = render_page(page, dpi=600)
+    decision = choose_scale(pixmap_array(pix))
+    assert decision.scale < 0.7
+    assert decision.pixels_after < decision.pixels_before / 2
+
+    blank = choose_scale(np.full((3000, 2000), 255, dtype=np.uint8))
+    assert blank.scale == 1.0 and blank.text_height is None
@@ -0,0 +1,193 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.models import Base, Document, Extraction, ReviewItem
+from app.services import extraction as extraction_module
+from app.services.extraction import ExtractionPipeline
+from app.services.review import ReviewQueue, review_summary
+from app.services.text_extraction import ExtractedText
+
+
+async def _session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+
+async def _seed(session, scores_by_name):
+    queue = ReviewQueue(session)
+    for name, scores in scores_by_name.items():
+        document = Document(
+            id=name, filename=f"{name}.pdf", file_path="/tmp/x", file_size=1, mime_type="pdf"
+        )
+        session.add(document)
+        session.add(
+            Extraction(
+                document=document,
+                extracted_data={"amount_ttc": 10.0},
+                confidence_scores=scores,
+                ocr_text="large text",
+            )
+        )
+        queue.enqueue(document, scores)
+    await session.commit()
+
+
+def test_review_summary_ignores_meta_fields():
+    low, fields = review_summary(
+        {"confidence_score": 0.1, "date": 0.9, "amount_ttc": 0.4, "tva": 0.6}, 0.85
+    )
+    assert low == 0.4
+    assert fields == ["amount_ttc", "tva"]
+
+
+def test_claim_orders_by_confidence_and_honours_leases():
+    async def scenario():
+        factory = await _session_factory()
+        async with factory() as session:
+            await _seed(
+                session,
+                {"a": {"date": 0.7}, "b": {"date": 0.2}, "c": {"date": 0.99}},
+            )
+            queue = ReviewQueue(session)
+            listed = await queue.list(10)
+            assert [row["document_id"] for row in listed] == ["b", "a"]
+            assert "ocr_text" not in listed[0]
+
+            first = await queue.claim("alice", 1, 60)
+            assert [row["document_id"] for row in first] == ["b"]
+            second = await queue.claim("bob", 5, 60)
+            assert [row["document_id"] for row in second] == ["a"]
+
+            item = await session.scalar(select(ReviewItem).where(ReviewItem.document_id == "b"))
+            item.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+            await session.commit()
+            reclaimed = await queue.claim("bob", 5, 60)
+            assert [row["document_id"] for row in reclaimed] == ["b"]
+
+    asyncio.run(scenario())
+
+
+def test_submit_applies_batch_and_reports_conflicts():
+    async def scenario():
+        factory = await _session_factory()
+        async with factory() as session:
+            await _seed(session, {"a": {"date": 0.5}, "b": {"date": 0.5}})
+            queue = ReviewQueue(session)
+            await queue.claim("bob", 1, 600)
+            results = await queue.submit(
+                "alice",
+                [
+                    {"document_id": "a", "extracted_data": {"date": "2024-01-01"}},
+                    {"document_id": "b", "extracted_data": {"date": "2024-01-02"}},
+                    {"document_id": "missing", "extracted_data": {}},
+                ],
+            )
+            statuses = {row["document_id"]: row["status"] for row in results}
+            claimed_by_bob = "a" if statuses["a"] == "conflict" else "b"
+            corrected = "b" if claimed_by_bob == "a" else "a"
+            assert statuses == {claimed_by_bob: "conflict", corrected: "ok", "missing": "not_found"}
+
+            extraction = await session.scalar(
+                select(Extraction).where(Extraction.document_id == corrected)
+            )
+            assert extraction.manually_corrected
+            assert extraction.confidence_scores["date"] == 1.0
+            assert extraction.extracted_data["amount_ttc"] == 10.0
+            item = await session.scalar(
+                select(ReviewItem).where(ReviewItem.document_id == corrected)
+            )
+            assert item.status == "reviewed" and item.reviewed_by == "alice"
+
+    asyncio.run(scenario())
+
+
+class _Reader:
+    def extract(self, file_path, mime_type=None):
+        return ExtractedText.from_pages(["Facture F-1 du 02/01/2024, total 10,00"])
+
+
+class _Gemini:
+    def __init__(self, payloads):
+        self.payloads = iter(payloads)
+
+    def extract(self, text, fields=None):
+        return next(self.payloads)
+
+
+def test_reprocessing_updates_the_extraction_and_review_item(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path)
+    monkeypatch.setattr(settings, "local_extraction_enabled", False)
+    monkeypatch.setattr(settings, "duplicate_detection_enabled", False)
+    gemini = _Gemini(
+        [
+            {"document_type": "invoice", "supplier": "Nowhere Ltd"},
+            {"document_type": "invoice", "supplier": "Elsewhere SA"},
+            {"document_type": "invoice", "invoice_number": "F-1"},
+        ]
+    )
+
+    async def scenario():
+        factory = await _session_factory()
+        async with factory() as session:
+            session.add(
+                Document(
+                    id="doc",
+                    filename="doc.txt",
+                    file_path=str(tmp_path / "doc.txt"),
+                    file_size=1,
+                    mime_type="text/plain",
+                )
+            )
+            await session.commit()
+            pipeline = ExtractionPipeline(session, text_reader=_Reader(), gemini=gemini)
+
+            await pipeline.run("doc")
+            await ReviewQueue(session).claim("alice", 1, 600)
+            await pipeline.run("doc")
+            extractions = list(await session.scalars(select(Extraction)))
+            items = list(await session.scalars(select(ReviewItem)))
+            assert [row.extracted_data["supplier"] for row in extractions] == ["Elsewhere SA"]
+            assert [(item.status, item.claimed_by) for item in items] == [("pending", None)]
+
+            # Nothing left to review: the stale item goes away.
+            await pipeline.run("doc")
+            assert list(await session.scalars(select(ReviewItem))) == []
+            assert len(list(await session.scalars(select(Extraction)))) == 1
+
+    asyncio.run(scenario())
+
+
+def test_a_cache_outage_does_not_fail_a_committed_extraction(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path)
+    monkeypatch.setattr(settings, "local_extraction_enabled", False)
+    monkeypatch.setattr(settings, "duplicate_detection_enabled", False)
+
+    async def unreachable(document_ids):
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(extraction_module, "invalidate_documents", unreachable)
+
+    async def scenario():
+        factory = await _session_factory()
+        async with factory() as session:
+            session.add(
+                Document(
+                    id="doc",
+                    filename="doc.txt",
+                    file_path=str(tmp_path / "doc.txt"),
+                    file_size=1,
+                    mime_type="text/plain",
+                )
+            )
+            await session.commit()
+            gemini = _Gemini([{"document_type": "invoice", "supplier": "Nowhere Ltd"}])
+            await ExtractionPipeline(session, text_reader=_Reader(), gemini=gemini).run("doc")
+            return await session.get(Document, "doc")
+
+    assert asyncio.run(scenario()).status == "completed"
@@ -0,0 +1,46 @@
+import pytest
+
+from app.services.text_extraction import ExtractedText, join_pages
+from app.services.text_store import TextStore, encode_text_store
+
+PAGES = ["Facture n° 12\nDate 01/02/2024\n", "", "Total TTC 12,00 €\n\nMerci"]
+
+
+def _extracted():
+    return ExtractedText.from_pages(PAGES, blocks=[[0, 14], None, [0, 19]])
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_pages_spans_and_blocks_round_trip(tmp_path, compress):
+    extracted = _extracted()
+    path = tmp_path / "text.bin"
+    path.write_bytes(
+        encode_text_store(
+            extracted.text, extracted.page_offsets, extracted.block_offsets, compress=compress
+        )
+    )
+
+    with TextStore.open(path) as store:
+        assert store.page_count == 3 and store.text_length == len(extracted.text)
+        assert store.page_offsets == extracted.page_offsets
+        assert [store.page(i).strip() for i in range(3)] == [page.strip() for page in PAGES]
+        assert store.pages(0, 3) == extracted.text
+        assert store.span(7, 30) == extracted.text[7:30]
+        assert store.page_of(extracted.text.index("Total")) == 2
+        assert [store.block(i).strip() for i in range(len(store.block_offsets))] == [
+            "Facture n° 12",
+            "Date 01/02/2024",
+            "Total TTC 12,00 €",
+            "Merci",
+        ]
+        with pytest.raises(IndexError):
+            store.page(3)
+
+
+def test_page_frames_are_compressed_independently():
+    text, offsets = join_pages([f"page {i} " + "ligne répétée " * 200 for i in range(4)])
+    data = encode_text_store(text, offsets)
+    assert len(data) < len(text.encode("utf-8")) / 10
+    assert TextStore(data).page(3) == text[offsets[3] :]
+    with pytest.raises(ValueError):
+        TextStore(b"XXXX" + data[4:])
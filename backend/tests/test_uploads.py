@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.endpoints import upload as upload_endpoint
+from app.core.config import settings
+from app.core.database import get_session
+from app.main import app
+from app.models import Base, Document, UploadSession
+
+PDF = b"%PDF-1.4\n" + bytes(range(256)) * 40
+
+
+def _client(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create())
+
+    async def override_session():
+        async with factory() as session:
+            yield session
+
+    scheduled: list[str] = []
+
+    class FakeTask:
+        @staticmethod
+        def apply_async(args, kwargs, task_id):
+            scheduled.append(task_id)
+
+    monkeypatch.setitem(app.dependency_overrides, get_session, override_session)
+    monkeypatch.setattr(settings, "uploads_dir", tmp_path / "uploads")
+    monkeypatch.setattr(upload_endpoint, "process_document", FakeTask)
+    return TestClient(app), factory, scheduled
+
+
+def _declare(data, **overrides):
+    declaration = {
+        "filename": "scan.pdf",
+        "size": len(data),
+        "mime_type": "application/pdf",
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+    return {**declaration, **overrides}
+
+
+def test_handshake_rejects_and_recognises_stored_files(tmp_path, monkeypatch):
+    client, factory, _ = _client(tmp_path, monkeypatch)
+
+    async def seed():
+        async with factory() as session:
+            session.add(
+                Document(
+                    id="stored",
+                    filename="old.pdf",
+                    file_path="/tmp/old.pdf",
+                    file_size=len(PDF),
+                    mime_type="application/pdf",
+                    content_hash=hashlib.sha256(PDF).hexdigest(),
+                    status="completed",
+                )
+            )
+            await session.commit()
+
+    asyncio.run(seed())
+    response = client.post(
+        "/api/v1/upload/handshake",
+        json={
+            "files": [
+                _declare(PDF),
+                _declare(b"text", filename="notes.txt", mime_type="text/plain"),
+                _declare(PDF + b"x", size=settings.max_upload_size_mb * 1024 * 1024 + 1),
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    have, unsupported, oversized = response.json()["files"]
+    assert have == {"filename": "scan.pdf", "status": "have", "document_id": "stored"}
+    assert unsupported["status"] == "rejected" and "text/plain" in unsupported["reason"]
+    assert oversized["status"] == "rejected"
+
+
+def test_chunked_upload_resumes_and_creates_the_document(tmp_path, monkeypatch):
+    client, factory, scheduled = _client(tmp_path, monkeypatch)
+    declaration = _declare(PDF)
+
+    (decision,) = client.post("/api/v1/upload/handshake", json={"files": [declaration]}).json()[
+        "files"
+    ]
+    assert decision["status"] == "send" and decision["offset"] == 0
+    session_url = f"/api/v1/upload/sessions/{decision['upload_id']}"
+
+    first = client.put(session_url, params={"offset": 0}, content=PDF[:4096])
+    assert first.json() == {"upload_id": decision["upload_id"], "offset": 4096, "size": len(PDF)}
+
+    # A retried or out-of-order chunk is told where to continue.
+    conflict = client.put(session_url, params={"offset": 0}, content=PDF[:4096])
+    assert conflict.status_code == 409
+    assert conflict.json()["detail"]["offset"] == 4096
+
+    # Announcing the same file again resumes the open session.
+    (again,) = client.post("/api/v1/upload/handshake", json={"files": [declaration]}).json()[
+        "files"
+    ]
+    assert again["upload_id"] == decision["upload_id"] and again["offset"] == 4096
+    assert client.get(session_url).json()["offset"] == 4096
+
+    last = client.put(session_url, params={"offset": 4096}, content=PDF[4096:])
+    assert last.status_code == 200
+    document_id = last.json()["document_id"]
+    assert scheduled == [document_id]
+    assert client.get(session_url).status_code == 404
+
+    async def stored():
+        async with factory() as session:
+            document = await session.get(Document, document_id)
+            sessions = list(await session.scalars(select(UploadSession)))
+            return document, sessions
+
+    document, sessions = asyncio.run(stored())
+    assert sessions == []
+    assert document.status == "pending" and document.file_size == len(PDF)
+    with open(document.file_path, "rb") as handle:
+        assert handle.read() == PDF
+    assert not list((tmp_path / "uploads" / "partial").iterdir())
+
+
+def test_mismatched_bytes_are_discarded(tmp_path, monkeypatch):
+    client, _, scheduled = _client(tmp_path, monkeypatch)
+    forged = b"%PDF-1.4\n" + b"y" * (len(PDF) - 9)
+
+    (decision,) = client.post("/api/v1/upload/handshake", json={"files": [_declare(PDF)]}).json()[
+        "files"
+    ]
+    session_url = f"/api/v1/upload/sessions/{decision['upload_id']}"
+
+    too_long = client.put(session_url, params={"offset": 0}, content=PDF + b"extra")
+    assert too_long.status_code == 413
+
+    response = client.put(session_url, params={"offset": 0}, content=forged)
+    assert response.status_code == 422
+    assert scheduled == []
+    assert client.get(session_url).status_code == 404
+
+
+def test_a_posted_file_is_known_before_it_is_processed(tmp_path, monkeypatch):
+    client, _, _ = _client(tmp_path, monkeypatch)
+    monkeypatch.setattr(settings, "duplicate_detection_enabled", False)
+
+    posted = client.post(
+        "/api/v1/upload", files={"files": ("scan.pdf", PDF, "application/pdf")}
+    ).json()
+    (decision,) = client.post("/api/v1/upload/handshake", json={"files": [_declare(PDF)]}).json()[
+        "files"
+    ]
+    assert decision == {
+        "filename": "scan.pdf",
+        "status": "have",
+        "document_id": posted["documents"][0],
+    }
+
+
+def test_content_must_match_the_declared_type(tmp_path, monkeypatch):
+    client, _, scheduled = _client(tmp_path, monkeypatch)
+    declaration = _declare(PDF, filename="scan.png", mime_type="image/png")
+
+    (decision,) = client.post("/api/v1/upload/handshake", json={"files": [declaration]}).json()[
+        "files"
+    ]
+    session_url = f"/api/v1/upload/sessions/{decision['upload_id']}"
+    response = client.put(session_url, params={"offset": 0}, content=PDF)
+    assert response.status_code == 422
+    assert "application/pdf" in response.json()["detail"]
+    assert scheduled == []
+    assert client.get(session_url).status_code == 404
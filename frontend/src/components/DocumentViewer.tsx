@@ -1,6 +1,6 @@
 import { useEffect, useState } from "react";
-import { fetchDocument, updateExtraction } from "../services/api";
-import { DocumentItem, ExtractionData } from "../types";
+import { fetchDocument, fetchDocumentText, updateExtraction } from "../services/api";
+import { DocumentDetail, DocumentItem, DocumentText, ExtractionData } from "../types";
 
 interface DocumentViewerProps {
   document: DocumentItem | null;
@@ -9,18 +9,42 @@ interface DocumentViewerProps {
 export function DocumentViewer({ document }: DocumentViewerProps) {
   const [data, setData] = useState<ExtractionData | null>(null);
   const [message, setMessage] = useState<string | null>(null);
-  const [ocrText, setOcrText] = useState("");
+  const [detail, setDetail] = useState<DocumentDetail | null>(null);
+  const [page, setPage] = useState(0);
+  const [pageText, setPageText] = useState<DocumentText | null>(null);
 
   useEffect(() => {
     const load = async () => {
       if (!document) return;
-      const full = await fetchDocument(document.id);
+      // Metadata only; the OCR text is fetched one page at a time below.
+      const full: DocumentDetail = await fetchDocument(document.id);
+      setDetail(full);
       setData(full.extracted_data ?? null);
-      setOcrText(full.ocr_text ?? "");
+      setPage(0);
     };
     load();
   }, [document]);
 
+  useEffect(() => {
+    let cancelled = false;
+    const loadPage = async () => {
+      if (!document || !detail?.text_length) {
+        setPageText(null);
+        return;
+      }
+      const text: DocumentText = await fetchDocumentText(document.id, { page });
+      if (!cancelled) setPageText(text);
+    };
+    loadPage();
+    return () => {
+      cancelled = true;
+    };
+  }, [document, detail, page]);
+
+  const pageCount = detail?.page_count ?? 0;
+  const lineItems = data?.line_items ?? [];
+  const lineItemsScore = detail?.confidence_scores?.line_items;
+
   if (!document) {
     return <p className="text-slate-400">Select a document to inspect.</p>;
   }
@@ -57,31 +81,84 @@ export function DocumentViewer({ document }: DocumentViewerProps) {
         <section>
           <p className="text-sm text-slate-500 mb-2">Extracted fields</p>
           <div className="space-y-3">
-            {Object.entries(data ?? {}).map(([key, value]) => (
-              <label key={key} className="block">
-                <span className="text-xs uppercase text-slate-400">{key}</span>
-                <input
-                  className="mt-1 w-full bg-slate-800 border border-slate-700 rounded-lg px-3 py-2 text-sm text-white"
-                  value={value ?? ""}
-                  onChange={(event) =>
-                    setData((prev) => ({ ...(prev ?? {}), [key]: event.target.value }))
-                  }
-                />
-              </label>
-            ))}
+            {Object.entries(data ?? {})
+              .filter(([key]) => key !== "line_items")
+              .map(([key, value]) => (
+                <label key={key} className="block">
+                  <span className="text-xs uppercase text-slate-400">{key}</span>
+                  <input
+                    className="mt-1 w-full bg-slate-800 border border-slate-700 rounded-lg px-3 py-2 text-sm text-white"
+                    value={(value as string | number | null) ?? ""}
+                    onChange={(event) =>
+                      setData((prev) => ({ ...(prev ?? {}), [key]: event.target.value }))
+                    }
+                  />
+                </label>
+              ))}
           </div>
         </section>
       </div>
+      {lineItems.length > 0 && (
+        <section className="mt-6">
+          <p className="text-sm text-slate-500 mb-2">
+            Line items
+            {lineItemsScore !== undefined && ` (confidence ${lineItemsScore.toFixed(2)})`}
+          </p>
+          <table className="w-full text-sm text-slate-200">
+            <thead className="text-xs uppercase text-slate-400 text-left">
+              <tr>
+                <th className="py-1">Description</th>
+                <th className="py-1 text-right">Qty</th>
+                <th className="py-1 text-right">Unit price</th>
+                <th className="py-1 text-right">VAT %</th>
+                <th className="py-1 text-right">Amount</th>
+              </tr>
+            </thead>
+            <tbody>
+              {lineItems.map((item, index) => (
+                <tr key={index} className="border-t border-slate-800">
+                  <td className="py-1">{item.description ?? ""}</td>
+                  <td className="py-1 text-right">{item.quantity ?? ""}</td>
+                  <td className="py-1 text-right">{item.unit_price ?? ""}</td>
+                  <td className="py-1 text-right">{item.vat_rate ?? ""}</td>
+                  <td className="py-1 text-right">{item.amount ?? ""}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </section>
+      )}
       <section className="mt-6">
         <div className="flex items-center justify-between mb-2">
-          <p className="text-sm text-slate-500">Full OCR text</p>
-          <span className="text-xs text-slate-500">
-            {ocrText ? `${ocrText.length} chars` : "No OCR data"}
-          </span>
+          <p className="text-sm text-slate-500">OCR text</p>
+          <div className="flex items-center gap-2 text-xs text-slate-500">
+            <span>{detail?.text_length ? `${detail.text_length} chars` : "No OCR data"}</span>
+            {pageCount > 1 && (
+              <>
+                <button
+                  className="px-2 py-1 rounded bg-slate-800 disabled:opacity-40"
+                  disabled={page === 0}
+                  onClick={() => setPage((current) => Math.max(current - 1, 0))}
+                >
+                  Prev
+                </button>
+                <span>
+                  Page {page + 1} / {pageCount}
+                </span>
+                <button
+                  className="px-2 py-1 rounded bg-slate-800 disabled:opacity-40"
+                  disabled={page >= pageCount - 1}
+                  onClick={() => setPage((current) => Math.min(current + 1, pageCount - 1))}
+                >
+                  Next
+                </button>
+              </>
+            )}
+          </div>
         </div>
         <textarea
           className="w-full h-48 bg-slate-800 border border-slate-700 rounded-lg px-3 py-2 text-sm text-slate-200 resize-none"
-          value={ocrText}
+          value={pageText?.text.trimEnd() ?? ""}
           readOnly
         />
       </section>
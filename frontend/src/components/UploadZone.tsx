@@ -4,7 +4,13 @@ import clsx from "clsx";
 import { uploadDocuments } from "../services/api";
 
 const MAX_SIZE = 50 * 1024 * 1024;
-const ACCEPTED = { "application/pdf": [], "image/png": [], "image/jpeg": [] };
+const ACCEPTED = {
+  "application/pdf": [],
+  "image/png": [],
+  "image/jpeg": [],
+  "application/vnd.openxmlformats-officedocument.wordprocessingml.document": [".docx"],
+  "application/msword": [".doc"],
+};
 
 interface UploadZoneProps {
   onUploaded: () => void;
@@ -21,8 +27,13 @@ export function UploadZone({ onUploaded }: UploadZoneProps) {
         return;
       }
       try {
-        await uploadDocuments(acceptedFiles);
-        setProgress(100);
+        const outcomes = await uploadDocuments(acceptedFiles, (fraction) =>
+          setProgress(Math.max(1, Math.round(fraction * 100))),
+        );
+        const rejected = outcomes.filter((outcome) => outcome.status === "rejected");
+        if (rejected.length) {
+          setError(rejected.map((outcome) => `${outcome.filename}: ${outcome.reason}`).join("; "));
+        }
         onUploaded();
       } catch (err) {
         setError("Upload failed. Please try again.");
@@ -62,7 +73,7 @@ export function UploadZone({ onUploaded }: UploadZoneProps) {
         <input {...getInputProps()} />
         <p className="text-lg font-semibold">Drop invoices here, or click to select</p>
         <p className="text-sm text-slate-400">
-          PDF, PNG, JPG — up to 50MB per file, max 10 files per batch.
+          PDF, PNG, JPG, DOCX, DOC — up to 50MB per file, max 10 files per batch.
         </p>
       </div>
       {progress > 0 && (
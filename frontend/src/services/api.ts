@@ -1,4 +1,5 @@
 import axios from "axios";
+import { UploadDecision, UploadOutcome } from "../types";
 
 const api = axios.create({
   baseURL: import.meta.env.VITE_API_URL ?? "http://localhost:8000",
@@ -13,12 +14,102 @@ api.interceptors.response.use(
   },
 );
 
-export const uploadDocuments = (files: File[]) => {
-  const formData = new FormData();
-  files.forEach((file) => formData.append("files", file));
-  return api.post("/api/v1/upload", formData, {
-    headers: { "Content-Type": "multipart/form-data" },
-  });
+const CHUNK_RETRIES = 3;
+
+const sha256Hex = async (file: File) => {
+  const digest = await crypto.subtle.digest("SHA-256", await file.arrayBuffer());
+  return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, "0")).join("");
+};
+
+const sendChunks = async (
+  file: File,
+  decision: UploadDecision,
+  onBytes: (sent: number) => void,
+): Promise<string> => {
+  const url = `/api/v1/upload/sessions/${decision.upload_id}`;
+  const chunkSize = decision.chunk_size ?? file.size;
+  let offset = decision.offset ?? 0;
+  let failures = 0;
+  for (;;) {
+    onBytes(offset);
+    const end = Math.min(offset + chunkSize, file.size);
+    try {
+      const { data } = await api.put(url, file.slice(offset, end), {
+        params: { offset },
+        headers: { "Content-Type": "application/octet-stream" },
+      });
+      failures = 0;
+      offset = data.offset;
+      if (data.document_id) {
+        onBytes(file.size);
+        return data.document_id;
+      }
+    } catch (error) {
+      const response = axios.isAxiosError(error) ? error.response : undefined;
+      if (response?.status === 409) {
+        // The server holds a different number of bytes: continue from there.
+        offset = response.data.detail.offset;
+        continue;
+      }
+      if (response && response.status < 500) {
+        throw error;
+      }
+      failures += 1;
+      if (failures > CHUNK_RETRIES) {
+        throw error;
+      }
+      // Network error or server hiccup: ask how far the last chunk got.
+      offset = (await api.get(url)).data.offset;
+    }
+  }
+};
+
+/**
+ * Announce files by SHA-256 first, then send only what the server does not
+ * already have, in resumable chunks.
+ */
+export const uploadDocuments = async (
+  files: File[],
+  onProgress?: (fraction: number) => void,
+): Promise<UploadOutcome[]> => {
+  const declarations = await Promise.all(
+    files.map(async (file) => ({
+      filename: file.name,
+      size: file.size,
+      mime_type: file.type,
+      sha256: await sha256Hex(file),
+    })),
+  );
+  const { data } = await api.post("/api/v1/upload/handshake", { files: declarations });
+  const decisions: UploadDecision[] = data.files;
+
+  const total = decisions.reduce(
+    (sum, decision, index) => sum + (decision.status === "send" ? files[index].size : 0),
+    0,
+  );
+  let done = 0;
+  const outcomes: UploadOutcome[] = [];
+  for (const [index, decision] of decisions.entries()) {
+    if (decision.status === "have") {
+      // Already stored: link the existing document instead of sending the bytes.
+      outcomes.push({
+        filename: decision.filename,
+        status: "duplicate",
+        document_id: decision.document_id,
+      });
+    } else if (decision.status === "rejected") {
+      outcomes.push({ filename: decision.filename, status: "rejected", reason: decision.reason });
+    } else {
+      const file = files[index];
+      const documentId = await sendChunks(file, decision, (sent) =>
+        onProgress?.(total ? (done + sent) / total : 1),
+      );
+      done += file.size;
+      outcomes.push({ filename: decision.filename, status: "stored", document_id: documentId });
+    }
+  }
+  onProgress?.(1);
+  return outcomes;
 };
 
 export const fetchDocuments = (params?: Record<string, string | number>) =>
@@ -27,6 +118,11 @@ export const fetchDocuments = (params?: Record<string, string | number>) =>
 export const fetchDocument = (id: string) =>
   api.get(`/api/v1/documents/${id}`).then((res) => res.data);
 
+export const fetchDocumentText = (
+  id: string,
+  params: { page?: number; pages?: number; start?: number; length?: number },
+) => api.get(`/api/v1/documents/${id}/text`, { params }).then((res) => res.data);
+
 export const updateExtraction = (id: string, payload: unknown) =>
   api.patch(`/api/v1/documents/${id}/extracted-data`, payload).then((res) => res.data);
 
@@ -1,5 +1,14 @@
 export type DocumentStatus = "pending" | "processing" | "completed" | "failed";
 
+export interface LineItem {
+  description?: string | null;
+  quantity?: number | null;
+  unit_price?: number | null;
+  vat_rate?: number | null;
+  amount?: number | null;
+  page?: number | null;
+}
+
 export interface ExtractionData {
   invoice_number?: string | null;
   supplier?: string | null;
@@ -9,6 +18,7 @@ export interface ExtractionData {
   amount_ttc?: number | null;
   currency?: string | null;
   confidence_score?: number | null;
+  line_items?: LineItem[] | null;
 }
 
 export interface DocumentItem {
@@ -24,3 +34,41 @@ export interface DocumentItem {
   confidence_scores?: Record<string, number> | null;
 }
 
+
+export interface DocumentDetail extends DocumentItem {
+  error_message?: string | null;
+  download_url: string;
+  processing_time?: number | null;
+  text_length?: number | null;
+  page_count: number;
+}
+
+export interface DocumentText {
+  document_id: string;
+  page_count: number;
+  text_length: number;
+  page_start: number;
+  page_end: number;
+  start: number;
+  end: number;
+  text: string;
+}
+
+export type UploadStatus = "have" | "rejected" | "send";
+
+export interface UploadDecision {
+  filename: string;
+  status: UploadStatus;
+  document_id?: string;
+  reason?: string;
+  upload_id?: string;
+  offset?: number;
+  chunk_size?: number;
+}
+
+export interface UploadOutcome {
+  filename: string;
+  status: "stored" | "duplicate" | "rejected";
+  document_id?: string;
+  reason?: string;
+}